@@ -0,0 +1,6 @@
+# benchmarks/__init__.py
+"""
+Bot va baza unumdorligini o'lchash vositalari
+
+    python -m benchmarks.dispatcher_bench --help
+"""
@@ -0,0 +1,306 @@
+# benchmarks/datagen.py
+"""
+Sun'iy ma'lumotlar generatori (COPY bilan)
+
+Lokal bazani realistik hajmdagi ma'lumotlar bilan to'ldiradi: xodimlar,
+testlar, videolar, konspektlar, papka/fayllar, baxtsiz hodisalar, bir necha
+oylik faollik (millionlab qator) va ko'rishlar. Barcha yozuvlar GEN prefiksi /
+GEN_TELEGRAM_BASE bilan belgilanadi va --drop bilan o'chiriladi.
+
+Ishlatish:
+    python -m benchmarks.datagen --scale small
+    python -m benchmarks.datagen --scale large --seed 7
+    python -m benchmarks.datagen --drop
+
+Faqat dev/test bazada ishlating.
+"""
+import argparse
+import csv
+import io
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from db import get_sync_engine
+from db.models import Folder
+from db.partitions import ensure_partitions, is_partitioned, month_start, add_months, create_partition
+
+GEN = '[gen]'
+GEN_TELEGRAM_BASE = 8_000_000_000
+COPY_CHUNK = 100_000
+
+SCALES = {
+    'small': {
+        'users': 1_000, 'categories': 10, 'tests': 2_000, 'videos': 500, 'conspects': 500,
+        'folders': 100, 'files': 2_000, 'accident_years': 5, 'accidents': 1_000,
+        'activities': 100_000, 'file_views': 20_000, 'accident_views': 10_000, 'months': 3,
+    },
+    'medium': {
+        'users': 20_000, 'categories': 40, 'tests': 10_000, 'videos': 5_000, 'conspects': 5_000,
+        'folders': 1_000, 'files': 20_000, 'accident_years': 10, 'accidents': 10_000,
+        'activities': 2_000_000, 'file_views': 200_000, 'accident_views': 100_000, 'months': 6,
+    },
+    'large': {
+        'users': 100_000, 'categories': 80, 'tests': 30_000, 'videos': 20_000, 'conspects': 20_000,
+        'folders': 3_000, 'files': 60_000, 'accident_years': 15, 'accidents': 30_000,
+        'activities': 10_000_000, 'file_views': 1_000_000, 'accident_views': 500_000, 'months': 12,
+    },
+}
+
+FIRST_NAMES = ['Aziz', 'Bobur', 'Dilshod', 'Jasur', 'Sardor', 'Shahlo', 'Nilufar', 'Gulnora', 'Madina', 'Otabek',
+               'Akmal', 'Rustam', 'Feruza', 'Zarina', 'Sanjar', 'Ulugbek', 'Kamola', 'Javlon', 'Ravshan', 'Dildora']
+LAST_NAMES = ['Karimov', 'Aliyev', 'Toshmatov', 'Rahimov', 'Yusupov', 'Nazarov', 'Qodirov', 'Saidov',
+              'Ergashev', 'Mirzayev', 'Xolmatov', 'Abdullayev', 'Islomov', 'Sobirov', 'Umarov']
+WORDS = ['xavfsizlik', 'mehnat', 'muhofaza', 'kran', 'qozonxona', 'bosim', 'idish', 'yong\'in', 'elektr',
+         'himoya', 'vosita', 'texnik', 'ko\'rik', 'nizom', 'yo\'riqnoma', 'sanoat', 'baxtsiz', 'hodisa',
+         'ishchi', 'usta', 'payvandlash', 'balandlik', 'shaxta', 'gaz', 'quvur', 'tekshiruv']
+
+ACTIVITY_TYPES = ['test_start', 'conspect_view', 'video_view', 'folder_open', 'accident_view']
+MM_PARENT_TYPES = [key for key, _ in Folder.PARENT_TYPE_CHOICES[:3]]
+SX_PARENT_TYPES = [key for key, _ in Folder.PARENT_TYPE_CHOICES[3:]]
+
+
+def _phrase(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+# ==================== COPY ====================
+
+def copy_rows(raw, table: str, columns: list[str], rows) -> int:
+    """Generator qatorlarini COPY ... FROM STDIN bilan bo'laklab yozish"""
+    cursor = raw.cursor()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    total = 0
+
+    def flush():
+        buffer.seek(0)
+        cursor.copy_expert(sql, buffer)
+        buffer.seek(0)
+        buffer.truncate()
+
+    for row in rows:
+        writer.writerow(row)
+        total += 1
+        if total % COPY_CHUNK == 0:
+            flush()
+    if buffer.tell():
+        flush()
+
+    cursor.close()
+    return total
+
+
+def _ids(raw, sql: str, *params) -> list[int]:
+    cursor = raw.cursor()
+    cursor.execute(sql, params)
+    ids = [row[0] for row in cursor.fetchall()]
+    cursor.close()
+    return ids
+
+
+# ==================== GENERATOR ====================
+
+def generate(scale: dict, seed: int = 42):
+    rng = random.Random(seed)
+    engine = get_sync_engine()
+    n = scale
+    like = GEN + '%'
+
+    # Faollik oylari uchun partition'lar
+    current = month_start(date.today())
+    with engine.begin() as conn:
+        if is_partitioned(conn):
+            for offset in range(-n['months'], 0):
+                create_partition(conn, add_months(current, offset))
+            ensure_partitions(conn)
+
+    raw = engine.raw_connection()
+    try:
+        def step(name, table, columns, rows):
+            started = time.perf_counter()
+            count = copy_rows(raw, table, columns, rows)
+            raw.commit()
+            print(f"  ✅ {name}: {count:,} ({time.perf_counter() - started:.1f} s)")
+
+        print("🌱 Ma'lumotlar yaratilmoqda...")
+
+        # Xodimlar
+        step('users', 'users', ['telegram_id', 'username', 'full_name', 'phone_number', 'language_code', 'is_active'], (
+            (
+                GEN_TELEGRAM_BASE + i,
+                f'gen_user_{i}' if i % 3 else None,
+                f'{GEN} {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                f'+99890{i:07d}',
+                rng.choice(('uz', 'uz', 'uz', 'ru', 'qq')),
+                i % 50 != 0,
+            )
+            for i in range(n['users'])
+        ))
+        users = _ids(raw, "SELECT id FROM users WHERE telegram_id >= %s AND telegram_id < %s ORDER BY id",
+                     GEN_TELEGRAM_BASE, GEN_TELEGRAM_BASE + n['users'])
+        telegram_ids = [GEN_TELEGRAM_BASE + i for i in range(n['users'])]
+
+        # Kategoriyalar (MM / SX)
+        categories = {}
+        for table in ('test_categories', 'video_categories', 'conspect_categories'):
+            step(table, table, ['name', 'section'], (
+                (f'{GEN} {_phrase(rng, 2)} {i + 1}', 'MM' if i % 2 == 0 else 'SX')
+                for i in range(n['categories'])
+            ))
+            categories[table] = _ids(raw, f"SELECT id FROM {table} WHERE name LIKE %s ORDER BY id", like)
+
+        # Testlar + javoblar
+        step('tests', 'tests', ['text'], (
+            (f'{GEN} {_phrase(rng, rng.randint(6, 14))}?',) for _ in range(n['tests'])
+        ))
+        tests = _ids(raw, "SELECT id FROM tests WHERE text LIKE %s ORDER BY id", like)
+        step('test_category_association', 'test_category_association', ['test_id', 'category_id'], (
+            (test_id, categories['test_categories'][i % len(categories['test_categories'])])
+            for i, test_id in enumerate(tests)
+        ))
+        step('test_answers', 'test_answers', ['text', 'is_correct', 'test_id'], (
+            (_phrase(rng, rng.randint(2, 6)), k == correct, test_id)
+            for test_id in tests
+            for correct in (rng.randrange(4),)
+            for k in range(4)
+        ))
+
+        # Videolar, konspektlar
+        step('videos', 'videos', ['name', 'description', 'file', 'category_id'], (
+            (f'{GEN} {_phrase(rng, 3)}', _phrase(rng, 12), f'GEN_VIDEO_{i}',
+             rng.choice(categories['video_categories']))
+            for i in range(n['videos'])
+        ))
+        step('conspects', 'conspects', ['name', 'description', 'file', 'category_id'], (
+            (f'{GEN} {_phrase(rng, 3)}', _phrase(rng, 12), f'GEN_CONSPECT_{i}',
+             rng.choice(categories['conspect_categories']))
+            for i in range(n['conspects'])
+        ))
+
+        # Papkalar + fayllar
+        step('folders', 'folders', ['name', 'section', 'parent_type', 'order_index'], (
+            (f'{GEN} {_phrase(rng, 2)} {i + 1}', section, rng.choice(parent_types), i % 50)
+            for i in range(n['folders'])
+            for section, parent_types in (
+                ('MM', MM_PARENT_TYPES) if i % 2 == 0 else ('SX', SX_PARENT_TYPES),
+            )
+        ))
+        folders = _ids(raw, "SELECT id FROM folders WHERE name LIKE %s ORDER BY id", like)
+        step('files', 'files', ['name', 'file_id', 'description', 'folder_id', 'order_index'], (
+            (f'{GEN} {_phrase(rng, 3)}.pdf', f'GEN_FILE_{i}', None, rng.choice(folders), i % 30)
+            for i in range(n['files'])
+        ))
+        files = _ids(raw, "SELECT id FROM files WHERE name LIKE %s ORDER BY id", like)
+
+        # Baxtsiz hodisalar
+        step('accident_years', 'accident_years', ['name'], (
+            (f'{GEN} {date.today().year - i} yil',) for i in range(n['accident_years'])
+        ))
+        years = _ids(raw, "SELECT id FROM accident_years WHERE name LIKE %s ORDER BY id", like)
+        step('accident_categories', 'accident_categories', ['name'], (
+            (f'{GEN} {_phrase(rng, 2)} {i + 1}',) for i in range(max(n['categories'] // 4, 2))
+        ))
+        accident_categories = _ids(raw, "SELECT id FROM accident_categories WHERE name LIKE %s ORDER BY id", like)
+        step('accidents', 'accidents', ['title', 'description', 'file_pdf', 'year_id', 'category_id'], (
+            (f'{GEN} {_phrase(rng, 4)}', _phrase(rng, 20), f'GEN_PDF_{i}',
+             rng.choice(years), rng.choice(accident_categories))
+            for i in range(n['accidents'])
+        ))
+        accidents = _ids(raw, "SELECT id FROM accidents WHERE title LIKE %s ORDER BY id", like)
+
+        # Faollik - oxirgi N oy, ish vaqtiga og'irlik bilan
+        start = datetime.combine(add_months(current, -n['months']), datetime.min.time())
+        span = (datetime.now() - start).total_seconds()
+
+        def activities():
+            for _ in range(n['activities']):
+                activity_type = rng.choice(ACTIVITY_TYPES)
+                section = 'SX' if rng.random() < 0.35 else 'MM'
+                parent_type = None
+                if activity_type == 'folder_open':
+                    parent_type = rng.choice(SX_PARENT_TYPES if section == 'SX' else MM_PARENT_TYPES)
+                created_at = start + timedelta(seconds=span * rng.random())
+                created_at = created_at.replace(hour=rng.choice((8, 9, 10, 11, 13, 14, 15, 16, 17, 20)))
+                yield rng.choice(users), activity_type, section, parent_type, f'{created_at.isoformat()}+05:00'
+
+        step('user_activities', 'user_activities',
+             ['user_id', 'activity_type', 'section', 'parent_type', 'created_at'], activities())
+
+        # Ko'rishlar - (obyekt, foydalanuvchi) juftligi unique
+        def views(objects: list[int], count: int):
+            count = min(count, len(objects) * len(telegram_ids))
+            for i in range(count):
+                yield objects[(i // len(telegram_ids)) % len(objects)], telegram_ids[i % len(telegram_ids)]
+
+        step('file_views', 'file_views', ['file_id', 'user_id'], views(files, n['file_views']))
+        step('accident_views', 'accident_views', ['accident_id', 'user_id'], views(accidents, n['accident_views']))
+
+    finally:
+        raw.close()
+
+    print("📈 ANALYZE...")
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for table in ('users', 'tests', 'test_answers', 'test_category_association', 'videos', 'conspects',
+                      'folders', 'files', 'accidents', 'user_activities', 'file_views', 'accident_views'):
+            conn.execute(text(f"ANALYZE {table}"))
+
+
+def drop():
+    """GEN yozuvlarini o'chirish (faollik CASCADE bilan)"""
+    like = GEN + '%'
+    bounds = {"base": GEN_TELEGRAM_BASE, "end": GEN_TELEGRAM_BASE + 1_000_000_000}
+    with get_sync_engine().begin() as conn:
+        conn.execute(text("DELETE FROM file_views WHERE user_id >= :base AND user_id < :end"), bounds)
+        conn.execute(text("DELETE FROM accident_views WHERE user_id >= :base AND user_id < :end"), bounds)
+        conn.execute(text("DELETE FROM users WHERE telegram_id >= :base AND telegram_id < :end"), bounds)
+        conn.execute(text("DELETE FROM tests WHERE text LIKE :like"), {"like": like})
+        conn.execute(text("DELETE FROM accidents WHERE title LIKE :like"), {"like": like})
+        for table in ('test_categories', 'video_categories', 'conspect_categories', 'folders',
+                      'accident_years', 'accident_categories'):
+            conn.execute(text(f"DELETE FROM {table} WHERE name LIKE :like"), {"like": like})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sun'iy ma'lumotlar generatori")
+    parser.add_argument('--scale', choices=SCALES, default='small', help="Hajm")
+    parser.add_argument('--activities', type=int, help="Faollik qatorlari soni (scale'dagi qiymat o'rniga)")
+    parser.add_argument('--months', type=int, help="Faollik necha oyga tarqaladi")
+    parser.add_argument('--seed', type=int, default=42, help="Tasodifiy generator seed'i (takrorlanuvchi natija)")
+    parser.add_argument('--drop', action='store_true', help="Yaratilgan ma'lumotlarni o'chirish")
+    args = parser.parse_args()
+
+    try:
+        print("🧹 Oldingi GEN ma'lumotlari o'chirilmoqda...")
+        drop()
+        if args.drop:
+            print("✅ O'chirildi")
+            return
+
+        scale = dict(SCALES[args.scale])
+        if args.activities is not None:
+            scale['activities'] = args.activities
+        if args.months is not None:
+            scale['months'] = args.months
+
+        started = time.perf_counter()
+        generate(scale, args.seed)
+        print(f"\n✅ '{args.scale}' hajm tayyor ({time.perf_counter() - started:.0f} s)")
+        print("💡 Dashboard rollup'i uchun: make rollup")
+
+    except Exception as e:
+        print(f"\n❌ XATOLIK: {e}\n")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
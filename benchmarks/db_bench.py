@@ -0,0 +1,316 @@
+# benchmarks/db_bench.py
+"""
+Baza so'rovlari benchmark'i
+
+benchmarks/datagen.py yaratgan ma'lumotlar ustida:
+    - bot helper'lari (bot/handlers/*_helpers.py) - to'g'ridan-to'g'ri, async session bilan
+    - admin sahifalari - Flask test client orqali (login qilingan), to'liq route
+
+Har biri uchun p50/p95 (ms) va chaqiruv boshiga SQL so'rovlar soni.
+Natija JSON'ga yoziladi va commit'lar orasida solishtiriladi.
+
+Ishlatish:
+    python -m benchmarks.datagen --scale medium
+    python -m benchmarks.db_bench --json before.json
+    python -m benchmarks.db_bench --json after.json --baseline before.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+
+from benchmarks.datagen import GEN, GEN_TELEGRAM_BASE
+from bot.handlers.common import conspect_helpers, folder_helpers, test_helpers, video_helpers
+from bot.handlers.mm import mm_accident_helpers
+from bot.utils.single_flight import invalidate_all
+from db import async_engine, get_sync_engine
+from utils.env_data import Config as cf
+
+TABLES = ('users', 'tests', 'videos', 'conspects', 'folders', 'files', 'accidents',
+          'user_activities', 'file_views', 'accident_views')
+
+_queries = 0
+
+
+def _count_query(*_):
+    global _queries
+    _queries += 1
+
+
+# ==================== NAMUNA PARAMETRLAR ====================
+
+def sample_params() -> dict:
+    """GEN ma'lumotlaridan o'lchov uchun ID'lar (eng ko'p bog'langanlari)"""
+    like = GEN + '%'
+    with get_sync_engine().connect() as conn:
+        def scalar(sql, **params):
+            value = conn.execute(text(sql), {"like": like, **params}).scalar()
+            if value is None:
+                raise RuntimeError("GEN ma'lumotlari topilmadi - avval: python -m benchmarks.datagen")
+            return value
+
+        return {
+            'test_category': scalar("""
+                SELECT a.category_id FROM test_category_association a
+                JOIN test_categories c ON c.id = a.category_id WHERE c.name LIKE :like
+                GROUP BY a.category_id ORDER BY count(*) DESC LIMIT 1
+            """),
+            'test': scalar("SELECT min(id) FROM tests WHERE text LIKE :like"),
+            'video_category': scalar("""
+                SELECT category_id FROM videos WHERE name LIKE :like
+                GROUP BY category_id ORDER BY count(*) DESC LIMIT 1
+            """),
+            'video': scalar("SELECT min(id) FROM videos WHERE name LIKE :like"),
+            'conspect_category': scalar("""
+                SELECT category_id FROM conspects WHERE name LIKE :like
+                GROUP BY category_id ORDER BY count(*) DESC LIMIT 1
+            """),
+            'conspect': scalar("SELECT min(id) FROM conspects WHERE name LIKE :like"),
+            'folder': scalar("""
+                SELECT folder_id FROM files WHERE name LIKE :like
+                GROUP BY folder_id ORDER BY count(*) DESC LIMIT 1
+            """),
+            'file': scalar("SELECT min(id) FROM files WHERE name LIKE :like"),
+            'accident_year': scalar("""
+                SELECT year_id FROM accidents WHERE title LIKE :like
+                GROUP BY year_id ORDER BY count(*) DESC LIMIT 1
+            """),
+            'accident': scalar("SELECT min(id) FROM accidents WHERE title LIKE :like"),
+            'user': scalar(
+                "SELECT min(id) FROM users WHERE telegram_id >= :base AND telegram_id < :end",
+                base=GEN_TELEGRAM_BASE, end=GEN_TELEGRAM_BASE + 1_000_000_000
+            ),
+        }
+
+
+def table_rows() -> dict:
+    with get_sync_engine().connect() as conn:
+        return {
+            table: int(conn.execute(
+                text("SELECT coalesce(sum(c.reltuples), 0)::bigint FROM pg_class c "
+                     "LEFT JOIN pg_inherits i ON i.inhrelid = c.oid "
+                     "WHERE c.oid = to_regclass(:t) OR i.inhparent = to_regclass(:t)"),
+                {"t": table}
+            ).scalar())
+            for table in TABLES
+        }
+
+
+# ==================== BOT HELPER'LARI ====================
+
+def bot_cases(p: dict) -> list:
+    """(nomi, async fn(session)) - helper'lar production'dagi argumentlar bilan"""
+    return [
+        ('test.get_test_categories', lambda s: test_helpers.get_test_categories(s, 'MM')),
+        ('test.get_category_tests', lambda s: test_helpers.get_category_tests(s, p['test_category'], limit=10)),
+        ('test.get_test_answers', lambda s: test_helpers.get_test_answers(s, p['test'])),
+        ('folder.get_folders', lambda s: folder_helpers.get_folders(s, 'MM', 'nizomlar')),
+        ('folder.get_folder_with_files', lambda s: folder_helpers.get_folder_with_files(s, p['folder'])),
+        ('folder.get_file_by_id', lambda s: folder_helpers.get_file_by_id(s, p['file'])),
+        ('folder.get_folder_statistics', lambda s: folder_helpers.get_folder_statistics(s, 'MM', 'nizomlar')),
+        ('video.get_video_categories', lambda s: video_helpers.get_video_categories(s, 'MM')),
+        ('video.get_category_with_videos', lambda s: video_helpers.get_category_with_videos(s, p['video_category'])),
+        ('video.get_video_by_id', lambda s: video_helpers.get_video_by_id(s, p['video'])),
+        ('video.get_video_statistics', lambda s: video_helpers.get_video_statistics(s, 'MM')),
+        ('conspect.get_conspect_categories', lambda s: conspect_helpers.get_conspect_categories(s, 'MM')),
+        ('conspect.get_category_conspects',
+         lambda s: conspect_helpers.get_category_conspects(s, p['conspect_category'])),
+        ('conspect.get_category_with_conspects',
+         lambda s: conspect_helpers.get_category_with_conspects(s, p['conspect_category'])),
+        ('conspect.get_conspect_by_id', lambda s: conspect_helpers.get_conspect_by_id(s, p['conspect'])),
+        ('conspect.get_conspect_statistics', lambda s: conspect_helpers.get_conspect_statistics(s, 'MM')),
+        ('accident.get_accident_years', lambda s: mm_accident_helpers.get_accident_years(s)),
+        ('accident.get_year_with_accidents',
+         lambda s: mm_accident_helpers.get_year_with_accidents(s, p['accident_year'])),
+        ('accident.get_accident_by_id', lambda s: mm_accident_helpers.get_accident_by_id(s, p['accident'])),
+        ('accident.get_main_statistics', lambda s: mm_accident_helpers.get_main_statistics(s)),
+        ('accident.get_year_statistics', lambda s: mm_accident_helpers.get_year_statistics(s, p['accident_year'])),
+    ]
+
+
+async def run_bot_cases(cases: list, iterations: int, warmup: int) -> dict:
+    global _queries
+    session_maker = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+    event.listen(async_engine.sync_engine, 'before_cursor_execute', _count_query)
+
+    results = {}
+    for name, fn in cases:
+        timings, queries = [], []
+        for i in range(warmup + iterations):
+            # Har safar yangi session - identity map keshi o'lchovni buzmasin
+            # va single-flight TTL natijasi qayta ishlatilmasin (bot/utils/single_flight.py)
+            invalidate_all()
+            async with session_maker() as session:
+                _queries = 0
+                started = time.perf_counter()
+                await fn(session)
+                elapsed = time.perf_counter() - started
+            if i >= warmup:
+                timings.append(elapsed)
+                queries.append(_queries)
+        results[f'bot: {name}'] = _stats(timings, queries)
+        print(f"  ✅ bot: {name}")
+
+    await async_engine.dispose()
+    return results
+
+
+# ==================== ADMIN SAHIFALARI ====================
+
+def admin_cases(p: dict) -> list:
+    return [
+        '/dashboard/',
+        '/users/list',
+        '/users/list?search=karimov',
+        f"/users/view/{p['user']}",
+        '/test/list',
+        '/test/list?search=xavfsizlik',
+        '/test/categories',
+        f"/test/{p['test']}/view",
+        '/folder/list',
+        f"/folder/{p['folder']}/view",
+        '/file/list',
+        '/video/list',
+        '/video/categories',
+        '/conspect/list',
+        '/conspect/categories',
+        '/accident/list',
+        '/accident/years',
+        '/accident/categories',
+        f"/accident/{p['accident']}/view",
+        '/groups/',
+        '/search/?q=kran',
+        '/jobs/',
+        '/broadcast/',
+    ]
+
+
+def run_admin_cases(urls: list, iterations: int, warmup: int) -> dict:
+    global _queries
+    from web.app import app
+
+    event.listen(get_sync_engine(), 'before_cursor_execute', _count_query)
+    client = app.test_client()
+    with client.session_transaction() as flask_session:
+        flask_session['_user_id'] = cf.web.ADMIN_USERNAME
+        flask_session['_fresh'] = True
+
+    results = {}
+    for url in urls:
+        timings, queries = [], []
+        for i in range(warmup + iterations):
+            _queries = 0
+            started = time.perf_counter()
+            response = client.get(url)
+            elapsed = time.perf_counter() - started
+            if response.status_code != 200:
+                print(f"  ⚠️ {url}: HTTP {response.status_code}")
+                break
+            if i >= warmup:
+                timings.append(elapsed)
+                queries.append(_queries)
+        if timings:
+            results[f'admin: {url}'] = _stats(timings, queries)
+            print(f"  ✅ admin: {url}")
+    return results
+
+
+# ==================== HISOBOT ====================
+
+def _stats(timings: list, queries: list) -> dict:
+    ms = sorted(value * 1000 for value in timings)
+    return {
+        'p50_ms': round(statistics.median(ms), 2),
+        'p95_ms': round(ms[min(int(len(ms) * 0.95), len(ms) - 1)], 2),
+        'mean_ms': round(statistics.fmean(ms), 2),
+        'queries': max(queries),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(result: dict, baseline: dict | None = None):
+    before = (baseline or {}).get('results', {})
+    print("\n" + "=" * 100)
+    print(f"{'SO‘ROV':<58}{'p50 ms':>10}{'p95 ms':>10}{'SQL':>6}{'Δp50':>12}{'ΔSQL':>6}")
+    print("-" * 100)
+    for name, row in result['results'].items():
+        delta, delta_sql = '', ''
+        if name in before:
+            if before[name]['p50_ms']:
+                delta = f"{(row['p50_ms'] - before[name]['p50_ms']) / before[name]['p50_ms'] * 100:+.1f}%"
+            if row['queries'] != before[name]['queries']:
+                delta_sql = f"{row['queries'] - before[name]['queries']:+d}"
+        print(f"{name[:57]:<58}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['queries']:>6}{delta:>12}{delta_sql:>6}")
+    print("-" * 100)
+    print("📦 " + ", ".join(f"{table}={rows:,}" for table, rows in result['rows'].items()))
+    if baseline:
+        print(f"🔁 Baseline: {baseline.get('commit')} ({baseline.get('date')})")
+    print("=" * 100 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bot helper'lari va admin sahifalari benchmark'i")
+    parser.add_argument('--iterations', type=int, default=20, help="Har bir so'rov necha marta o'lchanadi")
+    parser.add_argument('--warmup', type=int, default=3, help="Isitish (o'lchovga kirmaydi)")
+    parser.add_argument('--only', choices=('bot', 'admin'), help="Faqat bitta guruh")
+    parser.add_argument('--json', help='Natijani JSON faylga yozish')
+    parser.add_argument('--baseline', help='Oldingi JSON natija bilan solishtirish')
+    args = parser.parse_args()
+
+    try:
+        params = sample_params()
+        result = {
+            'commit': _git_commit(),
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'rows': table_rows(),
+            'params': params,
+            'results': {},
+        }
+
+        if args.only in (None, 'bot'):
+            print("🤖 Bot helper'lari...")
+            result['results'].update(asyncio.run(run_bot_cases(bot_cases(params), args.iterations, args.warmup)))
+
+        if args.only in (None, 'admin'):
+            print("🖥 Admin sahifalari...")
+            result['results'].update(run_admin_cases(admin_cases(params), args.iterations, args.warmup))
+
+        baseline = None
+        if args.baseline:
+            with open(args.baseline) as file:
+                baseline = json.load(file)
+
+        print_report(result, baseline)
+
+        if args.json:
+            with open(args.json, 'w') as file:
+                json.dump(result, file, indent=2, ensure_ascii=False)
+            print(f"💾 {args.json}")
+
+    except Exception as e:
+        print(f"\n❌ XATOLIK: {e}\n")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+# benchmarks/dispatcher_bench.py
+"""
+Dispatcher replay benchmark
+
+Haqiqiy `dp` (bot/handlers) + production middleware'lari (setup_middlewares)
+lokal Postgres ustida, Bot API esa FakeSession bilan almashtirilgan.
+Virtual foydalanuvchilar sintetik oqimlarni (ro'yxatdan o'tish, menyu, test,
+papkalar) parallel takrorlaydi.
+
+Natija: updates/s, handler bo'yicha p50/p99 kechikish, update boshiga
+SQL so'rovlar va Bot API chaqiruvlari.
+
+Ishlatish:
+    python -m benchmarks.dispatcher_bench
+    python -m benchmarks.dispatcher_bench --users 200 --rounds 3 --api-latency 0.05
+    python -m benchmarks.dispatcher_bench --json after.json --baseline before.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("BOT_TOKEN", "123456:BENCHMARK")  # FakeSession - token ishlatilmaydi
+
+from aiogram import Bot
+from aiogram.client.default import DefaultBotProperties
+from aiogram.enums import ParseMode
+from aiogram.types import Update
+from aiogram.utils.i18n import I18n
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+
+from benchmarks.fake_session import FakeSession, current_probe
+from benchmarks.scenarios import SCENARIOS, MAX_QUIZ_STEPS
+from benchmarks.seed import seed, cleanup, BENCH_TELEGRAM_BASE, REGISTRATION_OFFSET
+from bot.handlers import dp
+from bot.middlewares import setup_middlewares, RateLimitMiddleware
+from db import db, async_engine
+import bot.handlers.common.test_handler as test_handler
+
+UNHANDLED = '(filtrlangan)'
+
+
+# ==================== O'LCHOV ====================
+
+def _count_query(*_):
+    probe = current_probe.get()
+    if probe is not None:
+        probe['queries'] += 1
+
+
+class HandlerProbe:
+    """Inner middleware - qaysi handler ishlaganini yozadi (filtrlardan keyin chaqiriladi)"""
+
+    async def __call__(self, handler, event, data):
+        probe = current_probe.get()
+        if probe is not None and data.get('handler') is not None:
+            probe['handler'] = data['handler'].callback.__name__
+        return await handler(event, data)
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = defaultdict(list)  # handler -> [(soniya, so'rovlar, api)]
+        self.errors = 0
+
+    def add(self, probe: dict, elapsed: float):
+        self.samples[probe['handler'] or UNHANDLED].append((elapsed, probe['queries'], probe['api_calls']))
+
+    def summary(self, wall: float) -> dict:
+        def percentile(values, q):
+            values = sorted(values)
+            return values[min(int(len(values) * q), len(values) - 1)]
+
+        handlers = {}
+        total = 0
+        for name, rows in sorted(self.samples.items()):
+            latencies = [row[0] * 1000 for row in rows]
+            total += len(rows)
+            handlers[name] = {
+                'count': len(rows),
+                'p50_ms': round(percentile(latencies, 0.50), 2),
+                'p99_ms': round(percentile(latencies, 0.99), 2),
+                'mean_ms': round(statistics.fmean(latencies), 2),
+                'queries': round(statistics.fmean(row[1] for row in rows), 2),
+                'api_calls': round(statistics.fmean(row[2] for row in rows), 2),
+            }
+
+        return {
+            'updates': total,
+            'errors': self.errors,
+            'wall_s': round(wall, 2),
+            'updates_per_s': round(total / wall, 1) if wall else 0,
+            'handlers': handlers,
+        }
+
+
+# ==================== VIRTUAL FOYDALANUVCHI ====================
+
+class VirtualUser:
+    _update_ids = itertools.count(1)
+
+    def __init__(self, bot: Bot, session: FakeSession, telegram_id: int, recorder: Recorder, think: float):
+        self.bot = bot
+        self.session = session
+        self.telegram_id = telegram_id
+        self.recorder = recorder
+        self.think = think
+        self._message_ids = itertools.count(1)
+
+    def _user(self) -> dict:
+        return {"id": self.telegram_id, "is_bot": False, "first_name": "Bench", "language_code": "uz"}
+
+    def _message(self, **extra) -> dict:
+        return {
+            "message_id": next(self._message_ids),
+            "date": int(time.time()),
+            "chat": {"id": self.telegram_id, "type": "private"},
+            "from": self._user(),
+            **extra,
+        }
+
+    def _update(self, step) -> dict | None:
+        kind = step[0]
+        update = {"update_id": next(self._update_ids)}
+
+        if kind == 'text':
+            update['message'] = self._message(text=step[1])
+        elif kind == 'contact':
+            update['message'] = self._message(contact={
+                "phone_number": "+998901234567",
+                "first_name": "Bench",
+                "user_id": self.telegram_id,
+            })
+        elif kind == 'click':
+            buttons = self.session.keyboards.get(self.telegram_id, [])
+            data = next((button for button in buttons if button.startswith(step[1])), step[1])
+            message = self.session.messages.get(self.telegram_id) or self._message(text='...')
+            update['callback_query'] = {
+                "id": str(update['update_id']),
+                "from": self._user(),
+                "chat_instance": str(self.telegram_id),
+                "message": message,
+                "data": data,
+            }
+        return update
+
+    async def feed(self, step):
+        update = Update.model_validate(self._update(step), context={"bot": self.bot})
+        probe = {'handler': None, 'queries': 0, 'api_calls': 0}
+        token = current_probe.set(probe)
+        started = time.perf_counter()
+        try:
+            await dp.feed_update(self.bot, update)
+        except Exception as e:
+            self.recorder.errors += 1
+            print(f"⚠️ {step}: {e}")
+        finally:
+            elapsed = time.perf_counter() - started
+            current_probe.reset(token)
+        self.recorder.add(probe, elapsed)
+
+        if self.think:
+            await asyncio.sleep(self.think * random.uniform(0.8, 1.2))
+
+    async def run(self, steps):
+        for step in steps:
+            if step[0] != 'quiz':
+                await self.feed(step)
+                continue
+
+            # Test: javob -> keyingi savol -> ... natija chiqquncha
+            for _ in range(MAX_QUIZ_STEPS):
+                buttons = self.session.keyboards.get(self.telegram_id, [])
+                if any(button.startswith('answer:') for button in buttons):
+                    await self.feed(('click', 'answer:'))
+                elif 'next_question' in buttons:
+                    await self.feed(('click', 'next_question'))
+                else:
+                    break
+
+
+# ==================== ISHGA TUSHIRISH ====================
+
+async def run(args) -> dict:
+    fake = FakeSession(latency=args.api_latency)
+    bot = Bot(token=os.environ["BOT_TOKEN"], session=fake, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
+
+    session_pool = async_sessionmaker(db._engine, class_=AsyncSession, expire_on_commit=False)
+    i18n = I18n(path="locales", default_locale="uz", domain="messages")
+    setup_middlewares(dp, session_pool, i18n)
+    dp.message.middleware(HandlerProbe())
+    dp.callback_query.middleware(HandlerProbe())
+
+    for engine in (db._engine, async_engine):
+        event.listen(engine.sync_engine, 'before_cursor_execute', _count_query)
+
+    # UX pauzalari (3-4 soniya) o'lchovni buzadi
+    if not args.keep_delays:
+        test_handler.TEST_START_DELAY = 0
+        test_handler.ANSWER_DISPLAY_TIME = 0
+
+    async with async_engine.begin() as conn:
+        info = await conn.run_sync(seed, args.users, args.tests, args.files)
+    print(f"🌱 Seed: {args.users} xodim, {args.tests} test, {args.files} fayl")
+
+    bench_ids = [BENCH_TELEGRAM_BASE + i for i in range(args.users)]
+    if args.think < 0.5:
+        # RateLimitMiddleware tez xabarlarni tashlab yuboradi - virtual userlar istisno
+        for observer in (dp.message, dp.callback_query):
+            for middleware in observer.middleware._middlewares:
+                middleware = getattr(middleware, 'middleware', middleware)  # TimedMiddleware ichidagisi
+                if isinstance(middleware, RateLimitMiddleware):
+                    middleware.admin_ids.update(bench_ids)
+                    middleware.admin_ids.update(
+                        BENCH_TELEGRAM_BASE + REGISTRATION_OFFSET + i for i in range(args.users * args.rounds)
+                    )
+
+    scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip() in SCENARIOS]
+    registration_ids = itertools.count(BENCH_TELEGRAM_BASE + REGISTRATION_OFFSET)
+    recorder = Recorder()
+
+    async def user_session(index: int):
+        telegram_id = bench_ids[index]
+        for _ in range(args.rounds):
+            for name in scenarios:
+                # Ro'yxatdan o'tish har safar yangi telegram_id bilan
+                uid = next(registration_ids) if name == 'registration' else telegram_id
+                user = VirtualUser(bot, fake, uid, recorder, args.think)
+                await user.run(SCENARIOS[name](info))
+
+    print(f"🚀 {args.users} virtual foydalanuvchi × {args.rounds} marta: {', '.join(scenarios)}")
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(user_session(i) for i in range(args.users)))
+        wall = time.perf_counter() - started
+    finally:
+        # Handler'lar qoldirgan fon task'lari (timer, kechiktirilgan o'chirish)
+        pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        if not args.keep_data:
+            async with async_engine.begin() as conn:
+                await conn.run_sync(cleanup)
+
+    result = recorder.summary(wall)
+    result['config'] = {
+        'users': args.users, 'rounds': args.rounds, 'think': args.think,
+        'api_latency': args.api_latency, 'scenarios': scenarios,
+    }
+    result['api_calls'] = dict(fake.calls.most_common())
+    return result
+
+
+def print_report(result: dict, baseline: dict | None = None):
+    print("\n" + "=" * 96)
+    print(f"{'HANDLER':<32}{'SONI':>8}{'p50 ms':>10}{'p99 ms':>10}{'SQL/upd':>10}{'API/upd':>10}{'Δp99':>14}")
+    print("-" * 96)
+    for name, row in result['handlers'].items():
+        delta = ''
+        if baseline and name in baseline.get('handlers', {}):
+            before = baseline['handlers'][name]['p99_ms']
+            if before:
+                delta = f"{(row['p99_ms'] - before) / before * 100:+.1f}%"
+        print(f"{name[:31]:<32}{row['count']:>8}{row['p50_ms']:>10}{row['p99_ms']:>10}"
+              f"{row['queries']:>10}{row['api_calls']:>10}{delta:>14}")
+    print("-" * 96)
+
+    line = f"📊 {result['updates']} update / {result['wall_s']} s = {result['updates_per_s']} updates/s"
+    if baseline and baseline.get('updates_per_s'):
+        line += f" ({(result['updates_per_s'] / baseline['updates_per_s'] - 1) * 100:+.1f}% baseline'ga nisbatan)"
+    print(line)
+    if result['errors']:
+        print(f"⚠️ Xatolar: {result['errors']}")
+    print("=" * 96 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dispatcher replay benchmark")
+    parser.add_argument('--users', type=int, default=50, help='Virtual foydalanuvchilar')
+    parser.add_argument('--rounds', type=int, default=2, help='Har bir foydalanuvchi necha marta takrorlaydi')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help=f"Vergul bilan: {', '.join(SCENARIOS)}")
+    parser.add_argument('--think', type=float, default=0.0, help="Update'lar orasidagi pauza (soniya)")
+    parser.add_argument('--api-latency', type=float, default=0.0, help='Soxta Bot API kechikishi (soniya)')
+    parser.add_argument('--tests', type=int, default=30, help='Seed: testlar soni')
+    parser.add_argument('--files', type=int, default=20, help='Seed: fayllar soni')
+    parser.add_argument('--keep-delays', action='store_true', help="Test handler UX pauzalarini saqlash")
+    parser.add_argument('--keep-data', action='store_true', help="Seed ma'lumotlarini o'chirmaslik")
+    parser.add_argument('--json', help='Natijani JSON faylga yozish')
+    parser.add_argument('--baseline', help='Oldingi JSON natija bilan solishtirish')
+    args = parser.parse_args()
+
+    try:
+        result = asyncio.run(run(args))
+
+        baseline = None
+        if args.baseline:
+            with open(args.baseline) as file:
+                baseline = json.load(file)
+
+        print_report(result, baseline)
+
+        if args.json:
+            with open(args.json, 'w') as file:
+                json.dump(result, file, indent=2, ensure_ascii=False)
+            print(f"💾 {args.json}")
+
+    except Exception as e:
+        print(f"\n❌ XATOLIK: {e}\n")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
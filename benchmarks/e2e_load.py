@@ -0,0 +1,288 @@
+# benchmarks/e2e_load.py
+"""
+End-to-end yuklama testi - soxta Bot API server orqali
+
+Bot o'z jarayonida (main.py, haqiqiy polling, middleware'lar, DB) ishlaydi,
+API manzili esa benchmarks/fake_api_server.py'ga yo'naltiriladi. Minglab
+virtual foydalanuvchi testlarni boshidan oxirigacha ishlaydi; Telegram'ga
+chiqmasdan update -> birinchi javob kechikishi va API chaqiruvlari yoziladi.
+
+Ishlatish:
+    # bot'ni o'zi ishga tushiradi
+    python -m benchmarks.e2e_load --spawn-bot --users 1000
+
+    # yoki bot alohida terminalda:
+    #   TELEGRAM_API_URL=http://localhost:8081 python main.py
+    python -m benchmarks.e2e_load --users 1000 --latency 0.05 --chat-limit 1 --json e2e.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.fake_api_server import FakeBotAPI, serve
+from benchmarks.scenarios import quiz
+from benchmarks.seed import seed, cleanup, BENCH_TELEGRAM_BASE
+from bot.utils.constants import MAX_QUESTIONS
+from db import async_engine
+
+QUIZ_BUTTONS = ('answer:', 'next_question')
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(int(len(values) * q), len(values) - 1)] if values else 0
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = defaultdict(list)  # qadam -> [soniya]
+        self.quizzes = []  # to'liq test davomiyligi
+        self.timeouts = defaultdict(int)
+
+    def summary(self, wall: float) -> dict:
+        steps = {
+            name: {
+                'count': len(values),
+                'p50_ms': round(percentile(values, 0.50) * 1000, 1),
+                'p95_ms': round(percentile(values, 0.95) * 1000, 1),
+                'p99_ms': round(percentile(values, 0.99) * 1000, 1),
+                'timeouts': self.timeouts.get(name, 0),
+            }
+            for name, values in sorted(self.latencies.items())
+        }
+        updates = sum(len(values) for values in self.latencies.values())
+        return {
+            'updates': updates,
+            'wall_s': round(wall, 2),
+            'updates_per_s': round(updates / wall, 1) if wall else 0,
+            'quizzes_completed': len(self.quizzes),
+            'quiz_p50_s': round(percentile(self.quizzes, 0.50), 2),
+            'quiz_p99_s': round(percentile(self.quizzes, 0.99), 2),
+            'steps': steps,
+        }
+
+
+class VirtualUser:
+    _message_ids = itertools.count(1)
+    _callback_ids = itertools.count(1)
+
+    def __init__(self, api: FakeBotAPI, telegram_id: int, stats: Stats, think: float, timeout: float):
+        self.api = api
+        self.chat = api.chat(telegram_id)
+        self.telegram_id = telegram_id
+        self.stats = stats
+        self.think = think
+        self.timeout = timeout
+
+    def _user(self) -> dict:
+        return {"id": self.telegram_id, "is_bot": False, "first_name": "Bench", "language_code": "uz"}
+
+    async def _next_event(self, timeout: float):
+        return await asyncio.wait_for(self.chat.outbox.get(), timeout)
+
+    async def _send(self, label: str, update: dict) -> bool:
+        """Update yuborish va birinchi javobni kutish"""
+        while not self.chat.outbox.empty():
+            self.chat.outbox.get_nowait()
+
+        started = time.perf_counter()
+        self.api.push_update(update)
+        try:
+            sent_at, _, _ = await self._next_event(self.timeout)
+        except asyncio.TimeoutError:
+            self.stats.timeouts[label] += 1
+            return False
+        self.stats.latencies[label].append(sent_at - started)
+
+        if self.think:
+            await asyncio.sleep(self.think * random.uniform(0.8, 1.2))
+        return True
+
+    async def text(self, text: str) -> bool:
+        return await self._send(text, {"message": {
+            "message_id": next(self._message_ids),
+            "date": int(time.time()),
+            "chat": {"id": self.telegram_id, "type": "private"},
+            "from": self._user(),
+            "text": text,
+        }})
+
+    async def click(self, prefix: str) -> bool:
+        await self.wait_button((prefix,))
+        button = self.chat.latest_button(prefix)
+        if button is None:
+            self.stats.timeouts[prefix.split(':')[0]] += 1
+            return False
+
+        message_id, data = button
+        return await self._send(data.split(':')[0], {"callback_query": {
+            "id": f"bench-{next(self._callback_ids)}",
+            "from": self._user(),
+            "chat_instance": str(self.telegram_id),
+            "message": self.chat.messages[message_id],
+            "data": data,
+        }})
+
+    async def wait_button(self, prefixes: tuple) -> str | None:
+        """Klaviaturada prefix'lardan biri paydo bo'lguncha kutish (test pauzalari bilan)"""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            for prefix in prefixes:
+                if self.chat.latest_button(prefix):
+                    return prefix
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                await self._next_event(remaining)
+            except asyncio.TimeoutError:
+                return None
+
+    async def run_quiz(self, steps: list, questions: int):
+        started = time.perf_counter()
+        for step in steps:
+            if step[0] == 'text' and not await self.text(step[1]):
+                return
+            if step[0] == 'click' and not await self.click(step[1]):
+                return
+
+        answered = 0
+        while answered < questions:
+            prefix = await self.wait_button(QUIZ_BUTTONS)
+            if prefix is None:
+                self.stats.timeouts['quiz'] += 1
+                return
+            if not await self.click(prefix):
+                return
+            if prefix == 'answer:':
+                answered += 1
+
+        self.stats.quizzes.append(time.perf_counter() - started)
+
+
+async def spawn_bot(api_url: str):
+    env = dict(os.environ, TELEGRAM_API_URL=api_url)
+    env.setdefault('BOT_TOKEN', '123456:BENCHMARK')
+    return await asyncio.create_subprocess_exec(sys.executable, 'main.py', cwd=ROOT, env=env)
+
+
+async def run(args) -> dict:
+    api = FakeBotAPI(args.latency, args.jitter, args.error_rate, args.chat_limit)
+    runner = await serve(api, args.host, args.port)
+    api_url = f"http://{args.host}:{args.port}"
+    print(f"🤖 Soxta Bot API: {api_url}")
+
+    async with async_engine.begin() as conn:
+        info = await conn.run_sync(seed, args.users, args.tests, 0)
+    print(f"🌱 Seed: {args.users} xodim, {args.tests} test")
+
+    bot_process = await spawn_bot(api_url) if args.spawn_bot else None
+    if not bot_process:
+        print(f"⏳ Bot kutilmoqda: TELEGRAM_API_URL={api_url} python main.py")
+
+    stats = Stats()
+    try:
+        await asyncio.wait_for(api.polling.wait(), args.startup_timeout)
+        print(f"🚀 {args.users} virtual foydalanuvchi × {args.quizzes} test")
+
+        questions = min(args.tests, MAX_QUESTIONS)
+
+        async def user_session(index: int):
+            # Hammasi bir vaqtda emas - ramp davomida bosqichma-bosqich
+            await asyncio.sleep(args.ramp * index / args.users)
+            user = VirtualUser(api, BENCH_TELEGRAM_BASE + index, stats, args.think, args.timeout)
+            for _ in range(args.quizzes):
+                await user.run_quiz(quiz(info)[:-1], questions)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(user_session(i) for i in range(args.users)))
+        wall = time.perf_counter() - started
+
+    finally:
+        if bot_process:
+            bot_process.terminate()
+            await bot_process.wait()
+        await runner.cleanup()
+
+        if not args.keep_data:
+            async with async_engine.begin() as conn:
+                await conn.run_sync(cleanup)
+
+    result = stats.summary(wall)
+    result['api_calls'] = dict(api.calls.most_common())
+    result['throttled'] = dict(api.throttled)
+    result['config'] = {
+        'users': args.users, 'quizzes': args.quizzes, 'think': args.think,
+        'latency': args.latency, 'jitter': args.jitter,
+        'error_rate': args.error_rate, 'chat_limit': args.chat_limit,
+    }
+    return result
+
+
+def print_report(result: dict):
+    print("\n" + "=" * 80)
+    print(f"{'QADAM':<28}{'SONI':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'TIMEOUT':>10}")
+    print("-" * 80)
+    for name, row in result['steps'].items():
+        print(f"{name[:27]:<28}{row['count']:>8}{row['p50_ms']:>10}{row['p95_ms']:>10}"
+              f"{row['p99_ms']:>10}{row['timeouts']:>10}")
+    print("-" * 80)
+    print(f"📊 {result['updates']} update / {result['wall_s']} s = {result['updates_per_s']} updates/s")
+    print(f"✅ Tugallangan testlar: {result['quizzes_completed']} "
+          f"(p50 {result['quiz_p50_s']} s, p99 {result['quiz_p99_s']} s)")
+    print("📡 API: " + ", ".join(f"{name}={count}" for name, count in result['api_calls'].items()))
+    if result['throttled']:
+        print("⚠️ 429: " + ", ".join(f"{name}={count}" for name, count in result['throttled'].items()))
+    print("=" * 80 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end yuklama testi (soxta Bot API)")
+    parser.add_argument('--users', type=int, default=1000, help='Virtual foydalanuvchilar')
+    parser.add_argument('--quizzes', type=int, default=1, help='Har bir foydalanuvchi nechta test ishlaydi')
+    parser.add_argument('--tests', type=int, default=MAX_QUESTIONS, help='Seed: testlar soni')
+    parser.add_argument('--think', type=float, default=1.0, help="Qadamlar orasidagi pauza (RateLimit: >= 0.5)")
+    parser.add_argument('--ramp', type=float, default=30.0, help="Foydalanuvchilar shu soniya ichida qo'shiladi")
+    parser.add_argument('--timeout', type=float, default=15.0, help='Javob kutish chegarasi (soniya)')
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--latency', type=float, default=0.0, help='API kechikishi (soniya)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Kechikish ± (soniya)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Tasodifiy 429 ulushi (0..1)')
+    parser.add_argument('--chat-limit', type=int, default=0, help='Chatga soniyasiga xabar (0 - cheklovsiz)')
+    parser.add_argument('--spawn-bot', action='store_true', help="main.py'ni o'zi ishga tushirish")
+    parser.add_argument('--startup-timeout', type=float, default=60.0, help='Bot polling boshlashini kutish')
+    parser.add_argument('--keep-data', action='store_true', help="Seed ma'lumotlarini o'chirmaslik")
+    parser.add_argument('--json', help='Natijani JSON faylga yozish')
+    args = parser.parse_args()
+
+    try:
+        result = asyncio.run(run(args))
+        print_report(result)
+
+        if args.json:
+            with open(args.json, 'w') as file:
+                json.dump(result, file, indent=2, ensure_ascii=False)
+            print(f"💾 {args.json}")
+
+    except asyncio.TimeoutError:
+        print("\n❌ Bot soxta API'ga ulanmadi (TELEGRAM_API_URL)\n")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ XATOLIK: {e}\n")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+# benchmarks/fake_api_server.py
+"""
+Soxta Telegram Bot API server (aiohttp) - end-to-end yuklama testlari uchun
+
+Bot haqiqiy kod bilan (main.py) ishga tushadi, faqat API manzili shu serverga
+yo'naltiriladi:
+
+    TELEGRAM_API_URL=http://localhost:8081 python main.py
+
+Server:
+    - getUpdates (long polling) orqali virtual foydalanuvchi update'larini beradi
+    - bot javoblarini (send*/edit*/delete*/answerCallbackQuery) chat bo'yicha
+      navbatga qo'yadi - yuklama drayveri (benchmarks/e2e_load.py) shundan o'qiydi
+    - kechikish (latency + jitter), tasodifiy 429 va chat bo'yicha limitni taqlid qiladi
+
+Alohida ishga tushirish (qo'lda tekshirish uchun):
+    python -m benchmarks.fake_api_server --port 8081 --latency 0.05 --chat-limit 1
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+from collections import Counter, defaultdict, deque
+
+from aiohttp import web
+
+BOT_USER = {"id": 1, "is_bot": True, "first_name": "Bench Bot", "username": "bench_bot"}
+
+# Foydalanuvchiga ko'rinadigan xabar yuboradigan metodlar - chat limiti shularga qo'llanadi
+LIMITED_METHODS = {
+    'sendmessage', 'sendphoto', 'senddocument', 'sendvideo',
+    'editmessagetext', 'editmessagecaption', 'editmessagereplymarkup',
+}
+
+
+class ChatState:
+    def __init__(self):
+        self.messages: dict[int, dict] = {}  # message_id -> Bot API Message
+        self.keyboards: dict[int, list[str]] = {}  # message_id -> callback_data ro'yxati
+        self.outbox: asyncio.Queue = asyncio.Queue()  # (vaqt, metod, message_id)
+        self.sent_at: deque = deque()  # chat limiti uchun oxirgi yuborishlar vaqti
+
+    def latest_button(self, prefix: str) -> tuple[int, str] | None:
+        """Eng oxirgi klaviaturadan prefix bilan boshlanadigan tugma"""
+        for message_id in sorted(self.keyboards, reverse=True):
+            for data in self.keyboards[message_id]:
+                if data.startswith(prefix):
+                    return message_id, data
+        return None
+
+
+class FakeBotAPI:
+    def __init__(
+            self,
+            latency: float = 0.0,
+            jitter: float = 0.0,
+            error_rate: float = 0.0,
+            chat_limit: int = 0,
+            retry_after: int = 1
+    ):
+        """
+        Args:
+            latency: har bir so'rovga qo'shiladigan kechikish (soniya)
+            jitter: latency ± jitter (tasodifiy)
+            error_rate: tasodifiy 429 ulushi (0..1)
+            chat_limit: bitta chatga soniyasiga ruxsat etilgan xabarlar (0 - cheklovsiz)
+            retry_after: 429 javobidagi retry_after (soniya)
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.chat_limit = chat_limit
+        self.retry_after = retry_after
+
+        self.calls = Counter()
+        self.throttled = Counter()
+        self.chats: dict[int, ChatState] = defaultdict(ChatState)
+        self.polling = asyncio.Event()  # bot getUpdates'ni chaqira boshladi
+
+        self._updates: deque = deque()
+        self._new_update = asyncio.Event()
+        self._update_ids = itertools.count(1)
+        self._message_ids = itertools.count(1000)
+        self._callbacks: dict[str, int] = {}  # callback_query_id -> chat_id
+
+    # ==================== VIRTUAL FOYDALANUVCHI TOMONI ====================
+
+    def push_update(self, update: dict) -> int:
+        """Update'ni getUpdates navbatiga qo'yish, update_id qaytaradi"""
+        update['update_id'] = next(self._update_ids)
+        callback = update.get('callback_query')
+        if callback:
+            self._callbacks[callback['id']] = callback['message']['chat']['id']
+        self._updates.append(update)
+        self._new_update.set()
+        return update['update_id']
+
+    def chat(self, chat_id: int) -> ChatState:
+        return self.chats[chat_id]
+
+    # ==================== BOT TOMONI ====================
+
+    def app(self) -> web.Application:
+        app = web.Application(client_max_size=50 * 1024 * 1024)
+        app.router.add_post('/bot{token}/{method}', self.handle)
+        app.router.add_get('/bot{token}/{method}', self.handle)
+        return app
+
+    async def handle(self, request: web.Request) -> web.Response:
+        method = request.match_info['method']
+        key = method.lower()
+        params = dict(await request.post())
+        self.calls[method] += 1
+
+        if key == 'getupdates':
+            return self._ok(await self._get_updates(params))
+
+        if self.latency or self.jitter:
+            await asyncio.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+
+        chat_id = self._chat_id(params)
+        if key in LIMITED_METHODS and self._throttle(chat_id):
+            self.throttled[method] += 1
+            return self._too_many_requests()
+
+        handler = getattr(self, f'_m_{key}', None)
+        result = handler(params, chat_id) if handler else True
+        return self._ok(result)
+
+    @staticmethod
+    def _ok(result) -> web.Response:
+        return web.json_response({"ok": True, "result": result})
+
+    def _too_many_requests(self) -> web.Response:
+        return web.json_response({
+            "ok": False,
+            "error_code": 429,
+            "description": f"Too Many Requests: retry after {self.retry_after}",
+            "parameters": {"retry_after": self.retry_after},
+        }, status=429)
+
+    @staticmethod
+    def _chat_id(params: dict) -> int | None:
+        try:
+            return int(params['chat_id'])
+        except (KeyError, ValueError):
+            return None
+
+    def _throttle(self, chat_id: int | None) -> bool:
+        if self.error_rate and random.random() < self.error_rate:
+            return True
+
+        if not self.chat_limit or chat_id is None:
+            return False
+
+        now = time.monotonic()
+        sent_at = self.chats[chat_id].sent_at
+        while sent_at and now - sent_at[0] > 1.0:
+            sent_at.popleft()
+        if len(sent_at) >= self.chat_limit:
+            return True
+        sent_at.append(now)
+        return False
+
+    async def _get_updates(self, params: dict) -> list:
+        self.polling.set()
+        offset = int(params.get('offset') or 0)
+        limit = int(params.get('limit') or 100)
+        timeout = float(params.get('timeout') or 0)
+
+        while self._updates and self._updates[0]['update_id'] < offset:
+            self._updates.popleft()
+
+        if not self._updates and timeout:
+            self._new_update.clear()
+            try:
+                await asyncio.wait_for(self._new_update.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        return list(itertools.islice(self._updates, limit))
+
+    # ==================== METODLAR ====================
+
+    def _outgoing(self, chat_id: int, method: str, message_id: int | None = None):
+        self.chats[chat_id].outbox.put_nowait((time.perf_counter(), method, message_id))
+
+    def _store(self, params: dict, chat_id: int, message_id: int | None = None, **extra) -> dict:
+        chat = self.chats[chat_id]
+        message_id = message_id or next(self._message_ids)
+        message = chat.messages.get(message_id) or {
+            "message_id": message_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "from": BOT_USER,
+        }
+        message.update(extra)
+
+        # Telegram: reply_markup'siz edit klaviaturani olib tashlaydi
+        markup = json.loads(params['reply_markup']) if params.get('reply_markup') else {}
+        buttons = [
+            button['callback_data']
+            for row in markup.get('inline_keyboard', []) for button in row
+            if button.get('callback_data')
+        ]
+        if buttons:
+            chat.keyboards[message_id] = buttons
+        else:
+            chat.keyboards.pop(message_id, None)
+
+        chat.messages[message_id] = message
+        return message
+
+    def _send(self, params: dict, chat_id: int, method: str, **extra) -> dict:
+        message = self._store(params, chat_id, **extra)
+        self._outgoing(chat_id, method, message['message_id'])
+        return message
+
+    def _edit(self, params: dict, chat_id: int, method: str, **extra) -> dict:
+        message_id = int(params.get('message_id') or 0)
+        message = self._store(params, chat_id, message_id, **extra)
+        self._outgoing(chat_id, method, message_id)
+        return message
+
+    def _m_getme(self, params, chat_id):
+        return BOT_USER
+
+    def _m_deletewebhook(self, params, chat_id):
+        if params.get('drop_pending_updates') in ('true', 'True', '1'):
+            self._updates.clear()
+        return True
+
+    def _m_setmycommands(self, params, chat_id):
+        return True
+
+    def _m_getchatmember(self, params, chat_id):
+        return {
+            "status": "member",
+            "user": {"id": int(params.get('user_id') or 0), "is_bot": False, "first_name": "Bench"},
+        }
+
+    def _m_sendmessage(self, params, chat_id):
+        return self._send(params, chat_id, 'sendMessage', text=params.get('text', ''))
+
+    def _m_sendphoto(self, params, chat_id):
+        return self._send(
+            params, chat_id, 'sendPhoto',
+            caption=params.get('caption', ''),
+            photo=[{"file_id": "BENCH_PHOTO", "file_unique_id": "bench_photo", "width": 1, "height": 1}]
+        )
+
+    def _m_senddocument(self, params, chat_id):
+        return self._send(
+            params, chat_id, 'sendDocument',
+            caption=params.get('caption', ''),
+            document={"file_id": "BENCH_DOCUMENT", "file_unique_id": "bench_document"}
+        )
+
+    def _m_sendvideo(self, params, chat_id):
+        return self._send(
+            params, chat_id, 'sendVideo',
+            caption=params.get('caption', ''),
+            video={"file_id": "BENCH_VIDEO", "file_unique_id": "bench_video", "width": 1, "height": 1, "duration": 1}
+        )
+
+    def _m_editmessagetext(self, params, chat_id):
+        return self._edit(params, chat_id, 'editMessageText', text=params.get('text', ''))
+
+    def _m_editmessagecaption(self, params, chat_id):
+        return self._edit(params, chat_id, 'editMessageCaption', caption=params.get('caption', ''))
+
+    def _m_editmessagereplymarkup(self, params, chat_id):
+        return self._edit(params, chat_id, 'editMessageReplyMarkup')
+
+    def _m_deletemessage(self, params, chat_id):
+        chat = self.chats[chat_id]
+        message_id = int(params.get('message_id') or 0)
+        chat.messages.pop(message_id, None)
+        chat.keyboards.pop(message_id, None)
+        self._outgoing(chat_id, 'deleteMessage', message_id)
+        return True
+
+    def _m_answercallbackquery(self, params, chat_id):
+        chat_id = self._callbacks.pop(params.get('callback_query_id'), None)
+        if chat_id is not None:
+            self._outgoing(chat_id, 'answerCallbackQuery')
+        return True
+
+
+async def serve(api: FakeBotAPI, host: str, port: int) -> web.AppRunner:
+    runner = web.AppRunner(api.app(), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soxta Telegram Bot API server")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--latency', type=float, default=0.0, help="So'rov kechikishi (soniya)")
+    parser.add_argument('--jitter', type=float, default=0.0, help='Kechikish ± (soniya)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Tasodifiy 429 ulushi (0..1)')
+    parser.add_argument('--chat-limit', type=int, default=0, help='Chatga soniyasiga xabar (0 - cheklovsiz)')
+    args = parser.parse_args()
+
+    api = FakeBotAPI(args.latency, args.jitter, args.error_rate, args.chat_limit)
+    print(f"🤖 Soxta Bot API: http://{args.host}:{args.port}")
+    web.run_app(api.app(), host=args.host, port=args.port, access_log=None, print=None)
+
+
+if __name__ == "__main__":
+    main()
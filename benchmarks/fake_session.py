@@ -0,0 +1,113 @@
+# benchmarks/fake_session.py
+"""
+Tarmoqsiz aiogram session - Bot API chaqiruvlariga soxta javob qaytaradi
+
+Javoblar haqiqiy Bot API JSON ko'rinishida yig'iladi va aiogram'ning
+check_response() orqali o'tadi - handler'lar production'dagi kabi Message
+obyektlarini oladi. Har bir chatning oxirgi inline klaviaturasi saqlanadi:
+virtual foydalanuvchi tugmalarni shundan "bosadi".
+"""
+import asyncio
+import itertools
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from aiogram.client.session.base import BaseSession
+from aiogram.types import InlineKeyboardMarkup
+
+# Joriy update'ning o'lchovlari (dispatcher_bench o'rnatadi)
+current_probe: ContextVar[dict | None] = ContextVar('current_probe', default=None)
+
+BOT_USER = {"id": 1, "is_bot": True, "first_name": "Bench Bot", "username": "bench_bot"}
+
+
+class FakeSession(BaseSession):
+    def __init__(self, latency: float = 0.0):
+        """
+        Args:
+            latency: har bir API chaqiruvga qo'shiladigan kechikish (soniya) - Telegram RTT taqlidi
+        """
+        super().__init__()
+        self.latency = latency
+        self.calls = Counter()
+        self.keyboards: dict[int, list[str]] = {}  # chat_id -> callback_data ro'yxati
+        self.messages: dict[int, dict] = {}  # chat_id -> oxirgi yuborilgan xabar (JSON)
+        self._message_ids = itertools.count(10_000)
+
+    async def close(self):
+        pass
+
+    async def stream_content(self, url, headers=None, timeout=30, chunk_size=65536, raise_for_status=True):
+        yield b''
+
+    async def make_request(self, bot, method, timeout=None):
+        name = type(method).__name__
+        self.calls[name] += 1
+
+        probe = current_probe.get()
+        if probe is not None:
+            probe['api_calls'] += 1
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        result = self._result(method, name)
+        response = self.check_response(
+            bot=bot,
+            method=method,
+            status_code=200,
+            content=self.json_dumps({"ok": True, "result": result})
+        )
+        return response.result
+
+    # ==================== JAVOBLAR ====================
+
+    def _remember_keyboard(self, chat_id, markup):
+        if isinstance(markup, InlineKeyboardMarkup):
+            self.keyboards[chat_id] = [
+                button.callback_data
+                for row in markup.inline_keyboard for button in row
+                if button.callback_data
+            ]
+
+    def _message(self, method) -> dict:
+        chat_id = getattr(method, 'chat_id', None) or 0
+        message_id = getattr(method, 'message_id', None) or next(self._message_ids)
+        message = {
+            "message_id": message_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "from": BOT_USER,
+        }
+        text = getattr(method, 'text', None) or getattr(method, 'caption', None)
+        if isinstance(text, str):
+            message["text"] = text
+
+        self._remember_keyboard(chat_id, getattr(method, 'reply_markup', None))
+        self.messages[chat_id] = message
+        return message
+
+    def _result(self, method, name: str):
+        if name == 'GetMe':
+            return BOT_USER
+
+        if name == 'GetChatMember':
+            return {
+                "status": "member",
+                "user": {"id": method.user_id, "is_bot": False, "first_name": "Bench"},
+            }
+
+        if name in ('CopyMessages', 'ForwardMessages'):
+            return []
+
+        if name == 'CopyMessage':
+            return {"message_id": next(self._message_ids)}
+
+        if name == 'SendMediaGroup':
+            return [self._message(method)]
+
+        if name.startswith(('Send', 'Edit', 'Forward')) and name != 'SendChatAction':
+            return self._message(method)
+
+        return True
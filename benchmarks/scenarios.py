@@ -0,0 +1,63 @@
+# benchmarks/scenarios.py
+"""
+Sintetik foydalanuvchi oqimlari
+
+Har bir qadam:
+    ('text', 'matn')         - oddiy xabar
+    ('contact',)             - telefon raqam yuborish
+    ('click', 'prefix')      - oxirgi inline klaviaturadan prefix bilan boshlanadigan tugma
+    ('quiz',)                - test oxirigacha: javob -> keyingi savol -> ... -> natija
+"""
+from benchmarks.seed import SeedInfo
+
+MAX_QUIZ_STEPS = 40
+
+
+def registration(info: SeedInfo) -> list:
+    return [
+        ('text', '/start'),
+        ('text', 'Bench Yangi Foydalanuvchi'),
+        ('contact',),
+    ]
+
+
+def menu_navigation(info: SeedInfo) -> list:
+    return [
+        ('text', '/start'),
+        ('text', '👷 Mehnat Muhofazasi'),
+        ('text', '🏠 Bosh Sahifa'),
+        ('text', '⚠️ Sanoat Xavfsizligi'),
+        ('text', '🏠 Bosh Sahifa'),
+        ('text', '/help'),
+    ]
+
+
+def quiz(info: SeedInfo) -> list:
+    return [
+        ('text', '👷 Mehnat Muhofazasi'),
+        ('text', '📝 Test'),
+        ('click', f'test_category:{info.test_category_id}'),
+        ('quiz',),
+    ]
+
+
+def folder_browsing(info: SeedInfo) -> list:
+    steps = [
+        ('text', '👷 Mehnat Muhofazasi'),
+        ('text', '📋 Nizomlar'),
+        ('click', f'folder:{info.folder_id}'),
+    ]
+    for file_id in info.file_ids[:3]:
+        steps += [
+            ('click', f'folder_file:{file_id}'),
+            ('click', f'folder:{info.folder_id}'),
+        ]
+    return steps
+
+
+SCENARIOS = {
+    'registration': registration,
+    'menu': menu_navigation,
+    'quiz': quiz,
+    'folders': folder_browsing,
+}
@@ -0,0 +1,76 @@
+# benchmarks/seed.py
+"""
+Benchmark ma'lumotlari - lokal Postgres'ga yoziladi va oxirida o'chiriladi
+
+Barcha yozuvlar PREFIX / BENCH_TELEGRAM_BASE bilan belgilanadi,
+production ma'lumotlariga tegilmaydi.
+"""
+from dataclasses import dataclass
+
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from db.models import User, TestCategory, Test, TestAnswer, Folder, File
+
+PREFIX = '[bench]'
+BENCH_TELEGRAM_BASE = 9_900_000_000  # virtual foydalanuvchilar telegram_id'si shundan boshlanadi
+REGISTRATION_OFFSET = 500_000  # ro'yxatdan o'tadiganlar (oldindan yaratilmaydi)
+
+
+@dataclass
+class SeedInfo:
+    users: int
+    test_category_id: int
+    folder_id: int
+    file_ids: list
+
+
+def seed(conn, users: int = 100, tests: int = 30, files: int = 20) -> SeedInfo:
+    """Sync connection (async_engine: conn.run_sync(seed, ...))"""
+    cleanup(conn)
+    session = Session(bind=conn)
+
+    session.add_all([
+        User(
+            telegram_id=BENCH_TELEGRAM_BASE + i,
+            full_name=f'Bench Foydalanuvchi {i}',
+            phone_number='+998900000000',
+            language_code='uz',
+            is_active=True
+        )
+        for i in range(users)
+    ])
+
+    category = TestCategory(name=f'{PREFIX} Test', section='MM')
+    for i in range(tests):
+        category.tests.append(Test(
+            text=f'{PREFIX} Savol {i + 1}?',
+            answers=[TestAnswer(text=f'Javob {j + 1}', is_correct=(j == i % 4)) for j in range(4)]
+        ))
+    session.add(category)
+
+    folder = Folder(name=f'{PREFIX} Nizomlar', section='MM', parent_type='nizomlar', order_index=0)
+    folder.files = [
+        File(name=f'{PREFIX} Fayl {i + 1}', file_id=f'BENCH_FILE_{i}', order_index=i)
+        for i in range(files)
+    ]
+    session.add(folder)
+
+    session.flush()
+    info = SeedInfo(
+        users=users,
+        test_category_id=category.id,
+        folder_id=folder.id,
+        file_ids=[file.id for file in folder.files]
+    )
+    session.commit()
+    return info
+
+
+def cleanup(conn):
+    """Benchmark yozuvlarini o'chirish (faoliyat / ko'rishlar CASCADE bilan)"""
+    conn.execute(delete(User).where(User.telegram_id >= BENCH_TELEGRAM_BASE))
+    conn.execute(delete(Test).where(Test.text.like(f'{PREFIX}%')))
+    conn.execute(delete(TestCategory).where(TestCategory.name.like(f'{PREFIX}%')))
+    conn.execute(delete(Folder).where(Folder.name.like(f'{PREFIX}%')))
+
@@ -3,6 +3,7 @@ from bot.handlers.common.conspect_handler import conspect_router
 from bot.handlers.common.folder_handler import folder_router
 from bot.handlers.common.test_handler import test_router
 from bot.handlers.common.video_handler import video_router
+from bot.handlers.debug_handler import debug_router
 from bot.handlers.group_events import group_router
 from bot.handlers.language_handler import language_router
 from bot.handlers.media_handler import media_router
@@ -13,6 +14,7 @@ from bot.handlers.sx.sx_main_handler import sx_main_router
 from bot.handlers.text_handler import text_router
 
 dp.include_routers(
+    debug_router,
     conspect_router,
     folder_router,
     test_router,
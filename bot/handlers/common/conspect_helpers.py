@@ -11,6 +11,9 @@ from collections import defaultdict, deque
 import asyncio
 
 from db.models import ConspectCategory, Conspect
+from bot.utils.content_stats import content_stats
+from bot.utils.single_flight import single_flight
+from utils.env_data import Config as cf
 
 # ==================== CONSTANTS ====================
 DELETE_CHUNK_SIZE = 10
@@ -83,6 +86,7 @@ async def delete_user_messages(bot, user_id: int, category: str, exclude_ids: Op
 
 # ==================== DATABASE QUERIES ====================
 
+@single_flight(ttl=cf.bot.READ_CACHE_TTL)
 async def get_conspect_categories(session: AsyncSession, section: str) -> List[ConspectCategory]:
     """
     Section bo'yicha konspekt kategoriyalarini olish
@@ -103,6 +107,7 @@ async def get_conspect_categories(session: AsyncSession, section: str) -> List[C
     return list(result.scalars().all())
 
 
+@single_flight(ttl=cf.bot.READ_CACHE_TTL)
 async def get_category_conspects(
         session: AsyncSession,
         category_id: int
@@ -125,6 +130,7 @@ async def get_category_conspects(
     return list(result.scalars().all())
 
 
+@single_flight(ttl=cf.bot.READ_CACHE_TTL)
 async def get_category_with_conspects(
         session: AsyncSession,
         category_id: int
@@ -147,6 +153,7 @@ async def get_category_with_conspects(
     return result.scalar_one_or_none()
 
 
+@single_flight(ttl=cf.bot.READ_CACHE_TTL)
 async def get_conspect_by_id(
         session: AsyncSession,
         conspect_id: int
@@ -169,6 +176,7 @@ async def get_conspect_by_id(
     return result.scalar_one_or_none()
 
 
+@single_flight(ttl=cf.bot.READ_CACHE_TTL)
 async def get_conspect_statistics(
         session: AsyncSession,
         section: str
@@ -183,6 +191,10 @@ async def get_conspect_statistics(
     Returns:
         (jami_fayllar_soni, kategoriyalar_statistikasi)
     """
+    # Xotiradan (bot/utils/content_stats.py), ulanish bo'lmasa - bazadan
+    if content_stats.ready:
+        return content_stats.section_statistics('conspect', section)
+
     # Jami fayllar soni
     total_result = await session.execute(
         select(func.count(Conspect.id))
@@ -10,6 +10,9 @@ from collections import defaultdict, deque
 import asyncio
 
 from db.models import Folder, File, FileView
+from bot.utils.content_stats import content_stats
+from bot.utils.single_flight import single_flight
+from utils.env_data import Config as cf
 
 # ==================== CONSTANTS ====================
 DELETE_CHUNK_SIZE = 10
@@ -78,6 +81,7 @@ async def delete_user_messages(bot, user_id: int, category: str, exclude_ids: Op
 
 # ==================== DATABASE QUERIES ====================
 
+@single_flight(ttl=cf.bot.READ_CACHE_TTL)
 async def get_folders(
         session: AsyncSession,
         section: str,
@@ -96,6 +100,7 @@ async def get_folders(
     return list(result.scalars().all())
 
 
+@single_flight(ttl=cf.bot.READ_CACHE_TTL)
 async def get_folder_with_files(session: AsyncSession, folder_id: int) -> Folder | None:
     """Folderni fayllar bilan olish"""
     result = await session.execute(
@@ -106,6 +111,8 @@ async def get_folder_with_files(session: AsyncSession, folder_id: int) -> Folder
     return result.scalar_one_or_none()
 
 
+# Ko'rishlar soni bilan - TTL yo'q, faqat birlashtirish
+@single_flight()
 async def get_file_by_id(session: AsyncSession, file_id: int) -> File | None:
     """Faylni ID bo'yicha olish"""
     result = await session.execute(
@@ -177,6 +184,10 @@ async def get_folder_statistics(
         parent_type: str
 ) -> Tuple[int, int, List[Tuple]]:
     """Folder statistikasi"""
+    # Xotiradan (bot/utils/content_stats.py), ulanish bo'lmasa - bazadan
+    if content_stats.ready:
+        return content_stats.folder_statistics(section, parent_type)
+
     folders = await get_folders(session, section, parent_type)
     total_folders = len(folders)
     folder_stats = []
@@ -6,11 +6,14 @@ Section-aware test tizimi
 from aiogram import Router, F
 from aiogram.types import CallbackQuery, Message
 from aiogram.fsm.context import FSMContext
+from aiogram.exceptions import TelegramRetryAfter
 from aiogram.utils.i18n import gettext as _, lazy_gettext as __
 from aiogram.types import ReplyKeyboardRemove
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 import asyncio
+import logging
+import time
 
 from bot.states import TestState
 from bot.buttons.inline import (
@@ -38,12 +41,15 @@ from bot.handlers.common.test_helpers import (
     cleanup_timer
 )
 from bot.utils.constants import QUESTION_TIME_LIMIT, MAX_QUESTIONS
+from bot.utils.countdown import edit_budget, deadline_clock
+from bot.utils.metrics import API_ORIGIN, COUNTDOWN_EDITS
 from bot.utils.texts import (
     test_no_categories_text,
     test_categories_prompt,
     test_category_empty,
     test_starting_text,
     test_time_remaining,
+    test_deadline_text,
     test_invalid_format_text,
     test_answer_not_found_text,
     test_time_expired_text,
@@ -73,9 +79,9 @@ from db.models import Test, TestAnswer, User
 from bot.utils.stats import log_activity
 
 test_router = Router()
+logger = logging.getLogger(__name__)
 
-# CONSTANTS
-TIMER_UPDATE_INTERVAL = 5
+# CONSTANTS (taymer yangilanish oralig'i - bot/utils/countdown.py)
 ANSWER_DISPLAY_TIME = 3
 TEST_START_DELAY = 4
 
@@ -150,7 +156,7 @@ async def start_test(callback: CallbackQuery, state: FSMContext, session: AsyncS
     try:
         await log_activity(session, callback.from_user.id, 'test_start', section)
     except Exception as e:
-        print(f"Log activity error: {e}")
+        logger.warning("Log activity error: %s", e)
 
     # Question ID'larini olish (lazy loading oldini olish)
     question_ids = [q.id for q in questions]
@@ -205,6 +211,10 @@ async def send_question(message: Message, state: FSMContext, session: AsyncSessi
     question_text = format_question_text(question, answers, index + 1, len(question_ids))
     timer_text = lambda s: f"{question_text}\n\n{test_time_remaining(s)}"
 
+    # Og'ir yuklamada taymer edit'lari yo'q - xabarda muddat (HH:MM:SS gacha)
+    static = edit_budget.is_static(countdown)
+    first_text = f"{question_text}\n\n{test_deadline_text(deadline_clock(countdown))}" if static else timer_text(countdown)
+
     await state.update_data(timer_active=True, current_answers=answers)
 
     # Savolni yuborish
@@ -213,13 +223,13 @@ async def send_question(message: Message, state: FSMContext, session: AsyncSessi
             sent_msg = await message.bot.send_photo(
                 chat_id=message.chat.id,
                 photo=question.image,
-                caption=timer_text(countdown),
+                caption=first_text,
                 reply_markup=markup,
                 parse_mode="HTML"
             )
         else:
             sent_msg = await message.answer(
-                timer_text(countdown),
+                first_text,
                 reply_markup=markup,
                 parse_mode="HTML"
             )
@@ -231,29 +241,55 @@ async def send_question(message: Message, state: FSMContext, session: AsyncSessi
 
     # ⏱️ TIMER TASK
     async def countdown_timer():
-        for sec in range(countdown - TIMER_UPDATE_INTERVAL, 0, -TIMER_UPDATE_INTERVAL):
-            await asyncio.sleep(TIMER_UPDATE_INTERVAL)
+        # Taymer edit'lari Bot API metrikalarida alohida (bot/utils/api_session.py)
+        API_ORIGIN.set('test_handler.countdown')
+        deadline = time.monotonic() + countdown
 
-            current_data = await state.get_data()
-            if not current_data.get("timer_active", False):
-                return
+        with edit_budget.track():
+            if static:
+                COUNTDOWN_EDITS.inc(result='static')
+                await asyncio.sleep(countdown)
 
-            try:
-                updated_text = timer_text(sec)
-                if question.image:
-                    await sent_msg.edit_caption(
-                        caption=updated_text,
-                        reply_markup=markup,
-                        parse_mode="HTML"
-                    )
-                else:
-                    await sent_msg.edit_text(
-                        updated_text,
-                        reply_markup=markup,
-                        parse_mode="HTML"
-                    )
-            except Exception:
-                break
+            while not static:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+
+                await asyncio.sleep(edit_budget.next_step(remaining))
+
+                current_data = await state.get_data()
+                if not current_data.get("timer_active", False):
+                    return
+
+                sec = round(deadline - time.monotonic())
+                if sec <= 0:
+                    break
+                if not edit_budget.try_acquire(sec):
+                    COUNTDOWN_EDITS.inc(result='skipped')
+                    continue
+
+                try:
+                    updated_text = timer_text(sec)
+                    if question.image:
+                        await sent_msg.edit_caption(
+                            caption=updated_text,
+                            reply_markup=markup,
+                            parse_mode="HTML"
+                        )
+                    else:
+                        await sent_msg.edit_text(
+                            updated_text,
+                            reply_markup=markup,
+                            parse_mode="HTML"
+                        )
+                    COUNTDOWN_EDITS.inc(result='sent')
+                except TelegramRetryAfter as e:
+                    edit_budget.pause(e.retry_after)
+                except Exception:
+                    break
+
+            # Vaqt tugashini kutish (edit xatosi bilan chiqilgan bo'lsa)
+            await asyncio.sleep(max(deadline - time.monotonic(), 0))
 
         # VAQT TUGADI
         current_data = await state.get_data()
@@ -17,6 +17,8 @@ from sqlalchemy import select
 
 from db.models import TestCategory, Test, TestAnswer, test_category_association
 from bot.utils.constants import ANSWER_LETTERS
+from bot.utils.single_flight import single_flight
+from utils.env_data import Config as cf
 
 # 📂 MESSAGE STORE CONSTANTS
 MAX_MESSAGES_PER_USER = 5
@@ -115,6 +117,7 @@ async def send_clean_message(message: Message, text: str, reply_markup=None, cat
 
 # 📊 DATABASE FUNCTIONS
 
+@single_flight(ttl=cf.bot.READ_CACHE_TTL)
 async def get_test_categories(session: AsyncSession, section: str) -> List[TestCategory]:
     """
     Section bo'yicha test kategoriyalarini olish
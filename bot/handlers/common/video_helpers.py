@@ -11,6 +11,9 @@ from collections import defaultdict, deque
 import asyncio
 
 from db.models import VideoCategory, Video
+from bot.utils.content_stats import content_stats
+from bot.utils.single_flight import single_flight
+from utils.env_data import Config as cf
 
 # ==================== CONSTANTS ====================
 DELETE_CHUNK_SIZE = 10
@@ -85,6 +88,7 @@ async def delete_user_messages(bot, user_id: int, category: str, exclude_ids: Op
 
 # ==================== DATABASE QUERIES ====================
 
+@single_flight(ttl=cf.bot.READ_CACHE_TTL)
 async def get_video_categories(session: AsyncSession, section: str) -> List[VideoCategory]:
     """
     Section bo'yicha video kategoriyalarini olish
@@ -105,6 +109,7 @@ async def get_video_categories(session: AsyncSession, section: str) -> List[Vide
     return list(result.scalars().all())
 
 
+@single_flight(ttl=cf.bot.READ_CACHE_TTL)
 async def get_category_with_videos(
         session: AsyncSession,
         category_id: int
@@ -127,6 +132,7 @@ async def get_category_with_videos(
     return result.scalar_one_or_none()
 
 
+@single_flight(ttl=cf.bot.READ_CACHE_TTL)
 async def get_video_by_id(
         session: AsyncSession,
         video_id: int
@@ -149,6 +155,7 @@ async def get_video_by_id(
     return result.scalar_one_or_none()
 
 
+@single_flight(ttl=cf.bot.READ_CACHE_TTL)
 async def get_video_statistics(
         session: AsyncSession,
         section: str
@@ -163,6 +170,10 @@ async def get_video_statistics(
     Returns:
         (jami_videolar_soni, kategoriyalar_statistikasi)
     """
+    # Xotiradan (bot/utils/content_stats.py), ulanish bo'lmasa - bazadan
+    if content_stats.ready:
+        return content_stats.section_statistics('video', section)
+
     # Jami videolar soni
     total_result = await session.execute(
         select(func.count(Video.id))
@@ -0,0 +1,142 @@
+# bot/handlers/debug_handler.py
+"""
+Admin diagnostika komandalari (faqat BOT_ADMIN_IDS):
+/debug - event loop holati
+/profile [soniya] - sampling profil (collapsed stack, flamegraph uchun)
+/memory [soniya] - tracemalloc farqi va xotiradagi dict'lar o'sishi
+"""
+import asyncio
+import time
+from html import escape
+
+from aiogram import Router, F
+from aiogram.enums import ChatType
+from aiogram.filters import Command, CommandObject
+from aiogram.types import Message, BufferedInputFile
+
+from bot.handlers.common.conspect_helpers import conspect_message_store
+from bot.handlers.common.folder_helpers import folder_message_store
+from bot.handlers.common.test_helpers import message_store as test_message_store
+from bot.handlers.common.video_helpers import video_message_store
+from bot.handlers.media_handler import (
+    user_flood_protection, user_ban_history, user_ban_until, user_last_messages, user_last_replies,
+)
+from bot.handlers.mm.mm_accident_helpers import accident_message_store
+from bot.handlers.start_handler import message_store as start_message_store, user_help_tasks
+from bot.handlers.language_handler import message_store as language_message_store
+from bot.handlers.text_handler import user_text_messages
+from bot.middlewares import user_warn_messages, rate_limiters
+from bot.utils.loop_monitor import loop_monitor
+from bot.utils.message_helpers import user_section_messages, user_main_messages
+from bot.utils.metrics import task_origins
+from utils.env_data import Config as cf
+from utils.profiling import sample_stacks, memory_diff, ProfilerBusy, MAX_PROFILE_SECONDS, MAX_MEMORY_SECONDS
+
+debug_router = Router()
+admin_only = (F.chat.type == ChatType.PRIVATE, F.from_user.id.in_(cf.bot.ADMIN_IDS))
+
+SHOW_SLOW = 5
+SHOW_STACK = 4
+SHOW_TASKS = 10
+PROFILE_SECONDS = 10
+MEMORY_SECONDS = 30
+
+
+def debug_text() -> str:
+    monitor = loop_monitor
+    lines = [
+        "🩺 <b>Event loop</b>",
+        f"⏱ Lag: oxirgi <b>{monitor.last_lag * 1000:.1f} ms</b>, "
+        f"maks <b>{monitor.max_lag * 1000:.0f} ms</b> ({monitor.samples} namuna)",
+        f"🐢 Chegara: {monitor.threshold * 1000:.0f} ms",
+    ]
+
+    tasks = sorted(task_origins().items(), key=lambda item: -item[1])
+    lines.append(f"\n📋 <b>Task'lar: {sum(count for _, count in tasks)}</b>")
+    for (origin,), count in tasks[:SHOW_TASKS]:
+        lines.append(f"• <code>{escape(origin)}</code> — {count}")
+
+    slow = list(monitor.slow)[-SHOW_SLOW:]
+    lines.append(f"\n🐢 <b>Sekin callback'lar</b> (oxirgi {len(slow)} / {len(monitor.slow)})")
+    if not slow:
+        lines.append("— yo'q")
+    for item in reversed(slow):
+        ago = time.time() - item.at
+        lines.append(f"• <b>{escape(item.handler)}</b> — {item.duration * 1000:.0f} ms, {ago:.0f} s oldin")
+        if item.stack:
+            lines.append("<pre>" + escape("\n".join(item.stack[-SHOW_STACK:])) + "</pre>")
+
+    return "\n".join(lines)
+
+
+def tracked_containers() -> dict:
+    """Foydalanuvchi soni bilan o'sadigan jarayon xotirasidagi dict'lar"""
+    containers = {
+        'middlewares.user_warn_messages': user_warn_messages,
+        'text_handler.user_text_messages': user_text_messages,
+        'start_handler.user_help_tasks': user_help_tasks,
+        'message_helpers.user_section_messages': user_section_messages,
+        'message_helpers.user_main_messages': user_main_messages,
+        'media_handler.user_flood_protection': user_flood_protection,
+        'media_handler.user_ban_history': user_ban_history,
+        'media_handler.user_ban_until': user_ban_until,
+        'media_handler.user_last_messages': user_last_messages,
+        'media_handler.user_last_replies': user_last_replies,
+        'test_helpers.message_store': test_message_store.user_messages,
+        'start_handler.message_store': start_message_store.user_messages,
+        'language_handler.message_store': language_message_store.user_messages,
+        'conspect_helpers.message_store': conspect_message_store.user_messages,
+        'folder_helpers.message_store': folder_message_store.user_messages,
+        'video_helpers.message_store': video_message_store.user_messages,
+        'mm_accident_helpers.message_store': accident_message_store.user_messages,
+    }
+    for event, middleware in rate_limiters.items():
+        containers[f'RateLimitMiddleware[{event}].user_requests'] = middleware.user_requests
+    return containers
+
+
+def _seconds(command: CommandObject, default: int, maximum: int) -> int:
+    try:
+        return min(max(int(command.args), 1), maximum)
+    except (TypeError, ValueError):
+        return default
+
+
+@debug_router.message(*admin_only, Command("debug"))
+async def debug_command(message: Message):
+    await message.answer(debug_text())
+
+
+@debug_router.message(*admin_only, Command("profile"))
+async def profile_command(message: Message, command: CommandObject):
+    seconds = _seconds(command, PROFILE_SECONDS, MAX_PROFILE_SECONDS)
+    await message.answer(f"⏳ {seconds} s profil yozilmoqda...")
+
+    try:
+        # Alohida thread'da - event loop o'zi ham namunaga tushadi
+        folded = await asyncio.to_thread(sample_stacks, seconds)
+    except ProfilerBusy:
+        return await message.answer("⚠️ Boshqa profil yozilmoqda, keyinroq urinib ko'ring")
+
+    filename = f"bot-profile-{time.strftime('%Y%m%d-%H%M%S')}.folded"
+    await message.answer_document(
+        BufferedInputFile(folded.encode(), filename=filename),
+        caption="🔥 Collapsed stack: flamegraph.pl / speedscope.app",
+    )
+
+
+@debug_router.message(*admin_only, Command("memory"))
+async def memory_command(message: Message, command: CommandObject):
+    seconds = _seconds(command, MEMORY_SECONDS, MAX_MEMORY_SECONDS)
+    await message.answer(f"⏳ {seconds} s xotira o'zgarishi kuzatilmoqda...")
+
+    try:
+        report = await asyncio.to_thread(memory_diff, seconds, tracked_containers())
+    except ProfilerBusy:
+        return await message.answer("⚠️ Boshqa profil yozilmoqda, keyinroq urinib ko'ring")
+
+    filename = f"bot-memory-{time.strftime('%Y%m%d-%H%M%S')}.txt"
+    await message.answer_document(
+        BufferedInputFile(report.encode(), filename=filename),
+        caption="🧠 tracemalloc farqi",
+    )
@@ -5,11 +5,13 @@ from aiogram.enums import ChatMemberStatus
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 import asyncio
+import logging
 
 from bot.middlewares import user_warn_messages
 from db.models import Group  # ✅ Channel → Group
 
 group_router = Router()
+logger = logging.getLogger(__name__)
 
 
 @group_router.chat_member()
@@ -39,7 +41,7 @@ async def user_joined_group(update: ChatMemberUpdated, bot: Bot, session: AsyncS
             await send_start_button(bot, user_id)
 
     except Exception as e:
-        print(f"Error in user_joined_group: {e}")
+        logger.error("Error in user_joined_group: %s", e)
 
 
 async def clear_user_warnings(bot: Bot, user_id: int):
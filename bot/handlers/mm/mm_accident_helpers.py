@@ -11,6 +11,9 @@ from collections import defaultdict, deque
 import asyncio
 
 from db.models import AccidentYear, Accident, AccidentCategory, AccidentView
+from bot.utils.content_stats import content_stats
+from bot.utils.single_flight import single_flight
+from utils.env_data import Config as cf
 
 # ==================== CONSTANTS ====================
 DELETE_CHUNK_SIZE = 10
@@ -86,6 +89,7 @@ async def delete_user_messages(bot, user_id: int, category: str, exclude_ids: Op
 
 # ==================== DATABASE QUERIES ====================
 
+@single_flight(ttl=cf.bot.READ_CACHE_TTL)
 async def get_accident_years(session: AsyncSession) -> List[AccidentYear]:
     """
     Baxtsiz hodisa yillarini olish
@@ -103,6 +107,7 @@ async def get_accident_years(session: AsyncSession) -> List[AccidentYear]:
     return sorted(years, key=lambda y: y.year_number, reverse=True)
 
 
+@single_flight(ttl=cf.bot.READ_CACHE_TTL)
 async def get_year_with_accidents(
         session: AsyncSession,
         year_id: int
@@ -125,6 +130,8 @@ async def get_year_with_accidents(
     return result.scalar_one_or_none()
 
 
+# Ko'rishlar soni bilan - TTL yo'q, faqat birlashtirish
+@single_flight()
 async def get_accident_by_id(
         session: AsyncSession,
         accident_id: int
@@ -183,6 +190,7 @@ async def increment_accident_views(
         await session.rollback()
 
 
+@single_flight(ttl=cf.bot.READ_CACHE_TTL)
 async def get_main_statistics(
         session: AsyncSession
 ) -> Tuple[int, List[Tuple]]:
@@ -192,6 +200,10 @@ async def get_main_statistics(
     Returns:
         (jami_hodisalar, yillar_statistikasi)
     """
+    # Xotiradan (bot/utils/content_stats.py), ulanish bo'lmasa - bazadan
+    if content_stats.ready:
+        return content_stats.accident_main_statistics(EXCLUDED_CATEGORY)
+
     # Jami hodisalar (Xisobat'siz)
     total_result = await session.execute(
         select(func.count(Accident.id))
@@ -217,6 +229,7 @@ async def get_main_statistics(
     return total_count, year_stats
 
 
+@single_flight(ttl=cf.bot.READ_CACHE_TTL)
 async def get_year_statistics(
         session: AsyncSession,
         year_id: int
@@ -231,6 +244,10 @@ async def get_year_statistics(
     Returns:
         (jami_hodisalar, kategoriyalar_statistikasi)
     """
+    # Xotiradan (bot/utils/content_stats.py), ulanish bo'lmasa - bazadan
+    if content_stats.ready:
+        return content_stats.accident_year_statistics(year_id, EXCLUDED_CATEGORY)
+
     # Kategoriyalar bo'yicha (Xisobat'siz)
     result = await session.execute(
         select(
@@ -1,9 +1,12 @@
 # bot/handlers/text_handler.py
+import logging
+
 from aiogram import Router, F
 from aiogram.enums import ParseMode, ChatType, ContentType
 from aiogram.types import Message
 
 text_router = Router()
+logger = logging.getLogger(__name__)
 
 MAX_STORED_MESSAGES = 1
 user_text_messages = {}
@@ -27,7 +30,7 @@ async def handle_private_texts(message: Message):
         try:
             await message.bot.delete_message(chat_id=user_id, message_id=old_msg_id)
         except Exception as e:
-            print(f"[ERROR] delete_message: {e}")
+            logger.warning("delete_message: %s", e)
 
 
 # Kanal ID olish uchun - BIRINCHI BO'LISHI KERAK!
@@ -39,7 +42,7 @@ async def forward_channel_id(message: Message):
     """Kanaldan forward qilingan xabardan ID olish"""
     chat = message.forward_from_chat
 
-    print(f"[DEBUG] Forward from: {chat.type} - {chat.title}")  # Debug
+    logger.debug("Forward from: %s - %s", chat.type, chat.title)
 
     if chat.type == ChatType.CHANNEL:
         await message.answer(
@@ -1,21 +1,35 @@
 # bot/middlewares.py
+import logging
+import time
 from typing import Callable, Awaitable, Dict, Any, List
 from aiogram import BaseMiddleware, Bot
+from aiogram.dispatcher.event.bases import UNHANDLED as UNHANDLED_EVENT
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
-from aiogram.types import TelegramObject, Message, CallbackQuery
+from aiogram.types import TelegramObject, Message, CallbackQuery, Update
 from sqlalchemy import select
 from aiogram.enums import ChatMemberStatus
 from aiogram.exceptions import TelegramBadRequest
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
-from aiogram.utils.i18n import I18n
+from aiogram.utils.i18n import I18n, FSMI18nMiddleware
 from bot.utils.user_helpers import get_user_by_telegram_id
 
+from bot.utils.metrics import (
+    UPDATE_SECONDS, MIDDLEWARE_SECONDS, HANDLER_SECONDS,
+    EVENTS_DROPPED, RATE_LIMITED, UNHANDLED, HANDLER_ERRORS, API_ORIGIN,
+)
+from db import profiler
 from db.models import Group
+from utils.env_data import Config as cf
+from utils.logging_setup import bind, unbind
+
+logger = logging.getLogger(__name__)
+ratelimit_logger = logging.getLogger('bot.ratelimit')  # LOG_SAMPLE bilan siyraklashtiriladi
 
 MAX_STORED_MESSAGES = 2
 user_warn_messages: Dict[int, list[int]] = {}  # user_id -> list of warning message_ids
+rate_limiters: Dict[str, 'RateLimitMiddleware'] = {}  # event -> middleware (/memory uchun)
 
 
 def create_group_join_keyboard(groups: List[Group]) -> InlineKeyboardMarkup:
@@ -115,7 +129,7 @@ class JoinGroupMiddleware(BaseMiddleware):
 
             except TelegramBadRequest as e:
                 await self.send_error_warning(bot, message, user.id)
-                print(f"[JOIN CHECK ERROR] {e}")
+                logger.warning("Join check error: %s", e, extra={'chat_id': group.chat_id})
                 return
 
         # Agar a'zo bo'lmagan guruh/kanallar bo'lsa
@@ -165,7 +179,7 @@ class JoinGroupMiddleware(BaseMiddleware):
             user_warn_messages.setdefault(user_id, []).append(sent_msg.message_id)
 
         except Exception as e:
-            print(f"[SEND JOIN WARNING ERROR] {e}")
+            logger.warning("Send join warning error: %s", e)
 
     async def send_kicked_warning(self, bot: Bot, message: Message, user_id: int):
         """Chetlashtirilgan foydalanuvchi uchun warning"""
@@ -195,7 +209,7 @@ class JoinGroupMiddleware(BaseMiddleware):
             user_warn_messages.setdefault(user_id, []).append(sent_msg.message_id)
 
         except Exception as e:
-            print(f"[SEND KICKED WARNING ERROR] {e}")
+            logger.warning("Send kicked warning error: %s", e)
 
     async def send_error_warning(self, bot: Bot, message: Message, user_id: int):
         """Xatolik uchun warning"""
@@ -221,7 +235,7 @@ class JoinGroupMiddleware(BaseMiddleware):
             user_warn_messages.setdefault(user_id, []).append(sent_msg.message_id)
 
         except Exception as e:
-            print(f"[SEND ERROR WARNING ERROR] {e}")
+            logger.warning("Send error warning error: %s", e)
 
 
 class UserLanguageMiddleware(BaseMiddleware):
@@ -259,7 +273,7 @@ class UserLanguageMiddleware(BaseMiddleware):
                     self.i18n.current_locale = self.default_locale
 
         except Exception as e:
-            print(f"Error loading user language: {e}")
+            logger.warning("Error loading user language: %s", e)
             self.i18n.current_locale = self.default_locale
 
         return await handler(event, data)
@@ -272,10 +286,8 @@ class RateLimitMiddleware(BaseMiddleware):
         self.rate_limit = rate_limit  # Soniya
         self.user_requests = {}  # user_id: timestamp
 
-        # Admin user IDs (spam limit yo'q)
-        self.admin_ids = {
-            900172087,  # Sizning telegram ID
-        }
+        # Admin user IDs (spam limit yo'q) - BOT_ADMIN_IDS
+        self.admin_ids = cf.bot.ADMIN_IDS
 
     async def __call__(
             self,
@@ -302,7 +314,8 @@ class RateLimitMiddleware(BaseMiddleware):
             time_passed = now - self.user_requests[user_id]
             if time_passed < self.rate_limit:
                 # Spam - ignore qilish
-                print(f"🚫 Rate limit: User {user_id}")
+                RATE_LIMITED.inc(event=type(event).__name__)
+                ratelimit_logger.info("Rate limit", extra={'event': type(event).__name__})
                 return
 
         # Request'ni record qilish
@@ -392,4 +405,182 @@ class UserBlockMiddleware(BaseMiddleware):
             if user.telegram_id in self.blocked_notified:
                 del self.blocked_notified[user.telegram_id]
 
-        return await handler(event, data)
\ No newline at end of file
+            # Botni blokdan chiqargan - e'lonlar yana yuboriladi
+            if user.bot_blocked:
+                user.bot_blocked = False
+                await session.commit()
+
+        return await handler(event, data)
+
+
+# ==================== METRIKALAR ====================
+
+class TimedMiddleware(BaseMiddleware):
+    """
+    Middleware'ni o'rab, uning O'Z vaqtini yozadi (keyingi zanjir ayirib tashlanadi).
+    handler chaqirilmasa - event shu middleware'da to'xtagan (dropped).
+    """
+
+    def __init__(self, middleware: BaseMiddleware, name: str | None = None):
+        self.middleware = middleware
+        self.name = name or type(middleware).__name__.removesuffix('Middleware')
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
+            data: Dict[str, Any],
+    ) -> Any:
+        downstream = 0.0
+        called = False
+
+        async def timed_handler(event: TelegramObject, data: Dict[str, Any]) -> Any:
+            nonlocal downstream, called
+            called = True
+            started = time.perf_counter()
+            try:
+                return await handler(event, data)
+            finally:
+                downstream += time.perf_counter() - started
+
+        event_type = type(event).__name__
+        origin = API_ORIGIN.set(f'middleware:{self.name}')
+        started = time.perf_counter()
+        try:
+            return await self.middleware(timed_handler, event, data)
+        finally:
+            API_ORIGIN.reset(origin)
+            MIDDLEWARE_SECONDS.observe(
+                time.perf_counter() - started - downstream, middleware=self.name, event=event_type
+            )
+            if not called:
+                EVENTS_DROPPED.inc(middleware=self.name, event=event_type)
+
+
+class UpdateMetricsMiddleware(BaseMiddleware):
+    """dp.update outer - update turi bo'yicha to'liq vaqt va ishlanmagan update'lar"""
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: Update,
+            data: Dict[str, Any],
+    ) -> Any:
+        update_type = event.event_type
+        user = getattr(event.event, 'from_user', None)
+        context = bind(update_id=event.update_id, user_id=user.id if user else None)
+        started = time.perf_counter()
+        try:
+            result = await handler(event, data)
+        finally:
+            elapsed = time.perf_counter() - started
+            UPDATE_SECONDS.observe(elapsed, type=update_type)
+            logger.debug("Update", extra={'type': update_type, 'latency_ms': round(elapsed * 1000, 1)})
+            unbind(context)
+
+        if result is UNHANDLED_EVENT:
+            UNHANDLED.inc(type=update_type)
+        return result
+
+
+class QueryProfilerMiddleware(BaseMiddleware):
+    """dp.update outer - update ichidagi barcha SQL so'rovlar (db/profiler.py)"""
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: Update,
+            data: Dict[str, Any],
+    ) -> Any:
+        # Nom handler topilgach aniqlashtiriladi (HandlerMetricsMiddleware)
+        token = profiler.start(event.event_type, 'bot')
+        try:
+            return await handler(event, data)
+        finally:
+            profiler.finish(token)
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """Router inner middleware - faqat filtrlardan o'tgan handler vaqti"""
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
+            data: Dict[str, Any],
+    ) -> Any:
+        # Router'lar nomsiz - handler moduli bo'yicha guruhlanadi (test_handler, folder_handler, ...)
+        callback = getattr(data.get('handler'), 'callback', None)
+        module = getattr(callback, '__module__', 'unknown').rsplit('.', 1)[-1]
+        name = getattr(callback, '__name__', 'unknown')
+        profiler.set_name(f'{module}.{name}')
+        origin = API_ORIGIN.set(f'{module}.{name}')
+        # unbind yo'q - UpdateMetricsMiddleware'ning yakuniy logida ham handler bo'lsin,
+        # u update oxirida butun kontekstni qaytaradi
+        bind(handler=f'{module}.{name}')
+
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        except Exception as e:
+            HANDLER_ERRORS.inc(module=module, handler=name, error=type(e).__name__)
+            raise
+        finally:
+            API_ORIGIN.reset(origin)
+            HANDLER_SECONDS.observe(time.perf_counter() - started, module=module, handler=name)
+
+
+def instrument_routers(dp):
+    """Har bir router'ning barcha observer'lariga handler vaqtini o'lchash"""
+    dp.update.outer_middleware(UpdateMetricsMiddleware())
+
+    # Faqat sub-router'larga: dp'ning inner middleware'lari barcha router'larga tarqaladi
+    handler_metrics = HandlerMetricsMiddleware()
+    for router in dp.chain_tail:
+        if router is dp:
+            continue
+        for event_name, observer in router.observers.items():
+            if event_name in ('update', 'error'):
+                continue
+            observer.middleware(handler_metrics)
+
+
+def setup_middlewares(dp, session_pool: async_sessionmaker[AsyncSession], i18n: I18n):
+    """
+    Production middleware zanjiri (main.py va benchmarks/ bir xil ishlatadi).
+    Har bir middleware TimedMiddleware bilan o'raladi - bot/utils/metrics.py
+    """
+    observers = (dp.message, dp.callback_query)
+
+    def outer(factory, name: str | None = None):
+        for observer in observers:
+            observer.outer_middleware(TimedMiddleware(factory(), name))
+
+    # Rate Limiting middleware qo'shish
+    rate_limiters['message'] = RateLimitMiddleware(rate_limit=0.5)  # 0.5 soniya
+    rate_limiters['callback_query'] = RateLimitMiddleware(rate_limit=0.3)  # 0.3 soniya
+    dp.message.middleware(TimedMiddleware(rate_limiters['message']))
+    dp.callback_query.middleware(TimedMiddleware(rate_limiters['callback_query']))
+
+    # 1. I18n middleware - ENG BIRINCHI (til funksiyalarini beradi)
+    outer(lambda: FSMI18nMiddleware(i18n), 'I18n')
+
+    # 2. Database session - ikkinchi
+    outer(lambda: DbSessionMiddleware(session_pool))
+
+    # 3. Channel check - uchinchi
+    outer(lambda: JoinGroupMiddleware(session_pool))
+
+    # 4. USER BLOCK CHECK - TO'RTINCHI
+    outer(lambda: UserBlockMiddleware())
+
+    # 5. User language loading - OXIRIDA (til o'rnatadi va override qiladi)
+    outer(lambda: UserLanguageMiddleware(session_pool, i18n))
+
+    # 6. Group router'ga middleware qo'shish
+    from bot.handlers.group_events import group_router
+    group_router.chat_member.outer_middleware(TimedMiddleware(DbSessionMiddleware(session_pool)))
+
+    # 7. SQL profiler + handler / update vaqtlari
+    dp.update.outer_middleware(QueryProfilerMiddleware())
+    instrument_routers(dp)
@@ -0,0 +1,116 @@
+# bot/utils/api_session.py
+"""
+Bot API sessiyasi - metrikalar va ulanishlar sozlamasi bilan
+
+Barcha Bot API trafigi shu sessiya orqali o'tadi (main.py). Handler'lardagi
+`try/except: pass` bloklari yutib yuboradigan xatolar ham shu yerda
+hisoblanadi:
+
+    bot_api_calls_total{method="deleteMessage",origin="middleware:PrivateChat",result="ok"}
+    bot_api_errors_total{method="deleteMessage",error="message to delete not found"}
+    bot_api_request_seconds{method="editMessageText"}
+
+origin - chaqiruv qayerdan (bot/utils/metrics.py: API_ORIGIN): tozalash
+delete'lari va test taymeri edit'lari API byudjetining qancha qismini
+olishini ko'rish uchun.
+
+render_cache (bot/utils/render_cache.py) berilsa, xabarni o'sha ko'rinishga
+qayta edit qilish yuborilmaydi, faqat klaviatura o'zgarganda esa
+editMessageReplyMarkup yuboriladi:
+
+    bot_api_edits_skipped_total{method="editMessageText",kind="noop"}
+"""
+import re
+import time
+from typing import Any, Optional
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiogram.exceptions import (
+    TelegramAPIError, TelegramBadRequest, TelegramNetworkError, TelegramRetryAfter,
+)
+from aiogram.methods import TelegramMethod
+from aiogram.methods.base import TelegramType
+
+from bot.utils.metrics import API_SECONDS, API_CALLS, API_ERRORS, API_EDITS_SKIPPED, API_ORIGIN
+from bot.utils.render_cache import RenderCache, NOOP
+
+_PREFIX = re.compile(r"^(bad request|forbidden|conflict|unauthorized|not found)\s*:\s*", re.IGNORECASE)
+_NUMBER = re.compile(r"\d+")
+MAX_ERROR_LABEL = 80
+
+
+def error_label(error: Exception) -> str:
+    """Xato izohini label'ga: raqamlarsiz, prefikssiz (kardinallik cheklangan)"""
+    if isinstance(error, TelegramRetryAfter):
+        return 'retry after'
+    if isinstance(error, TelegramNetworkError):
+        # "ClientConnectorError: Cannot connect to host ..." -> faqat klass
+        return 'network: ' + error.message.split(':', 1)[0].lower()
+    if isinstance(error, TelegramAPIError):
+        # "message is not modified: specified new message content ..." -> birinchi qismi
+        message = _PREFIX.sub('', error.message.strip()).split(': ', 1)[0].lower()
+        return _NUMBER.sub('N', message)[:MAX_ERROR_LABEL]
+    return type(error).__name__
+
+
+class InstrumentedSession(AiohttpSession):
+    """
+    AiohttpSession + har bir Bot API metodi bo'yicha chaqiruvlar, vaqt va xatolar.
+
+    Ulanishlar: hammasi bitta host'ga (api.telegram.org) - umumiy limit,
+    keep-alive (har chaqiruvda TLS handshake bo'lmasligi uchun) va DNS keshi.
+    """
+
+    def __init__(self, api_url: Optional[str] = None, limit: int = 100,
+                 keepalive: float = 60, dns_ttl: int = 600,
+                 render_cache: Optional[RenderCache] = None, **kwargs: Any):
+        self.render_cache = render_cache
+        if api_url:
+            kwargs['api'] = TelegramAPIServer.from_base(api_url)
+        super().__init__(limit=limit, **kwargs)
+        self._connector_init.update(
+            limit_per_host=limit,
+            keepalive_timeout=keepalive,
+            ttl_dns_cache=dns_ttl,
+        )
+
+    async def make_request(
+            self, bot: Bot, method: TelegramMethod[TelegramType], timeout: Optional[int] = None
+    ) -> TelegramType:
+        cache = self.render_cache
+        if cache is None:
+            return await self._timed_request(bot, method, timeout)
+
+        request, skipped = cache.plan(bot, method)
+        if skipped:
+            API_EDITS_SKIPPED.inc(method=method.__api_method__, kind=skipped)
+        if skipped == NOOP:
+            # Xabar allaqachon shu ko'rinishda - Telegram baribir "not modified" qaytarardi
+            return True
+
+        try:
+            result = await self._timed_request(bot, request, timeout)
+        except TelegramBadRequest as e:
+            if 'message is not modified' in e.message:
+                cache.remember(bot, method)
+            raise
+        cache.remember(bot, method, result)
+        return result
+
+    async def _timed_request(
+            self, bot: Bot, method: TelegramMethod[TelegramType], timeout: Optional[int] = None
+    ) -> TelegramType:
+        api_method = method.__api_method__
+        result = 'ok'
+        started = time.perf_counter()
+        try:
+            return await super().make_request(bot, method, timeout)
+        except Exception as e:
+            result = type(e).__name__
+            API_ERRORS.inc(method=api_method, error=error_label(e))
+            raise
+        finally:
+            API_SECONDS.observe(time.perf_counter() - started, method=api_method)
+            API_CALLS.inc(method=api_method, origin=API_ORIGIN.get(), result=result)
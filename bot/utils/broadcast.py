@@ -0,0 +1,291 @@
+# bot/utils/broadcast.py
+"""
+E'lonlarni barcha xodimlarga yuborish (broadcast)
+
+Admin paneldan broadcasts jadvaliga yoziladi, bot jarayonidagi
+run_broadcast_scheduler() uni oladi va yuboradi:
+- qabul qiluvchilar id bo'yicha bo'laklab o'qiladi (keyset, OFFSET yo'q)
+- token bucket - umumiy tezlik Telegram limitidan past (interaktiv javoblarga joy qoladi)
+- RetryAfter - butun bucket to'xtaydi (flood limiti global)
+- botni bloklaganlar users.bot_blocked = true
+- har bo'lakdan keyin last_user_id checkpoint - qayta ishga tushganda davom etadi
+- matn HTML'i buzuq bo'lsa ("can't parse entities") - e'lon darhol 'failed'
+- boshqa Telegram xatolari (5xx, ...) faqat shu qabul qiluvchini FAILED qiladi -
+  bo'lak to'xtamaydi, yuborilganlarga qayta yuborilmaydi
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+
+from aiogram import Bot
+from aiogram.exceptions import (
+    TelegramAPIError, TelegramRetryAfter, TelegramForbiddenError, TelegramBadRequest,
+    TelegramNetworkError, TelegramServerError,
+)
+from sqlalchemy import select, update, func
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+
+from bot.utils.metrics import API_ORIGIN
+from db.models import Broadcast, User
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+MAX_ERRORS = 5  # ketma-ket xatoliklardan keyin e'lon 'failed'
+SENT, FAILED, BLOCKED = 'sent', 'failed', 'blocked'
+
+# "chat not found", "user is deactivated" - qayta urinish foydasiz
+UNREACHABLE_ERRORS = ('chat not found', 'user is deactivated', 'bot was blocked')
+# Matnning o'zi noto'g'ri - hech kimga yuborilmaydi
+TEXT_ERRORS = ("can't parse entities", 'message is too long', 'text must be non-empty')
+
+
+class BroadcastTextError(Exception):
+    """E'lon matnini Telegram qabul qilmadi"""
+
+
+class TokenBucket:
+    """
+    Oddiy token bucket: soniyasiga `rate` ta token, ko'pi bilan `capacity`.
+    pause() - RetryAfter kelganda hamma kutadi.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def try_acquire(self, floor: float = 0) -> bool:
+        """Kutmasdan: token bo'lsa (va `floor`dan ortiq qolsa) - True"""
+        now = time.monotonic()
+        if now < self.paused_until:
+            return False
+        self._refill(now)
+        if self.tokens - 1 >= floor:
+            self.tokens -= 1
+            return True
+        return False
+
+    def pause(self, seconds: float):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+
+@dataclass
+class BatchResult:
+    sent: int = 0
+    failed: int = 0
+    blocked_ids: list = field(default_factory=list)
+
+
+async def send_one(bot: Bot, bucket: TokenBucket, chat_id: int, text: str) -> str:
+    """
+    Bitta xabar. Returns: SENT, FAILED yoki BLOCKED
+
+    Faqat BroadcastTextError ko'tariladi - qolgan xatolar bo'lakni to'xtatmasin
+    """
+    for attempt in range(MAX_ATTEMPTS):
+        await bucket.acquire()
+        try:
+            await bot.send_message(chat_id=chat_id, text=text, disable_web_page_preview=True)
+            return SENT
+
+        except TelegramRetryAfter as e:
+            logger.warning("Broadcast flood limit: retry after %ss", e.retry_after)
+            bucket.pause(e.retry_after)
+
+        except TelegramForbiddenError:
+            return BLOCKED
+
+        except TelegramBadRequest as e:
+            if any(error in str(e).lower() for error in UNREACHABLE_ERRORS):
+                return BLOCKED
+            if any(error in str(e).lower() for error in TEXT_ERRORS):
+                raise BroadcastTextError(e.message) from e
+            logger.warning("Broadcast to %s failed: %s", chat_id, e)
+            return FAILED
+
+        except (TelegramNetworkError, TelegramServerError) as e:
+            logger.warning("Broadcast network/server error (%s/%s): %s", attempt + 1, MAX_ATTEMPTS, e)
+            await asyncio.sleep(2 ** attempt)
+
+        except TelegramAPIError as e:
+            logger.warning("Broadcast to %s failed: %s", chat_id, e)
+            return FAILED
+
+    return FAILED
+
+
+def _recipients_query(broadcast: Broadcast, batch_size: int):
+    query = select(User.id, User.telegram_id).where(
+        User.id > broadcast.last_user_id,
+        User.is_active == True,
+        User.bot_blocked == False
+    )
+    if broadcast.language_code:
+        query = query.where(User.language_code == broadcast.language_code)
+    return query.order_by(User.id).limit(batch_size)
+
+
+def _now():
+    """created_at bilan bir xil vaqt (db/utils.py: tz)"""
+    return func.timezone('Asia/Tashkent', func.now())
+
+
+async def _finish(session: AsyncSession, broadcast: Broadcast, status: str, error: str | None = None):
+    broadcast.status = status
+    broadcast.error = error
+    broadcast.finished_at = _now()
+    await session.commit()
+
+
+async def run_broadcast(bot: Bot, session_pool: async_sessionmaker[AsyncSession], broadcast_id: int,
+                        bucket: TokenBucket, batch_size: int):
+    """Bitta e'lonni checkpoint'dan oxirigacha yuborish"""
+    while True:
+        async with session_pool() as session:
+            broadcast = await session.get(Broadcast, broadcast_id)
+
+            if broadcast.cancel_requested:
+                await _finish(session, broadcast, 'cancelled')
+                logger.info("Broadcast #%s cancelled", broadcast_id)
+                return
+
+            rows = (await session.execute(_recipients_query(broadcast, batch_size))).all()
+            if not rows:
+                await _finish(session, broadcast, 'done')
+                logger.info("Broadcast #%s done: %s sent", broadcast_id, broadcast.sent)
+                return
+
+            text = broadcast.text
+
+        # Bo'lak parallel yuboriladi, tezlikni bucket cheklaydi.
+        # Matn xatosida TaskGroup qolgan yuborishlarni bekor qiladi
+        text_error = None
+        tasks = []
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [group.create_task(send_one(bot, bucket, telegram_id, text)) for _, telegram_id in rows]
+        except* BroadcastTextError as errors:
+            text_error = str(errors.exceptions[0])
+
+        result = _tally(rows, tasks)
+
+        if text_error:
+            # Xatodan oldin yuborilganlar ham hisoblagichlarda qolsin
+            await _checkpoint(session_pool, broadcast_id, result)
+            async with session_pool() as session:
+                broadcast = await session.get(Broadcast, broadcast_id)
+                await _finish(session, broadcast, 'failed', f"Matn xatosi: {text_error}")
+            logger.error("Broadcast #%s failed: %s", broadcast_id, text_error)
+            return
+
+        await _checkpoint(session_pool, broadcast_id, result, last_user_id=rows[-1][0])
+
+
+def _tally(rows, tasks) -> BatchResult:
+    """Tugagan yuborishlar natijasi (bekor qilinganlari hisobga olinmaydi)"""
+    result = BatchResult()
+    for (user_id, _), task in zip(rows, tasks):
+        if not task.done() or task.cancelled() or task.exception() is not None:
+            continue
+        status = task.result()
+        if status == SENT:
+            result.sent += 1
+        elif status == BLOCKED:
+            result.blocked_ids.append(user_id)
+        else:
+            result.failed += 1
+    return result
+
+
+async def _checkpoint(session_pool: async_sessionmaker[AsyncSession], broadcast_id: int,
+                      result: BatchResult, last_user_id: int | None = None):
+    """Bloklanganlar + hisoblagichlar (+ last_user_id)"""
+    values = {
+        'sent': Broadcast.sent + result.sent,
+        'failed': Broadcast.failed + result.failed,
+        'blocked': Broadcast.blocked + len(result.blocked_ids),
+    }
+    if last_user_id is not None:
+        values['last_user_id'] = last_user_id
+
+    async with session_pool() as session:
+        if result.blocked_ids:
+            await session.execute(
+                update(User).where(User.id.in_(result.blocked_ids)).values(bot_blocked=True)
+            )
+        await session.execute(update(Broadcast).where(Broadcast.id == broadcast_id).values(**values))
+        await session.commit()
+
+
+async def run_broadcast_scheduler(bot: Bot, session_pool: async_sessionmaker[AsyncSession],
+                                  rate: float = 20, batch_size: int = 200, interval: int = 5):
+    """
+    Bot process'ida navbatdagi e'lonlarni yuborish.
+    'running' holatidagilar (bot qayta ishga tushgan) birinchi navbatda davom ettiriladi.
+    """
+    API_ORIGIN.set('broadcast')
+    bucket = TokenBucket(rate)
+    errors = 0
+
+    while True:
+        broadcast_id = None
+        try:
+            async with session_pool() as session:
+                broadcast = (await session.execute(
+                    select(Broadcast).where(
+                        Broadcast.status.in_(('queued', 'running'))
+                    ).order_by(Broadcast.status.desc(), Broadcast.id).limit(1)
+                )).scalar_one_or_none()
+
+                if broadcast:
+                    broadcast_id = broadcast.id
+                    if broadcast.status == 'queued':
+                        broadcast.status = 'running'
+                        broadcast.started_at = _now()
+                        await session.commit()
+
+            if broadcast_id:
+                await run_broadcast(bot, session_pool, broadcast_id, bucket, batch_size)
+                errors = 0
+                continue
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # 'running' qoladi - keyingi siklda checkpoint'dan davom etadi
+            errors += 1
+            logger.error(f"Broadcast error ({errors}/{MAX_ERRORS}): {e}")
+            if broadcast_id and errors >= MAX_ERRORS:
+                errors = 0
+                try:
+                    async with session_pool() as session:
+                        broadcast = await session.get(Broadcast, broadcast_id)
+                        await _finish(session, broadcast, 'failed', str(e))
+                except Exception as inner:
+                    logger.error(f"Broadcast status update error: {inner}")
+
+        await asyncio.sleep(interval)
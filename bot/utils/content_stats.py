@@ -0,0 +1,300 @@
+# bot/utils/content_stats.py
+"""
+Bo'limlar statistikasi - bot xotirasida, inkremental yangilanadi
+
+Statistika tugmalari (video, konspekt, papka, baxtsiz hodisalar) har bosilganda
+join + group by qilardi, get_folder_statistics esa barcha fayllarni yuklab
+Python'da sanardi. Endi:
+
+- bot ishga tushganda konteyner (kategoriya, papka, yil) bo'yicha elementlar
+  soni bir necha guruhlangan so'rov bilan yuklanadi
+- kontent jadvallaridagi trigger'lar (migrations: content_stats_notify)
+  har INSERT/UPDATE/DELETE'da pg_notify('content_stats', ...) yuboradi -
+  admin panel o'zgartirsa, bot hisoblagichni +1/-1 qiladi
+- har CONTENT_STATS_RESYNC soniyada (va LISTEN ulanishi uzilganda) to'liq
+  qayta yuklash - yo'qolgan xabarlar va TRUNCATE uchun
+
+Yuklash bitta REPEATABLE READ tranzaksiyasida, pg_current_snapshot() bilan.
+Har bir xabarda tranzaksiya xid'i bor: snapshot'da ko'rinadigan o'zgarish
+allaqachon sanalgan - o'tkazib yuboriladi. Yuklash paytida kelgan xabarlar
+eski holatga qo'llanadi va navbatga olinadi, almashtirilgandan keyin yangi
+holatga qayta qo'llanadi (snapshot'da yo'qlari).
+
+Helper'lar (get_video_statistics, ...) `content_stats.ready` bo'lsa shu
+yerdan, aks holda (benchmark, ulanish yo'q) bazadan o'qiydi.
+"""
+import asyncio
+import json
+import logging
+from collections import defaultdict, namedtuple
+
+from sqlalchemy import select, func, text
+
+from bot.utils.metrics import CONTENT_STATS_EVENTS
+from db.models import (
+    VideoCategory, Video, ConspectCategory, Conspect, Folder, File,
+    AccidentYear, AccidentCategory, Accident,
+)
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'content_stats'
+RECONNECT_DELAY = 5
+
+# Helper'lardagi Row kabi: stat.name, stat.count
+StatRow = namedtuple('StatRow', ('name', 'count'))
+
+# jadval -> (statistika turi, konteyner ustuni)
+ITEM_TABLES = {
+    'videos': ('video', 'category_id'),
+    'conspects': ('conspect', 'category_id'),
+    'files': ('folder', 'folder_id'),
+}
+CONTAINER_TABLES = {
+    'video_categories': 'video',
+    'conspect_categories': 'conspect',
+    'folders': 'folder',
+}
+
+
+def _parse_snapshot(value: str) -> tuple[int, int, set[int]]:
+    """pg_current_snapshot(): 'xmin:xmax:xip1,xip2'"""
+    xmin, xmax, xip = value.split(':')
+    return int(xmin), int(xmax), {int(xid) for xid in xip.split(',') if xid}
+
+
+def _visible(xid: int, snapshot: tuple[int, int, set[int]]) -> bool:
+    """Tranzaksiya snapshot olinganda commit bo'lganmi (pg_visible_in_snapshot)"""
+    xmin, xmax, xip = snapshot
+    return xid < xmin or (xid < xmax and xid not in xip)
+
+
+def _order(table_row: dict) -> tuple:
+    """get_folders / get_*_categories tartibi: order_index, keyin yaratilish (id)"""
+    return table_row.get('order_index') or 0, table_row['id']
+
+
+class _Section:
+    """Konteyner -> (name, section, parent_type, tartib) va elementlar soni"""
+
+    def __init__(self):
+        self.containers: dict[int, tuple] = {}
+        self.counts: dict[int, int] = defaultdict(int)
+
+    def rows(self, section: str, parent_type: str | None = None) -> list[StatRow]:
+        containers = sorted(
+            (item for item in self.containers.items()
+             if item[1][1] == section and (parent_type is None or item[1][2] == parent_type)),
+            key=lambda item: item[1][3],
+        )
+        rows = [StatRow(name, self.counts.get(container_id, 0)) for container_id, (name, *_) in containers]
+        return sorted(rows, key=lambda row: row.count, reverse=True)
+
+
+class ContentStats:
+    def __init__(self):
+        self.ready = False
+        self.sections = {kind: _Section() for kind in ('video', 'conspect', 'folder')}
+        self.years: dict[int, str] = {}
+        self.accident_categories: dict[int, str] = {}
+        self.accidents: dict[tuple[int, int], int] = defaultdict(int)
+        # Oxirgi yuklash snapshot'i va yuklash paytida kelgan xabarlar
+        self._snapshot: tuple[int, int, set[int]] | None = None
+        self._pending: list[dict] | None = None
+
+    # ==================== LOAD ====================
+
+    async def load(self, engine):
+        """To'liq holat - bitta snapshot'da, konteyner bo'yicha guruhlangan so'rovlar"""
+        self._pending = []
+        try:
+            async with engine.connect() as conn:
+                conn = await conn.execution_options(isolation_level='REPEATABLE READ')
+                async with conn.begin():
+                    # Birinchi so'rov - tranzaksiya snapshot'i shu paytda olinadi
+                    snapshot = (await conn.execute(text('SELECT pg_current_snapshot()::text'))).scalar()
+                    state = await self._query(conn)
+        except BaseException:
+            self._pending = None
+            raise
+
+        self.sections, self.years, self.accident_categories, self.accidents = state
+        self._snapshot = _parse_snapshot(snapshot)
+        pending, self._pending = self._pending, None
+        for event in pending:
+            self._apply_new(event)
+        self.ready = True
+
+    @staticmethod
+    async def _query(conn) -> tuple:
+        sections = {kind: _Section() for kind in ('video', 'conspect', 'folder')}
+
+        for kind, container, item, fk in (
+                ('video', VideoCategory, Video, Video.category_id),
+                ('conspect', ConspectCategory, Conspect, Conspect.category_id),
+        ):
+            result = await conn.execute(
+                select(container.id, container.name, container.section, func.count(item.id))
+                .join(item, container.id == fk, isouter=True)
+                .group_by(container.id)
+            )
+            for container_id, name, section, count in result:
+                sections[kind].containers[container_id] = (name, section, None, _order({'id': container_id}))
+                sections[kind].counts[container_id] = count
+
+        result = await conn.execute(
+            select(Folder.id, Folder.name, Folder.section, Folder.parent_type, Folder.order_index,
+                   func.count(File.id))
+            .join(File, Folder.id == File.folder_id, isouter=True)
+            .group_by(Folder.id)
+        )
+        for folder_id, name, section, parent_type, order_index, count in result:
+            sections['folder'].containers[folder_id] = (
+                name, section, parent_type, _order({'id': folder_id, 'order_index': order_index})
+            )
+            sections['folder'].counts[folder_id] = count
+
+        years = dict((await conn.execute(select(AccidentYear.id, AccidentYear.name))).all())
+        categories = dict((await conn.execute(select(AccidentCategory.id, AccidentCategory.name))).all())
+        accidents = defaultdict(int)
+        result = await conn.execute(
+            select(Accident.year_id, Accident.category_id, func.count(Accident.id))
+            .group_by(Accident.year_id, Accident.category_id)
+        )
+        for year_id, category_id, count in result:
+            accidents[(year_id, category_id)] = count
+
+        return sections, years, categories, accidents
+
+    # ==================== INCREMENTAL ====================
+
+    def handle(self, event: dict):
+        """pg_notify payload: {"table", "op", "xid", "old", "new"} (trigger'dan)"""
+        CONTENT_STATS_EVENTS.inc(table=event['table'])
+        if self._pending is not None:
+            self._pending.append(event)
+        self._apply_new(event)
+
+    def _apply_new(self, event: dict):
+        """Joriy holat snapshot'ida hali sanalmagan bo'lsa"""
+        xid = event.get('xid')
+        if self._snapshot and xid is not None and _visible(int(xid), self._snapshot):
+            return
+        self.apply(event)
+
+    def apply(self, event: dict):
+        table, old, new = event['table'], event.get('old'), event.get('new')
+
+        if table in ITEM_TABLES:
+            kind, column = ITEM_TABLES[table]
+            self._move(self.sections[kind].counts, old and old[column], new and new[column])
+        elif table == 'accidents':
+            self._move(
+                self.accidents,
+                old and (old['year_id'], old['category_id']),
+                new and (new['year_id'], new['category_id']),
+            )
+        elif table in CONTAINER_TABLES:
+            section = self.sections[CONTAINER_TABLES[table]]
+            if new is None:
+                section.containers.pop(old['id'], None)
+                section.counts.pop(old['id'], None)
+            else:
+                section.containers[new['id']] = (new['name'], new['section'], new.get('parent_type'), _order(new))
+        elif table in ('accident_years', 'accident_categories'):
+            names = self.years if table == 'accident_years' else self.accident_categories
+            if new is None:
+                names.pop(old['id'], None)
+            else:
+                names[new['id']] = new['name']
+
+    @staticmethod
+    def _move(counts: dict, old_key, new_key):
+        # Kaskad o'chirishda konteyner avval olib tashlangan bo'lishi mumkin
+        if old_key is not None and counts.get(old_key):
+            counts[old_key] -= 1
+        if new_key is not None:
+            counts[new_key] += 1
+
+    # ==================== READ ====================
+
+    def section_statistics(self, kind: str, section: str) -> tuple[int, list[StatRow]]:
+        """Video/konspekt: (jami, kategoriyalar)"""
+        rows = self.sections[kind].rows(section)
+        return sum(row.count for row in rows), rows
+
+    def folder_statistics(self, section: str, parent_type: str) -> tuple[int, int, list[StatRow]]:
+        """(papkalar soni, fayllar soni, papkalar)"""
+        rows = self.sections['folder'].rows(section, parent_type)
+        return len(rows), sum(row.count for row in rows), rows
+
+    def _accident_counts(self, excluded: str):
+        excluded_ids = {cid for cid, name in self.accident_categories.items() if name == excluded}
+        for (year_id, category_id), count in self.accidents.items():
+            if count and category_id not in excluded_ids:
+                yield year_id, category_id, count
+
+    def accident_main_statistics(self, excluded: str) -> tuple[int, list[StatRow]]:
+        """(jami, yillar) - yil nomi bo'yicha kamayish tartibida"""
+        by_year = defaultdict(int)
+        for year_id, _, count in self._accident_counts(excluded):
+            by_year[year_id] += count
+        rows = [StatRow(self.years[year_id], count) for year_id, count in by_year.items() if year_id in self.years]
+        rows.sort(key=lambda row: row.name, reverse=True)
+        return sum(by_year.values()), rows
+
+    def accident_year_statistics(self, year_id: int, excluded: str) -> tuple[int, list[StatRow]]:
+        """(jami, kategoriyalar) - yil ichida"""
+        rows = [
+            StatRow(self.accident_categories[category_id], count)
+            for y_id, category_id, count in self._accident_counts(excluded)
+            if y_id == year_id and category_id in self.accident_categories
+        ]
+        rows.sort(key=lambda row: row.count, reverse=True)
+        return sum(row.count for row in rows), rows
+
+    # ==================== LISTENER ====================
+
+    async def run(self, engine, resync: int = 600):
+        """
+        LISTEN content_stats + davriy to'liq qayta yuklash (bot process'ida).
+        Ulanish uzilsa - qayta ulanadi va holatni qayta yuklaydi.
+        """
+
+        def on_notify(connection, pid, channel, payload):
+            try:
+                self.handle(json.loads(payload))
+            except Exception as e:
+                logger.warning("Content stats event error: %s", e)
+
+        while True:
+            try:
+                async with engine.connect() as conn:
+                    raw = (await conn.get_raw_connection()).driver_connection
+                    lost = asyncio.Event()
+                    raw.add_termination_listener(lambda connection: lost.set())
+                    # Avval LISTEN, keyin yuklash - oradagi o'zgarishlar yo'qolmasin
+                    await raw.add_listener(CHANNEL, on_notify)
+                    try:
+                        while not lost.is_set():
+                            await self.load(engine)
+                            logger.debug("Content stats loaded")
+                            try:
+                                await asyncio.wait_for(lost.wait(), timeout=resync)
+                            except asyncio.TimeoutError:
+                                pass
+                    finally:
+                        if not raw.is_closed():
+                            await raw.remove_listener(CHANNEL, on_notify)
+                logger.warning("Content stats listener connection lost")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Content stats listener error: %s", e)
+
+            # Qayta ulanguncha - bazadan
+            self.ready = False
+            await asyncio.sleep(RECONNECT_DELAY)
+
+
+content_stats = ContentStats()
@@ -0,0 +1,83 @@
+# bot/utils/countdown.py
+"""
+Test taymeri uchun umumiy edit byudjeti
+
+Har bir savol xabari taymer bilan yangilanadi (edit_text / edit_caption).
+Bir vaqtda yuzlab xodim test ishlasa, har 5 soniyada edit - Telegram
+limitidan ancha ko'p (429). Shuning uchun:
+- barcha taymerlar bitta token bucket'dan foydalanadi (COUNTDOWN_EDIT_RATE)
+- yangilanish oralig'i faol taymerlar soniga qarab cho'ziladi
+- oxirgi soniyalar (COUNTDOWN_FINAL_SECONDS) uchun byudjetning bir qismi zaxirada
+- oraliq shunchalik uzunki, savol davomida COUNTDOWN_MIN_UPDATES tadan kam
+  yangilanish bo'lsa - edit umuman yo'q, xabarda "HH:MM:SS gacha" muddati
+"""
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from bot.utils.broadcast import TokenBucket
+from bot.utils.metrics import COUNTDOWNS_ACTIVE
+from utils.env_data import Config as cf
+
+TASHKENT = ZoneInfo('Asia/Tashkent')
+
+MIN_INTERVAL = 5  # soniya - bundan tez yangilanmaydi (oldingi TIMER_UPDATE_INTERVAL)
+FINAL_RESERVE = 0.3  # byudjetning oxirgi soniyalar uchun zaxira ulushi
+
+
+class EditBudget:
+    def __init__(self, rate: float, final_seconds: int = 10, min_updates: int = 3):
+        self.rate = rate
+        self.final_seconds = final_seconds
+        self.min_updates = min_updates
+        self.bucket = TokenBucket(rate)
+        self.reserve = self.bucket.capacity * FINAL_RESERVE
+        self.active = 0
+
+    def interval(self) -> float:
+        """Bitta xabar uchun yangilanish oralig'i - faol taymerlar zaxirasiz byudjetni bo'lishadi"""
+        share = self.rate * (1 - FINAL_RESERVE)
+        return max(MIN_INTERVAL, self.active / share)
+
+    def next_step(self, remaining: float) -> float:
+        """Keyingi yangilanishgacha kutish; oxirgi soniyalar oynasiga kirish o'tkazib yuborilmaydi"""
+        if remaining <= self.final_seconds:
+            step = MIN_INTERVAL
+        else:
+            step = min(self.interval(), max(remaining - self.final_seconds, 1))
+        return min(step, remaining)
+
+    def is_static(self, countdown: int) -> bool:
+        """Og'ir yuklama: savol davomida min_updates tadan kam yangilanish chiqadi"""
+        return countdown / self.interval() < self.min_updates
+
+    def try_acquire(self, remaining: float) -> bool:
+        """Oxirgi soniyalar butun byudjetdan, qolganlar - zaxiradan tashqari qismidan"""
+        urgent = remaining <= self.final_seconds
+        return self.bucket.try_acquire(floor=0 if urgent else self.reserve)
+
+    def pause(self, seconds: float):
+        """RetryAfter - barcha taymerlar to'xtaydi"""
+        self.bucket.pause(seconds)
+
+    @contextmanager
+    def track(self):
+        self.active += 1
+        COUNTDOWNS_ACTIVE.set(self.active)
+        try:
+            yield self
+        finally:
+            self.active -= 1
+            COUNTDOWNS_ACTIVE.set(self.active)
+
+
+def deadline_clock(seconds: int) -> str:
+    """Hozirdan `seconds` keyingi vaqt (Toshkent) - HH:MM:SS"""
+    return (datetime.now(TASHKENT) + timedelta(seconds=seconds)).strftime('%H:%M:%S')
+
+
+edit_budget = EditBudget(
+    rate=cf.bot.COUNTDOWN_EDIT_RATE,
+    final_seconds=cf.bot.COUNTDOWN_FINAL_SECONDS,
+    min_updates=cf.bot.COUNTDOWN_MIN_UPDATES,
+)
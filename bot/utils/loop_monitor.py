@@ -0,0 +1,124 @@
+# bot/utils/loop_monitor.py
+"""
+Event loop kechikishi va sekin callback'lar
+
+Bot bitta event loop'da ishlaydi - handler ichidagi sinxron kod (katta
+tsikllar, print, time.sleep) shu vaqt ichida BARCHA foydalanuvchilarni
+to'xtatadi. LoopMonitor:
+- har `interval` soniyada uxlab, qanchalik kech uyg'onganini o'lchaydi (lag)
+- alohida watchdog thread loop kechikayotganini ko'rsa, loop thread'ining
+  o'sha paytdagi stack'ini oladi - qaysi handler band qilganini ko'rsatadi
+- natija: /metrics (bot_event_loop_lag_seconds, bot_slow_callbacks_total,
+  bot_asyncio_tasks) va admin uchun /debug komandasi
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+
+from bot.utils.metrics import LOOP_LAG_SECONDS, SLOW_CALLBACKS
+from utils.env_data import Config as cf
+
+logger = logging.getLogger(__name__)
+
+BOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIR = os.path.dirname(BOT_DIR)
+HANDLERS_DIR = os.path.join(BOT_DIR, 'handlers')
+STACK_LIMIT = 8
+
+
+@dataclass
+class SlowCallback:
+    at: float  # time.time()
+    duration: float
+    handler: str
+    stack: list[str] = field(default_factory=list)
+
+
+def _short_path(filename: str) -> str:
+    """Loyiha fayllari - nisbiy yo'l, kutubxonalar - faqat fayl nomi"""
+    if filename.startswith(PROJECT_DIR):
+        return os.path.relpath(filename, PROJECT_DIR)
+    return os.path.basename(filename)
+
+
+def _handler_name(frames: list[traceback.FrameSummary]) -> str:
+    """Stack ichidan eng chuqur bot kodi: avval bot/handlers, keyin bot/ ichidagi istalgan joy"""
+    for prefix in (HANDLERS_DIR, BOT_DIR):
+        for frame in reversed(frames):
+            if frame.filename.startswith(prefix) and frame.filename != __file__:
+                module = os.path.splitext(os.path.basename(frame.filename))[0]
+                return f'{module}.{frame.name}'
+    return 'unknown'
+
+
+class LoopMonitor:
+    def __init__(self, interval: float = 0.5, threshold: float = 0.1, keep: int = 20):
+        self.interval = interval
+        self.threshold = threshold
+        self.slow: deque[SlowCallback] = deque(maxlen=keep)
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.samples = 0
+
+        self._expected = None  # sampler qachon uyg'onishi kerak (monotonic)
+        self._loop_thread = None
+        self._snapshot = None  # watchdog olgan stack (stall davomida)
+
+    # ==================== WATCHDOG ====================
+
+    def _watchdog(self):
+        """Loop kechikayotganda uning thread'idagi joriy stack'ni olish"""
+        poll = max(self.threshold / 2, 0.01)
+        while True:
+            time.sleep(poll)
+            expected = self._expected
+            if expected is None or self._snapshot is not None:
+                continue
+            if time.monotonic() - expected < self.threshold:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is not None:
+                self._snapshot = traceback.extract_stack(frame)
+
+    # ==================== SAMPLER ====================
+
+    def _record(self, lag: float):
+        frames, self._snapshot = self._snapshot, None
+        frames = frames or []
+        handler = _handler_name(frames)
+        stack = [f'{_short_path(frame.filename)}:{frame.lineno} {frame.name}' for frame in frames[-STACK_LIMIT:]]
+        self.slow.append(SlowCallback(time.time(), lag, handler, stack))
+        SLOW_CALLBACKS.inc(handler=handler)
+        logger.warning("Event loop %.0f ms band: %s", lag * 1000, handler)
+
+    async def run(self):
+        self._loop_thread = threading.get_ident()
+        threading.Thread(target=self._watchdog, name='loop-watchdog', daemon=True).start()
+
+        while True:
+            self._expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(time.monotonic() - self._expected, 0.0)
+
+            self.samples += 1
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            LOOP_LAG_SECONDS.observe(lag)
+
+            if lag >= self.threshold:
+                self._record(lag)
+            else:
+                self._snapshot = None
+
+
+loop_monitor = LoopMonitor(
+    interval=cf.bot.LOOP_MONITOR_INTERVAL,
+    threshold=cf.bot.SLOW_CALLBACK_MS / 1000,
+)
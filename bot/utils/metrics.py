@@ -0,0 +1,238 @@
+# bot/utils/metrics.py
+"""
+Bot metrikalari (Prometheus text format)
+
+Tashqi kutubxonasiz, oddiy histogram/counter'lar - bitta event loop ichida
+yoziladi. main.py /metrics endpoint'ini bot jarayonining o'zida ochadi:
+
+    curl http://127.0.0.1:9101/metrics
+
+Yoziladigan joylar: bot/middlewares.py (TimedMiddleware, UpdateMetricsMiddleware,
+HandlerMetricsMiddleware, RateLimitMiddleware), bot/utils/api_session.py (Bot API),
+bot/utils/loop_monitor.py (event loop).
+"""
+import asyncio
+import logging
+import math
+from collections import defaultdict
+from contextvars import ContextVar
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+# Soniya - tez middleware'dan (ms) uzun handler'gacha (test pauzalari)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names: tuple, values: tuple, extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labels: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = labels
+        self.values = defaultdict(float)
+
+    def inc(self, amount: float = 1, **labels):
+        self.values[tuple(labels.get(name, '') for name in self.label_names)] += amount
+
+    def render(self) -> list[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        for key, value in sorted(self.values.items()):
+            lines.append(f'{self.name}{_labels(self.label_names, key)} {_number(value)}')
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = labels
+        self.buckets = tuple(buckets) + (math.inf,)
+        self.series = {}  # labels -> [bucket'lar soni..., sum, count]
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels.get(name, '') for name in self.label_names)
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = [0] * len(self.buckets) + [0.0, 0]
+
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+                break
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        for key, series in sorted(self.series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f'{self.name}_bucket{_labels(self.label_names, key, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_labels(self.label_names, key)} {_number(series[-2])}')
+            lines.append(f'{self.name}_count{_labels(self.label_names, key)} {series[-1]}')
+        return lines
+
+
+class Gauge:
+    """Joriy qiymat; collect berilsa - har render'da hisoblanadi ({labels: qiymat})"""
+
+    def __init__(self, name: str, documentation: str, labels: tuple = (), collect=None):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = labels
+        self.values = {}
+        self.collect = collect
+
+    def set(self, value: float, **labels):
+        self.values[tuple(labels.get(name, '') for name in self.label_names)] = value
+
+    def render(self) -> list[str]:
+        values = self.collect() if self.collect else self.values
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} gauge']
+        for key, value in sorted(values.items()):
+            lines.append(f'{self.name}{_labels(self.label_names, key)} {_number(value)}')
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+# ==================== BOT METRIKALARI ====================
+
+UPDATE_SECONDS = REGISTRY.register(Histogram(
+    'bot_update_seconds', "Update'ni to'liq qayta ishlash vaqti", ('type',)
+))
+MIDDLEWARE_SECONDS = REGISTRY.register(Histogram(
+    'bot_middleware_seconds', "Middleware'ning o'z vaqti (keyingi zanjirsiz)", ('middleware', 'event')
+))
+HANDLER_SECONDS = REGISTRY.register(Histogram(
+    'bot_handler_seconds', 'Handler vaqti', ('module', 'handler')
+))
+EVENTS_DROPPED = REGISTRY.register(Counter(
+    'bot_events_dropped_total', "Middleware handler'ni chaqirmay to'xtatgan event'lar", ('middleware', 'event')
+))
+RATE_LIMITED = REGISTRY.register(Counter(
+    'bot_rate_limited_total', "RateLimitMiddleware tashlab yuborgan event'lar", ('event',)
+))
+UNHANDLED = REGISTRY.register(Counter(
+    'bot_updates_unhandled_total', "Hech bir handler'ga tushmagan update'lar", ('type',)
+))
+HANDLER_ERRORS = REGISTRY.register(Counter(
+    'bot_handler_errors_total', 'Handler xatolari', ('module', 'handler', 'error')
+))
+
+# ==================== BOT API ====================
+
+# Bot API chaqiruvi kimdan: middleware:<nom>, <modul>.<handler>, broadcast, ...
+# Fon task'lari (create_task) yaratilgan paytdagi qiymatni meros oladi
+API_ORIGIN: ContextVar[str] = ContextVar('api_origin', default='background')
+
+API_SECONDS = REGISTRY.register(Histogram(
+    'bot_api_request_seconds', 'Bot API chaqiruvi vaqti', ('method',)
+))
+API_CALLS = REGISTRY.register(Counter(
+    'bot_api_calls_total', 'Bot API chaqiruvlari (result: ok yoki xato klassi)', ('method', 'origin', 'result')
+))
+API_ERRORS = REGISTRY.register(Counter(
+    'bot_api_errors_total', "Bot API xatolari (Telegram izohi bo'yicha)", ('method', 'error')
+))
+API_EDITS_SKIPPED = REGISTRY.register(Counter(
+    'bot_api_edits_skipped_total',
+    "Yuborilmagan/qisqartirilgan edit'lar (noop - o'zgarish yo'q, markup_only - faqat klaviatura)",
+    ('method', 'kind')
+))
+
+COUNTDOWNS_ACTIVE = REGISTRY.register(Gauge(
+    'bot_countdowns_active', "Ishlayotgan test taymerlari"
+))
+COUNTDOWN_EDITS = REGISTRY.register(Counter(
+    'bot_countdown_edits_total', "Taymer yangilanishlari (sent, skipped - byudjet, static - muddat matni)", ('result',)
+))
+
+
+# ==================== DB O'QISHLARI ====================
+
+READS_COALESCED = REGISTRY.register(Counter(
+    'bot_reads_total',
+    "Handler o'qish funksiyalari (leader - DB so'rovi, shared - parallel so'rovni kutdi, cached - TTL)",
+    ('name', 'result')
+))
+CONTENT_STATS_EVENTS = REGISTRY.register(Counter(
+    'bot_content_stats_events_total', "Statistika keshini yangilagan kontent o'zgarishlari (pg_notify)", ('table',)
+))
+
+
+# ==================== EVENT LOOP ====================
+
+def task_origins() -> dict[tuple, int]:
+    """Tirik asyncio task'lar - coroutine nomi bo'yicha (countdown_timer, _safe_delete, ...)"""
+    counts = defaultdict(int)
+    for task in asyncio.all_tasks():
+        coro = task.get_coro()
+        name = getattr(coro, '__qualname__', type(coro).__name__)
+        counts[(name.replace('.<locals>', ''),)] += 1
+    return counts
+
+
+LOOP_LAG_SECONDS = REGISTRY.register(Histogram(
+    'bot_event_loop_lag_seconds', "Event loop kechikishi (sleep'dan kech uyg'onish)",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+))
+SLOW_CALLBACKS = REGISTRY.register(Counter(
+    'bot_slow_callbacks_total', "Event loop'ni chegaradan uzoq band qilgan kod", ('handler',)
+))
+TASKS = REGISTRY.register(Gauge(
+    'bot_asyncio_tasks', "Tirik asyncio task'lar (coroutine bo'yicha)", ('origin',), collect=task_origins
+))
+
+
+# ==================== HTTP ENDPOINT ====================
+
+async def metrics_view(request: web.Request) -> web.Response:
+    return web.Response(text=REGISTRY.render(), content_type='text/plain', charset='utf-8')
+
+
+async def start_metrics_server(host: str, port: int) -> web.AppRunner:
+    """Bot jarayonida /metrics (aiohttp - aiogram bilan birga keladi)"""
+    app = web.Application()
+    app.router.add_get('/metrics', metrics_view)
+
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info("Metrics: http://%s:%s/metrics", host, port)
+    return runner
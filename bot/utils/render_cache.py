@@ -0,0 +1,130 @@
+# bot/utils/render_cache.py
+"""
+Xabarlarning oxirgi yuborilgan ko'rinishi (matn + klaviatura) keshi
+
+Handler'lar ko'pincha xabarni xuddi shu ko'rinishga qayta edit qiladi
+(natijadan keyin next_question_keyboard, o'zgarmagan papka sahifasi,
+taymerning oxirgi tick'i) - Telegram "message is not modified" qaytaradi,
+kod esa uni yutib yuboradi. Bot API sessiyasi (bot/utils/api_session.py)
+har bir (chat, message_id) uchun oxirgi matn va klaviatura hash'ini saqlaydi:
+
+- hech narsa o'zgarmagan edit - yuborilmaydi (True qaytadi)
+- faqat klaviatura o'zgargan editMessageText/Caption -> editMessageReplyMarkup
+"""
+from collections import OrderedDict
+
+from aiogram import Bot
+from aiogram.client.default import Default
+from aiogram.methods import EditMessageReplyMarkup, TelegramMethod
+from aiogram.types import Message
+
+# send* -> matn maydoni
+SEND_METHODS = {
+    'sendMessage': 'text',
+    'sendPhoto': 'caption',
+    'sendVideo': 'caption',
+    'sendDocument': 'caption',
+    'sendAnimation': 'caption',
+    'sendAudio': 'caption',
+    'sendVoice': 'caption',
+}
+EDIT_METHODS = {
+    'editMessageText': 'text',
+    'editMessageCaption': 'caption',
+}
+# Xabar ko'rinishi noma'lum bo'ladi - keshdan chiqariladi
+FORGET_METHODS = ('deleteMessage', 'editMessageMedia')
+
+NOOP, MARKUP_ONLY = 'noop', 'markup_only'
+
+
+def _markup_key(markup) -> int | None:
+    if markup is None:
+        return None
+    return hash(markup.model_dump_json(exclude_none=True))
+
+
+def _text_key(bot: Bot, method: TelegramMethod, field: str) -> int:
+    parse_mode = getattr(method, 'parse_mode', None)
+    if isinstance(parse_mode, Default):
+        parse_mode = bot.default[parse_mode.name]
+    entities = getattr(method, 'entities' if field == 'text' else 'caption_entities', None)
+    return hash((getattr(method, field, None), parse_mode, repr(entities) if entities else None))
+
+
+class RenderCache:
+    """(chat_id, message_id) -> (matn hash, klaviatura hash), LRU"""
+
+    def __init__(self, maxsize: int = 50_000):
+        self.maxsize = maxsize
+        self._items: OrderedDict[tuple, tuple] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _store(self, key: tuple, text_key, markup_key):
+        self._items[key] = (text_key, markup_key)
+        self._items.move_to_end(key)
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    @staticmethod
+    def _key(method: TelegramMethod) -> tuple | None:
+        if getattr(method, 'inline_message_id', None) or getattr(method, 'message_id', None) is None:
+            return None
+        return method.chat_id, method.message_id
+
+    def plan(self, bot: Bot, method: TelegramMethod) -> tuple[TelegramMethod | None, str | None]:
+        """
+        Yuborishdan oldin: (yuboriladigan metod yoki None, sabab).
+        None - xabar allaqachon shu ko'rinishda.
+        """
+        name = method.__api_method__
+        if name not in EDIT_METHODS and name != 'editMessageReplyMarkup':
+            return method, None
+
+        key = self._key(method)
+        cached = self._items.get(key) if key else None
+        if cached is None:
+            return method, None
+
+        markup_key = _markup_key(method.reply_markup)
+        if name == 'editMessageReplyMarkup':
+            return (None, NOOP) if cached[1] == markup_key else (method, None)
+
+        text_key = _text_key(bot, method, EDIT_METHODS[name])
+        if cached == (text_key, markup_key):
+            return None, NOOP
+        if cached[0] == text_key:
+            return EditMessageReplyMarkup(
+                chat_id=method.chat_id,
+                message_id=method.message_id,
+                reply_markup=method.reply_markup,
+            ), MARKUP_ONLY
+        return method, None
+
+    def remember(self, bot: Bot, method: TelegramMethod, result=None):
+        """Muvaffaqiyatli (yoki "not modified") chaqiruvdan keyin"""
+        name = method.__api_method__
+
+        if name in SEND_METHODS:
+            if isinstance(result, Message):
+                self._store(
+                    (result.chat.id, result.message_id),
+                    _text_key(bot, method, SEND_METHODS[name]),
+                    _markup_key(getattr(method, 'reply_markup', None)),
+                )
+            return
+
+        key = self._key(method) if name in EDIT_METHODS or name in FORGET_METHODS \
+            or name == 'editMessageReplyMarkup' else None
+        if key is None:
+            return
+
+        if name in FORGET_METHODS:
+            self._items.pop(key, None)
+        elif name == 'editMessageReplyMarkup':
+            cached = self._items.get(key)
+            self._store(key, cached[0] if cached else None, _markup_key(method.reply_markup))
+        else:
+            self._store(key, _text_key(bot, method, EDIT_METHODS[name]), _markup_key(method.reply_markup))
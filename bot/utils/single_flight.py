@@ -0,0 +1,153 @@
+# bot/utils/single_flight.py
+"""
+Bir xil o'qish so'rovlarini birlashtirish (single-flight)
+
+Smena boshlig'i "Baxtsiz Hodisalar"ni ochinglar desa, yuzlab xodim bir
+soniyada get_accident_years / get_main_statistics ni chaqiradi - har biri
+bir xil so'rov. Dekorator bilan bir xil argumentli parallel chaqiruvlar
+bitta DB so'rovini kutadi va natijasini bo'lishadi:
+
+    @single_flight(ttl=cf.bot.READ_CACHE_TTL)
+    async def get_accident_years(session: AsyncSession) -> List[AccidentYear]:
+        ...
+
+- kalit - funksiya nomi + session'dan tashqari argumentlar
+- birinchi chaqiruv (leader) o'z session'ida so'rov qiladi, qolganlari kutadi
+- ttl > 0 - natija yana N soniya qayta ishlatiladi
+- natija ORM obyektlari (selectinload bilan yuklangan) - faqat o'qish uchun.
+  Natija leader session'idan butun graf (yuklangan relationship'lar) bilan
+  ajratiladi (expunge): o'sha session'dagi rollback (log_activity,
+  increment_*_views) boshqa handler'lar ushlab turgan obyektlarni expire
+  qilmasin. Ro'yxat har chaqiruvchiga nusxa qilib qaytariladi
+
+Random tanlaydigan yoki yozadigan funksiyalar (get_category_tests,
+increment_*_views) dekoratsiya qilinmaydi.
+"""
+import asyncio
+import functools
+import time
+from typing import Any, Callable
+
+from sqlalchemy import inspect
+from sqlalchemy.orm.base import instance_state
+
+from bot.utils.metrics import READS_COALESCED
+
+# Leader bekor qilindi - kutganlar o'zi so'rov qiladi
+_RETRY = object()
+
+# Barcha dekoratsiya qilingan funksiyalar (invalidate_all uchun)
+_flights: list['SingleFlight'] = []
+
+
+class SingleFlight:
+    def __init__(self, name: str, ttl: float = 0):
+        self.name = name
+        self.ttl = ttl
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self._results: dict[tuple, tuple[float, Any]] = {}
+
+    def invalidate(self):
+        """Saqlangan natijalarni tashlash (masalan, kontent o'zgarganda)"""
+        self._results.clear()
+
+    async def do(self, key: tuple, call: Callable):
+        if self.ttl:
+            cached = self._results.get(key)
+            if cached and cached[0] > time.monotonic():
+                READS_COALESCED.inc(name=self.name, result='cached')
+                return cached[1]
+
+        future = self._inflight.get(key)
+        if future is not None:
+            READS_COALESCED.inc(name=self.name, result='shared')
+            value = await asyncio.shield(future)
+            return await call() if value is _RETRY else value
+
+        READS_COALESCED.inc(name=self.name, result='leader')
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await call()
+        except asyncio.CancelledError:
+            future.set_result(_RETRY)
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Kutuvchi bo'lmasa - "exception was never retrieved" ogohlantirishi bo'lmasin
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            if self.ttl:
+                self._prune()
+                self._results[key] = (time.monotonic() + self.ttl, value)
+            return value
+        finally:
+            del self._inflight[key]
+
+    def _prune(self):
+        now = time.monotonic()
+        for key in [key for key, (expires, _) in self._results.items() if expires <= now]:
+            del self._results[key]
+
+
+def _loaded_graph(value) -> list:
+    """Natijadagi ORM obyektlari va ularning yuklangan relationship'lari"""
+    stack = list(value) if isinstance(value, (list, tuple)) else [value]
+    seen, found = set(), []
+    while stack:
+        obj = stack.pop()
+        if obj is None or id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        try:
+            state = instance_state(obj)
+        except Exception:
+            continue  # Row, int, str - ORM obyekti emas
+        found.append(obj)
+        for relationship in state.mapper.relationships:
+            if relationship.key in state.unloaded:
+                continue
+            related = state.dict.get(relationship.key)
+            if isinstance(related, (list, tuple, set)):
+                stack.extend(related)
+            else:
+                stack.append(related)
+    return found
+
+
+def _detach(session, value):
+    for obj in _loaded_graph(value):
+        if inspect(obj).session is not None:
+            session.expunge(obj)
+
+
+def single_flight(ttl: float = 0):
+    """Birinchi argumenti session bo'lgan async o'qish funksiyasi uchun"""
+
+    def decorator(func):
+        flight = SingleFlight(func.__qualname__, ttl)
+        _flights.append(flight)
+
+        @functools.wraps(func)
+        async def wrapper(session, *args, **kwargs):
+            async def call():
+                value = await func(session, *args, **kwargs)
+                _detach(session, value)
+                return value
+
+            key = (args, tuple(sorted(kwargs.items())))
+            value = await flight.do(key, call)
+            return list(value) if isinstance(value, list) else value
+
+        wrapper.flight = flight
+        return wrapper
+
+    return decorator
+
+
+def invalidate_all():
+    """TTL natijalarini tashlash - benchmark'lar har chaqiruvda haqiqiy so'rovni o'lchashi uchun"""
+    for flight in _flights:
+        flight.invalidate()
@@ -2,10 +2,14 @@
 """
 Foydalanuvchi faolligi statistikasini saqlash
 """
+import logging
+
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from db.models import User, UserActivity
 
+logger = logging.getLogger(__name__)
+
 
 async def log_activity(
         session: AsyncSession,
@@ -57,5 +61,5 @@ async def log_activity(
 
     except Exception as e:
         # Xatolik bo'lsa ham bot to'xtamaydi
-        print(f"Log activity error: {e}")
+        logger.warning("Log activity error: %s", e)
         await session.rollback()
\ No newline at end of file
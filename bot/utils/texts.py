@@ -140,6 +140,10 @@ def test_time_remaining(seconds: int) -> str:
     return _("⏳ <i>Qolgan vaqt: <b>{seconds}</b> soniya</i>").format(seconds=seconds)
 
 
+def test_deadline_text(clock: str) -> str:
+    return _("⏳ <i>Javob berish muddati: <b>{time}</b> gacha</i>").format(time=clock)
+
+
 def test_time_up_result() -> str:
     return _("⏰ <b>Vaqt tugadi!</b>\n\n")
 
@@ -773,9 +777,6 @@ def _translate_parent_name(parent_name: str) -> str:
     """
     ✅ PARENT NAME'NI TARJIMA QILISH VA KATTA HARFGA O'TKAZISH
     """
-    # 🔍 DEBUG 1: Kiruvchi qiymat
-    print(f"🔍 DEBUG 1: parent_name = '{parent_name}'")
-
     translations = {
         "Nizomlar": _("Nizomlar"),
         "Himoya Vositalari": _("Himoya Vositalari"),
@@ -786,21 +787,12 @@ def _translate_parent_name(parent_name: str) -> str:
         "To'liq Texnik Ko'rik": _("To'liq Texnik Ko'rik"),
     }
 
-    # 🔍 DEBUG 2: Dictionary ichidagi qiymatlar
-    print(f"🔍 DEBUG 2: translations = {translations}")
-
     # ✅ TARJIMA
     translated = translations.get(parent_name, parent_name)
 
-    # 🔍 DEBUG 3: Tarjima qilingan qiymat
-    print(f"🔍 DEBUG 3: translated (before upper) = '{translated}'")
-
     # ✅ KATTA HARF
     result = translated.upper()
 
-    # 🔍 DEBUG 4: Oxirgi natija
-    print(f"🔍 DEBUG 4: result (after upper) = '{result}'")
-
     return result
 
 
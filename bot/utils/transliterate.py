@@ -1,38 +1,84 @@
 # bot/utils/transliterate.py
 
+# Kirill-Lotin moslik jadvali
+CYR_TO_LAT = {
+    # Kichik harflar
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd',
+    'е': 'e', 'ё': 'yo', 'ж': 'j', 'з': 'z', 'и': 'i',
+    'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n',
+    'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't',
+    'у': 'u', 'ф': 'f', 'х': 'x', 'ц': 'ts', 'ч': 'ch',
+    'ш': 'sh', 'щ': 'sh', 'ъ': '', 'ы': 'i', 'ь': '',
+    'э': 'e', 'ю': 'yu', 'я': 'ya',
+
+    # Katta harflar
+    'А': 'A', 'Б': 'B', 'В': 'V', 'Г': 'G', 'Д': 'D',
+    'Е': 'E', 'Ё': 'Yo', 'Ж': 'J', 'З': 'Z', 'И': 'I',
+    'Й': 'Y', 'К': 'K', 'Л': 'L', 'М': 'M', 'Н': 'N',
+    'О': 'O', 'П': 'P', 'Р': 'R', 'С': 'S', 'Т': 'T',
+    'У': 'U', 'Ф': 'F', 'Х': 'X', 'Ц': 'Ts', 'Ч': 'Ch',
+    'Ш': 'Sh', 'Щ': 'Sh', 'Ъ': '', 'Ы': 'I', 'Ь': '',
+    'Э': 'E', 'Ю': 'Yu', 'Я': 'Ya',
+
+    # O'zbek kirill harflari
+    'ў': "o'", 'Ў': "O'",
+    'қ': 'q', 'Қ': 'Q',
+    'ғ': "g'", 'Ғ': "G'",
+    'ҳ': 'h', 'Ҳ': 'H'
+}
+
+# Lotin-Kirill (qidiruv uchun, kichik harflar) - avval 2 harfli birikmalar
+LAT_TO_CYR = {
+    "o'": 'ў', "g'": 'ғ', 'sh': 'ш', 'ch': 'ч', 'yo': 'ё', 'yu': 'ю', 'ya': 'я', 'ts': 'ц',
+    'a': 'а', 'b': 'б', 'v': 'в', 'g': 'г', 'd': 'д', 'e': 'е', 'j': 'ж', 'z': 'з',
+    'i': 'и', 'y': 'й', 'k': 'к', 'l': 'л', 'm': 'м', 'n': 'н', 'o': 'о', 'p': 'п',
+    'r': 'р', 's': 'с', 't': 'т', 'u': 'у', 'f': 'ф', 'x': 'х', 'q': 'қ', 'h': 'ҳ',
+}
+
+# O'zbek lotinidagi apostrof variantlari
+APOSTROPHES = "ʻʼ‘’`"
+
+
 def normalize_text(text: str) -> str:
     """Matnni qidiruv uchun tayyorlash"""
-    # Kirill-Lotin moslik jadvali
-    trans_dict = {
-        # Kichik harflar
-        'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd',
-        'е': 'e', 'ё': 'yo', 'ж': 'j', 'з': 'z', 'и': 'i',
-        'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n',
-        'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't',
-        'у': 'u', 'ф': 'f', 'х': 'x', 'ц': 'ts', 'ч': 'ch',
-        'ш': 'sh', 'щ': 'sh', 'ъ': '', 'ы': 'i', 'ь': '',
-        'э': 'e', 'ю': 'yu', 'я': 'ya',
-
-        # Katta harflar
-        'А': 'A', 'Б': 'B', 'В': 'V', 'Г': 'G', 'Д': 'D',
-        'Е': 'E', 'Ё': 'Yo', 'Ж': 'J', 'З': 'Z', 'И': 'I',
-        'Й': 'Y', 'К': 'K', 'Л': 'L', 'М': 'M', 'Н': 'N',
-        'О': 'O', 'П': 'P', 'Р': 'R', 'С': 'S', 'Т': 'T',
-        'У': 'U', 'Ф': 'F', 'Х': 'X', 'Ц': 'Ts', 'Ч': 'Ch',
-        'Ш': 'Sh', 'Щ': 'Sh', 'Ъ': '', 'Ы': 'I', 'Ь': '',
-        'Э': 'E', 'Ю': 'Yu', 'Я': 'Ya',
-
-        # O'zbek kirill harflari
-        'ў': "o'", 'Ў': "O'",
-        'қ': 'q', 'Қ': 'Q',
-        'ғ': "g'", 'Ғ': "G'",
-        'ҳ': 'h', 'Ҳ': 'H'
-    }
-
     # Transliteratsiya
     result = ''
     for char in text:
-        result += trans_dict.get(char, char)
+        result += CYR_TO_LAT.get(char, char)
 
     # Kichik harfga o'tkazish va bo'sh joylarni tozalash
-    return result.lower().strip()
\ No newline at end of file
+    return result.lower().strip()
+
+
+def to_cyrillic(text: str) -> str:
+    """Lotin matnni kirillga o'girish (kichik harflarda)"""
+    text = text.lower()
+    for char in APOSTROPHES:
+        text = text.replace(char, "'")
+
+    result = ''
+    i = 0
+    while i < len(text):
+        pair = text[i:i + 2]
+        if pair in LAT_TO_CYR:
+            result += LAT_TO_CYR[pair]
+            i += 2
+        else:
+            result += LAT_TO_CYR.get(text[i], text[i])
+            i += 1
+    return result.strip()
+
+
+def search_variants(text: str) -> list[str]:
+    """
+    Qidiruv so'zining yozilish variantlari: asl, lotin va kirill
+
+    "кран" -> ['кран', 'kran'],  "kran" -> ['kran', 'кран']
+    """
+    original = text.strip().lower()
+    latin = normalize_text(original)
+    for char in APOSTROPHES:
+        latin = latin.replace(char, "'")
+
+    variants = [original, latin, to_cyrillic(latin)]
+    return [v for i, v in enumerate(variants) if v and v not in variants[:i]]
@@ -2,11 +2,12 @@
 """
 Oylik Database tozalash
 Faqat joriy oyning ma'lumotlarini saqlaydi
-O'tgan oylar avtomatik o'chiriladi
+O'tgan oylar butun partition sifatida o'chiriladi (DELETE yo'q)
 """
 
 from datetime import datetime
-from sqlalchemy import delete
+from sqlalchemy import func, text
+import logging
 import sys
 import os
 
@@ -15,6 +16,13 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from db import get_sync_session
 from db.models import UserActivity
+from db.rollup import refresh_activity_rollup
+from db.partitions import ensure_partitions, drop_partitions_before, estimated_rows, is_partitioned
+from utils.logging_setup import setup_logging
+
+logger = logging.getLogger('cleanup_monthly')
+
+DELETE_BATCH_SIZE = 10000  # Partition'siz baza uchun
 
 
 def cleanup_keep_current_month():
@@ -40,86 +48,76 @@ def cleanup_keep_current_month():
 
         current_month_name = today.strftime('%B %Y')  # "Dekabr 2024"
 
-        print("\n" + "=" * 60)
-        print("🗑️  OYLIK DATABASE TOZALASH")
-        print("=" * 60)
-        print(f"📅 Joriy oy: {current_month_name}")
-        print(f"🔍 O'chirish: {first_day_of_month.strftime('%Y-%m-%d')} dan oldingi")
-        print("=" * 60 + "\n")
-
-        # O'chirishdan OLDIN statistika
-        total_before = session.query(UserActivity).count()
-        old_count = session.query(UserActivity).filter(
-            UserActivity.created_at < first_day_of_month
-        ).count()
-        current_count = session.query(UserActivity).filter(
-            UserActivity.created_at >= first_day_of_month
-        ).count()
-
-        print(f"📊 O'chirishdan OLDIN:")
-        print(f"   • Jami ma'lumotlar: {total_before} ta")
-        print(f"   • O'chiriladi: {old_count} ta (eski oylar)")
-        print(f"   • Qoladi: {current_count} ta (joriy oy)\n")
-
-        # O'CHIRISH
-        if old_count > 0:
-            print(f"🔄 O'chirish jarayoni boshlandi...\n")
-
-            result = session.execute(
-                delete(UserActivity).where(
-                    UserActivity.created_at < first_day_of_month
-                )
-            )
+        logger.info(
+            "Oylik tozalash: joriy oy %s, %s dan oldingilari o'chiriladi",
+            current_month_name, first_day_of_month.strftime('%Y-%m-%d')
+        )
+
+        # Rollup'ni yangilash - tarix activity_daily'da saqlanib qoladi
+        conn = session.connection()
+        refresh_activity_rollup(conn)
 
-            deleted_count = result.rowcount
-            session.commit()
+        # Yangi oylar uchun partition'lar (oldindan)
+        ensure_partitions(conn)
 
-            print(f"✅ {deleted_count} ta eski ma'lumot o'chirildi!")
+        # O'chirishdan OLDIN statistika (planner statistikasi - count() yo'q)
+        total_before = estimated_rows(conn, 'user_activities')
 
+        logger.info("O'chirishdan OLDIN: ~%s ta", total_before, extra={'rows': total_before})
+
+        # O'CHIRISH - eski oylarning partition'lari butunlay olib tashlanadi
+        if is_partitioned(conn):
+            removed = drop_partitions_before(conn, first_day_of_month.date())
+            deleted_count = sum(rows for _, rows in removed)
+
+            for name, rows in removed:
+                logger.info("Partition o'chirildi: %s (~%s ta)", name, rows, extra={'partition': name, 'rows': rows})
         else:
+            # Migratsiya qilinmagan baza - partiyalab DELETE
             deleted_count = 0
-            print(f"ℹ️  O'chirish kerak emas (eski ma'lumot yo'q)")
+            while True:
+                result = conn.execute(text(
+                    "DELETE FROM user_activities WHERE id IN ("
+                    "SELECT id FROM user_activities WHERE created_at < :cutoff LIMIT :batch)"
+                ), {"cutoff": first_day_of_month, "batch": DELETE_BATCH_SIZE})
+                session.commit()
+                deleted_count += result.rowcount
+                if result.rowcount < DELETE_BATCH_SIZE:
+                    break
+
+        session.commit()
+
+        if deleted_count > 0:
+            logger.info("~%s ta eski ma'lumot o'chirildi", deleted_count, extra={'deleted': deleted_count})
+        else:
+            logger.info("O'chirish kerak emas (eski ma'lumot yo'q)")
 
         # O'chirishdan KEYIN statistika
-        total_after = session.query(UserActivity).count()
+        total_after = estimated_rows(session.connection(), 'user_activities')
 
         # Eng eski va eng yangi ma'lumot
-        oldest = session.query(UserActivity).order_by(
-            UserActivity.created_at.asc()
-        ).first()
-
-        newest = session.query(UserActivity).order_by(
-            UserActivity.created_at.desc()
-        ).first()
-
-        print(f"\n📊 O'chirishdan KEYIN:")
-        print(f"   • Jami ma'lumotlar: {total_after} ta")
-
-        if oldest:
-            print(f"   • Eng eski: {oldest.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
-        else:
-            print(f"   • Eng eski: (ma'lumot yo'q)")
-
-        if newest:
-            print(f"   • Eng yangi: {newest.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
-        else:
-            print(f"   • Eng yangi: (ma'lumot yo'q)")
+        oldest, newest = session.query(
+            func.min(UserActivity.created_at),
+            func.max(UserActivity.created_at)
+        ).one()
 
         # Database hajmi (taxminiy)
         db_size_mb = (total_after * 100) / (1024 * 1024)  # 1 yozuv ≈ 100 byte
-        print(f"   • Taxminiy hajm: {db_size_mb:.2f} MB")
-
-        print("\n" + "=" * 60)
-        print("✅ TOZALASH MUVAFFAQIYATLI TUGADI!")
-        print("=" * 60 + "\n")
+        logger.info(
+            "O'chirishdan KEYIN: ~%s ta, eng eski %s, eng yangi %s, taxminiy hajm %.2f MB",
+            total_after,
+            oldest.strftime('%Y-%m-%d %H:%M:%S') if oldest else "(ma'lumot yo'q)",
+            newest.strftime('%Y-%m-%d %H:%M:%S') if newest else "(ma'lumot yo'q)",
+            db_size_mb,
+            extra={'rows': total_after},
+        )
+        logger.info("Tozalash muvaffaqiyatli tugadi")
 
         return deleted_count, total_after
 
     except Exception as e:
         session.rollback()
-        print(f"\n❌ XATOLIK: {e}\n")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Tozalash xatoligi: %s", e)
         return 0, 0
 
     finally:
@@ -137,8 +135,6 @@ def show_monthly_statistics():
         first_day = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
 
         # Joriy oyda activity type bo'yicha
-        from sqlalchemy import func
-
         stats = session.query(
             UserActivity.activity_type,
             func.count(UserActivity.id).label('count')
@@ -147,9 +143,6 @@ def show_monthly_statistics():
         ).group_by(UserActivity.activity_type).all()
 
         if stats:
-            print("\n" + "=" * 60)
-            print(f"📊 {today.strftime('%B %Y').upper()} STATISTIKASI")
-            print("=" * 60)
 
             activity_names = {
                 'test_start': 'Test Boshlash',
@@ -161,12 +154,13 @@ def show_monthly_statistics():
 
             for activity_type, count in sorted(stats, key=lambda x: x[1], reverse=True):
                 name = activity_names.get(activity_type, activity_type)
-                print(f"   • {name}: {count} ta")
-
-            print("=" * 60 + "\n")
+                logger.info(
+                    "%s statistikasi - %s: %s ta", today.strftime('%B %Y'), name, count,
+                    extra={'activity_type': activity_type, 'count': count}
+                )
 
     except Exception as e:
-        print(f"❌ Statistika xatoligi: {e}")
+        logger.exception("Statistika xatoligi: %s", e)
     finally:
         session.close()
 
@@ -175,6 +169,8 @@ def main():
     """
     Main funksiyasi
     """
+    setup_logging('cleanup')
+
     # Tozalash
     deleted, remaining = cleanup_keep_current_month()
 
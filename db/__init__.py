@@ -1,10 +1,11 @@
 # db/__init__.py
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, AsyncAttrs
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker as sync_sessionmaker
 
 from utils.env_data import Config as cf
+from db.profiler import attach as attach_profiler
 
 
 class Base(AsyncAttrs, DeclarativeBase):
@@ -27,9 +28,12 @@ class AsyncDatabaseSession:
             isolation_level="AUTOCOMMIT"
         )
         self._session = sessionmaker(self._engine, expire_on_commit=False, class_=AsyncSession)()
+        attach_profiler(self._engine.sync_engine)
 
     async def create_all(self):
         async with self._engine.begin() as conn:
+            # Qidiruv index'lari (gin_trgm_ops) uchun
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
             await conn.run_sync(Base.metadata.create_all)
 
 
@@ -43,17 +47,35 @@ async_engine = create_async_engine(
     future=True,
     echo=False
 )
+attach_profiler(async_engine.sync_engine)
+
+
+# ✅ SYNC (Flask-Admin uchun) - bitta process-wide engine va pool
+_sync_engine = None
+_sync_session_factory = None
 
 
-# ✅ SYNC (Flask-Admin uchun - agar kerak bo'lsa)
 def get_sync_engine():
-    """Sync engine for queries"""
-    sync_url = cf.db.DB_URL.replace('postgresql+asyncpg', 'postgresql+psycopg2')
-    return create_engine(sync_url, echo=False)
+    """Sync engine for queries (process bo'yicha bitta, pool bilan)"""
+    global _sync_engine
+    if _sync_engine is None:
+        sync_url = cf.db.DB_URL.replace('postgresql+asyncpg', 'postgresql+psycopg2')
+        _sync_engine = create_engine(
+            sync_url,
+            echo=False,
+            pool_size=cf.db.POOL_SIZE,
+            max_overflow=cf.db.MAX_OVERFLOW,
+            pool_timeout=cf.db.POOL_TIMEOUT,
+            pool_recycle=cf.db.POOL_RECYCLE,
+            pool_pre_ping=True
+        )
+        attach_profiler(_sync_engine)
+    return _sync_engine
 
 
 def get_sync_session():
     """Sync session for statistics queries"""
-    engine = get_sync_engine()
-    Session = sync_sessionmaker(bind=engine)
-    return Session()
\ No newline at end of file
+    global _sync_session_factory
+    if _sync_session_factory is None:
+        _sync_session_factory = sync_sessionmaker(bind=get_sync_engine())
+    return _sync_session_factory()
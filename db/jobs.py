@@ -0,0 +1,278 @@
+# db/jobs.py
+"""
+Postgres'dagi fon vazifalari navbati (jobs jadvali)
+
+Web enqueue() bilan vazifa qo'shadi, worker.py jarayonlari claim_next() bilan
+FOR UPDATE SKIP LOCKED orqali oladi - bir vazifani ikki worker olmaydi va
+bir-birini kutmaydi. Progress / log / bekor qilish JobContext orqali.
+"""
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+
+from sqlalchemy import text
+
+from db.models import Job
+
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+STATUS_NAMES = {
+    QUEUED: 'Navbatda',
+    RUNNING: 'Bajarilmoqda',
+    DONE: 'Tayyor',
+    FAILED: 'Xatolik',
+    CANCELLED: 'Bekor qilindi',
+}
+
+PROGRESS_INTERVAL = 1.0  # progress bazaga shundan tez-tez yozilmaydi (soniya)
+MAX_ATTEMPTS = 3  # worker o'lsa shuncha marta qayta urinish
+MAX_LOG_CHARS = 20000  # jurnalning oxirgi qismi saqlanadi
+
+# {kind: (nom, handler)} - @job_handler bilan to'ldiriladi
+HANDLERS = {}
+
+# Vaqtlar created_at bilan bir xil ifodada yoziladi (db/utils.py: tz)
+CLAIM_SQL = text("""
+    UPDATE jobs SET
+        status = 'running',
+        worker = :worker,
+        attempts = attempts + 1,
+        started_at = TIMEZONE('Asia/Tashkent', NOW()),
+        heartbeat_at = TIMEZONE('Asia/Tashkent', NOW()),
+        updated_at = TIMEZONE('Asia/Tashkent', NOW())
+    WHERE id = (
+        SELECT id FROM jobs
+        WHERE status = 'queued'
+        ORDER BY created_at, id
+        FOR UPDATE SKIP LOCKED
+        LIMIT 1
+    )
+    RETURNING id, kind, params
+""")
+
+
+class JobCancelled(Exception):
+    """Admin vazifani bekor qildi (handler ichidan ko'tariladi)"""
+
+
+def job_handler(kind: str, name: str):
+    """
+    Handler ro'yxatdan o'tkazish
+
+    @job_handler('test_import', 'Test import')
+    def run(ctx, **params): ... -> dict (result)
+    """
+    def decorator(func):
+        HANDLERS[kind] = (name, func)
+        return func
+    return decorator
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+# ==================== WEB TOMONI ====================
+
+def enqueue(session, kind: str, params: dict | None = None) -> Job:
+    """Vazifani navbatga qo'yish (commit shu yerda)"""
+    job = Job(kind=kind, status=QUEUED, params=params or {})
+    session.add(job)
+    session.commit()
+    return job
+
+
+def request_cancel(session, job_id: int) -> bool:
+    """
+    Navbatdagi vazifa darhol bekor qilinadi,
+    bajarilayotganiga bayroq qo'yiladi - handler keyingi tekshiruvda to'xtaydi
+    """
+    result = session.execute(text("""
+        UPDATE jobs SET
+            status = CASE WHEN status = 'queued' THEN 'cancelled' ELSE status END,
+            finished_at = CASE WHEN status = 'queued' THEN TIMEZONE('Asia/Tashkent', NOW()) ELSE finished_at END,
+            cancel_requested = true,
+            updated_at = TIMEZONE('Asia/Tashkent', NOW())
+        WHERE id = :id AND status IN ('queued', 'running')
+    """), {"id": job_id})
+    session.commit()
+    return result.rowcount > 0
+
+
+# ==================== WORKER TOMONI ====================
+
+def claim_next(engine, worker: str):
+    """Navbatdan bitta vazifa olish. Returns: (id, kind, params) yoki None"""
+    with engine.begin() as conn:
+        return conn.execute(CLAIM_SQL, {"worker": worker}).first()
+
+
+def requeue_stale(engine, timeout: int) -> int:
+    """Heartbeat'i to'xtagan (worker o'lgan) vazifalarni qayta navbatga qo'yish"""
+    with engine.begin() as conn:
+        result = conn.execute(text("""
+            UPDATE jobs SET
+                status = CASE
+                    WHEN cancel_requested THEN 'cancelled'
+                    WHEN attempts >= :max_attempts THEN 'failed'
+                    ELSE 'queued'
+                END,
+                error = CASE WHEN attempts >= :max_attempts THEN 'Worker javob bermay qoldi' ELSE error END,
+                worker = NULL,
+                updated_at = TIMEZONE('Asia/Tashkent', NOW())
+            WHERE status = 'running'
+              AND heartbeat_at < TIMEZONE('Asia/Tashkent', NOW()) - make_interval(secs => :timeout)
+        """), {"timeout": timeout, "max_attempts": MAX_ATTEMPTS})
+    return result.rowcount
+
+
+def _finish(engine, job_id: int, status: str, result: dict | None = None, error: str | None = None):
+    with engine.begin() as conn:
+        conn.execute(text("""
+            UPDATE jobs SET
+                status = :status,
+                result = CAST(:result AS jsonb),
+                error = :error,
+                finished_at = TIMEZONE('Asia/Tashkent', NOW()),
+                heartbeat_at = TIMEZONE('Asia/Tashkent', NOW()),
+                updated_at = TIMEZONE('Asia/Tashkent', NOW())
+            WHERE id = :id
+        """), {
+            "id": job_id,
+            "status": status,
+            "result": None if result is None else _json(result),
+            "error": error,
+        })
+
+
+def _json(value) -> str:
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+class JobContext:
+    """
+    Handler'ga beriladi. Har bir yozuv alohida qisqa tranzaksiyada -
+    handler o'z tranzaksiyasini ochib turgan bo'lsa ham admin progressni ko'radi.
+    """
+
+    def __init__(self, engine, job_id: int):
+        self.engine = engine
+        self.job_id = job_id
+        self._last_write = 0.0
+        self._cancelled = False
+
+    def progress(self, processed: int, total: int | None = None, message: str | None = None, force: bool = False):
+        """Progress + heartbeat. Bekor qilingan bo'lsa JobCancelled ko'tariladi."""
+        now = time.monotonic()
+        if not force and now - self._last_write < PROGRESS_INTERVAL:
+            return
+        self._last_write = now
+
+        with self.engine.begin() as conn:
+            self._cancelled = conn.execute(text("""
+                UPDATE jobs SET
+                    processed = :processed,
+                    total = COALESCE(:total, total),
+                    message = COALESCE(:message, message),
+                    heartbeat_at = TIMEZONE('Asia/Tashkent', NOW()),
+                    updated_at = TIMEZONE('Asia/Tashkent', NOW())
+                WHERE id = :id
+                RETURNING cancel_requested
+            """), {
+                "id": self.job_id,
+                "processed": processed,
+                "total": total,
+                "message": message[:255] if message else None,
+            }).scalar()
+
+        self.check_cancel()
+
+    def log(self, line: str):
+        """Vazifa jurnaliga qator qo'shish"""
+        stamp = time.strftime('%H:%M:%S')
+        with self.engine.begin() as conn:
+            conn.execute(text("""
+                UPDATE jobs SET
+                    log = right(log || :line, :keep),
+                    heartbeat_at = TIMEZONE('Asia/Tashkent', NOW()),
+                    updated_at = TIMEZONE('Asia/Tashkent', NOW())
+                WHERE id = :id
+            """), {"id": self.job_id, "line": f"[{stamp}] {line}\n", "keep": MAX_LOG_CHARS})
+
+    def check_cancel(self):
+        if self._cancelled:
+            raise JobCancelled()
+
+
+def _heartbeat(engine, job_id: int, interval: float, stop: threading.Event):
+    """Handler uzoq bitta so'rovda turganda ham vazifa "o'lik" deb hisoblanmasin"""
+    while not stop.wait(interval):
+        try:
+            with engine.begin() as conn:
+                conn.execute(text("UPDATE jobs SET heartbeat_at = TIMEZONE('Asia/Tashkent', NOW()) WHERE id = :id"), {"id": job_id})
+        except Exception as e:
+            logger.warning("Job #%s heartbeat failed: %s", job_id, e)
+
+
+def run_job(engine, job_id: int, kind: str, params: dict, heartbeat_interval: float = 60):
+    """Bitta vazifani bajarish va yakuniy holatni yozish"""
+    ctx = JobContext(engine, job_id)
+
+    if kind not in HANDLERS:
+        _finish(engine, job_id, FAILED, error=f"Noma'lum vazifa turi: {kind}")
+        return
+
+    name, handler = HANDLERS[kind]
+    stop = threading.Event()
+    threading.Thread(target=_heartbeat, args=(engine, job_id, heartbeat_interval, stop), daemon=True).start()
+
+    ctx.log(f"Boshlandi: {name}")
+    try:
+        result = handler(ctx, **(params or {}))
+    except JobCancelled:
+        ctx.log("Bekor qilindi")
+        _finish(engine, job_id, CANCELLED)
+    except Exception as e:
+        logger.exception("Job #%s (%s) failed", job_id, kind)
+        ctx.log(f"Xatolik: {e}")
+        _finish(engine, job_id, FAILED, error=traceback.format_exc())
+    else:
+        ctx.log("Tugadi")
+        _finish(engine, job_id, DONE, result=result or {})
+    finally:
+        stop.set()
+
+
+def run_worker(engine, poll_interval: float, stale_timeout: int, should_stop=lambda: False):
+    """Worker sikli: stale vazifalarni qaytarish, navbatdan olish, bajarish"""
+    worker = worker_name()
+    last_stale_check = 0.0
+    logger.info("Worker %s started", worker)
+
+    while not should_stop():
+        if time.monotonic() - last_stale_check > stale_timeout:
+            requeued = requeue_stale(engine, stale_timeout)
+            if requeued:
+                logger.warning("%s stale job(s) requeued", requeued)
+            last_stale_check = time.monotonic()
+
+        claimed = claim_next(engine, worker)
+        if claimed is None:
+            time.sleep(poll_interval)
+            continue
+
+        job_id, kind, params = claimed
+        logger.info("Job #%s (%s) claimed by %s", job_id, kind, worker)
+        run_job(engine, job_id, kind, params, heartbeat_interval=max(stale_timeout / 3, 1))
+
+    logger.info("Worker %s stopped", worker)
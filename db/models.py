@@ -1,8 +1,10 @@
-from sqlalchemy import BigInteger, String, ForeignKey, Text, Boolean, DateTime, Integer, Table, Column, UniqueConstraint
+from sqlalchemy import BigInteger, String, ForeignKey, Text, Boolean, DateTime, Integer, Float, Table, Column, UniqueConstraint, Date, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import date, datetime
 
 from db import Base
-from db.utils import CreatedModel
+from db.utils import CreatedModel, tz
 
 # ============================================
 # USER MODELI
@@ -15,6 +17,13 @@ class User(CreatedModel):
     Ro'yxatdan o'tish: ism-familya, telefon raqam
     """
     __tablename__ = "users"
+    __table_args__ = (
+        # Admin qidiruvi (ILIKE '%...%') - pg_trgm
+        Index('ix_users_full_name_trgm', 'full_name', postgresql_using='gin', postgresql_ops={'full_name': 'gin_trgm_ops'}),
+        Index('ix_users_phone_number_trgm', 'phone_number', postgresql_using='gin', postgresql_ops={'phone_number': 'gin_trgm_ops'}),
+        Index('ix_users_username_trgm', 'username', postgresql_using='gin', postgresql_ops={'username': 'gin_trgm_ops'}),
+    )
+
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     telegram_id: Mapped[int] = mapped_column(BigInteger, unique=True, nullable=False)
@@ -23,6 +32,8 @@ class User(CreatedModel):
     phone_number: Mapped[str] = mapped_column(String(20), nullable=False)
     language_code: Mapped[str] = mapped_column(String(5), default="uz")  # uz, qq, ru
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)  # Faolmi
+    # Botni bloklagan (xabar yetkazib bo'lmaydi) - admin blokidan (is_active) alohida
+    bot_blocked: Mapped[bool] = mapped_column(Boolean, default=False, server_default='false')
 
     def __str__(self):
         return f"{self.full_name} - {self.phone_number}"
@@ -39,7 +50,9 @@ test_category_association = Table(
     'test_category_association',
     Base.metadata,
     Column('test_id', ForeignKey('tests.id', ondelete='CASCADE'), primary_key=True),
-    Column('category_id', ForeignKey('test_categories.id', ondelete='CASCADE'), primary_key=True)
+    Column('category_id', ForeignKey('test_categories.id', ondelete='CASCADE'), primary_key=True),
+    # PK (test_id, category_id) - kategoriya bo'yicha qidirish uchun teskari tartib
+    Index('ix_test_category_association_category', 'category_id', 'test_id')
 )
 
 class TestCategory(CreatedModel):
@@ -48,6 +61,10 @@ class TestCategory(CreatedModel):
     MM va SX uchun test bo'limlari
     """
     __tablename__ = "test_categories"
+    __table_args__ = (
+        Index('ix_test_categories_section_created', 'section', 'created_at'),
+    )
+
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     section: Mapped[str] = mapped_column(String(10), nullable=False)  # 'MM' yoki 'SX'
 
@@ -68,6 +85,11 @@ class Test(CreatedModel):
     Har bir test bir necha kategoriyaga tegishli bo'lishi mumkin
     """
     __tablename__ = "tests"
+    __table_args__ = (
+        # Admin qidiruvi (ILIKE '%...%') - pg_trgm
+        Index('ix_tests_text_trgm', 'text', postgresql_using='gin', postgresql_ops={'text': 'gin_trgm_ops'}),
+    )
+
     text: Mapped[str] = mapped_column(Text, nullable=False)
     image: Mapped[str | None] = mapped_column(String(255), nullable=True)
 
@@ -92,6 +114,10 @@ class TestAnswer(CreatedModel):
     Har bir testda 4 ta javob: A, B, C, D
     """
     __tablename__ = "test_answers"
+    __table_args__ = (
+        Index('ix_test_answers_test_id', 'test_id'),
+    )
+
     text: Mapped[str] = mapped_column(String(500), nullable=False)
     is_correct: Mapped[bool] = mapped_column(Boolean, default=False)
     test_id: Mapped[int] = mapped_column(ForeignKey("tests.id", ondelete='CASCADE'))
@@ -109,6 +135,10 @@ class TestAnswer(CreatedModel):
 class VideoCategory(CreatedModel):
     """Video kategoriyalari"""
     __tablename__ = "video_categories"
+    __table_args__ = (
+        Index('ix_video_categories_section_created', 'section', 'created_at'),
+    )
+
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     section: Mapped[str] = mapped_column(String(10), nullable=False)
     videos: Mapped[list["Video"]] = relationship(
@@ -124,6 +154,12 @@ class VideoCategory(CreatedModel):
 class Video(CreatedModel):
     """Video roliklar"""
     __tablename__ = "videos"
+    __table_args__ = (
+        Index('ix_videos_category_created', 'category_id', 'created_at'),
+        Index('ix_videos_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        Index('ix_videos_description_trgm', 'description', postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'}),
+    )
+
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     description: Mapped[str] = mapped_column(Text)
     file: Mapped[str] = mapped_column(String)
@@ -145,6 +181,10 @@ class ConspectCategory(CreatedModel):
     MM va SX uchun konspektlar bo'limlari
     """
     __tablename__ = "conspect_categories"
+    __table_args__ = (
+        Index('ix_conspect_categories_section_created', 'section', 'created_at'),
+    )
+
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     section: Mapped[str] = mapped_column(String(10), nullable=False)  # 'MM' yoki 'SX'
     conspects: Mapped[list["Conspect"]] = relationship(
@@ -162,6 +202,12 @@ class Conspect(CreatedModel):
     Konspektlar - PDF, DOC, DOCX fayllar
     """
     __tablename__ = "conspects"
+    __table_args__ = (
+        Index('ix_conspects_category_created', 'category_id', 'created_at'),
+        Index('ix_conspects_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        Index('ix_conspects_description_trgm', 'description', postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'}),
+    )
+
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     description: Mapped[str] = mapped_column(Text)
     file: Mapped[str] = mapped_column(String)  # Telegram file_id
@@ -183,6 +229,11 @@ class Conspect(CreatedModel):
 class Folder(CreatedModel):
     """Papkalar - MM va SX maxsus bo'limlari uchun"""
     __tablename__ = "folders"
+    __table_args__ = (
+        # Bot: section + parent_type bo'yicha, order_index, created_at tartibida
+        Index('ix_folders_section_parent_order', 'section', 'parent_type', 'order_index', 'created_at'),
+        Index('ix_folders_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+    )
 
     # ✅ PARENT_TYPE CHOICES
     PARENT_TYPE_CHOICES = [
@@ -230,7 +281,7 @@ class FileView(CreatedModel):
         ForeignKey("files.id", ondelete='CASCADE'),
         nullable=False
     )
-    user_id: Mapped[int] = mapped_column(nullable=False)  # Telegram user_id
+    user_id: Mapped[int] = mapped_column(BigInteger, nullable=False)  # Telegram user_id (int4'dan katta)
 
     # Relationships
     file: Mapped["File"] = relationship(back_populates="views")
@@ -248,6 +299,10 @@ class FileView(CreatedModel):
 class File(CreatedModel):
     """Fayllar - Papkalarga tegishli"""
     __tablename__ = "files"
+    __table_args__ = (
+        Index('ix_files_folder_order', 'folder_id', 'order_index', 'created_at'),
+        Index('ix_files_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+    )
 
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     file_id: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -327,7 +382,7 @@ class AccidentView(CreatedModel):
         ForeignKey("accidents.id", ondelete='CASCADE'),
         nullable=False
     )
-    user_id: Mapped[int] = mapped_column(nullable=False)  # Telegram user_id
+    user_id: Mapped[int] = mapped_column(BigInteger, nullable=False)  # Telegram user_id (int4'dan katta)
 
     # Relationships
     accident: Mapped["Accident"] = relationship(back_populates="views")
@@ -344,6 +399,12 @@ class AccidentView(CreatedModel):
 class Accident(CreatedModel):
     """Baxtsiz hodisalar"""
     __tablename__ = "accidents"
+    __table_args__ = (
+        Index('ix_accidents_year_category', 'year_id', 'category_id'),
+        Index('ix_accidents_category_created', 'category_id', 'created_at'),
+        Index('ix_accidents_title_trgm', 'title', postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}),
+        Index('ix_accidents_description_trgm', 'description', postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'}),
+    )
 
     title: Mapped[str] = mapped_column(String(200), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -381,6 +442,11 @@ class Accident(CreatedModel):
 
 class Group(CreatedModel):
     __tablename__ = "groups"
+    __table_args__ = (
+        # Admin qidiruvi (ILIKE '%...%') - pg_trgm
+        Index('ix_groups_title_trgm', 'title', postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}),
+    )
+
 
     chat_id: Mapped[int] = mapped_column(BigInteger, unique=True, nullable=False)  # Guruh ID
     title: Mapped[str | None] = mapped_column(String(255), nullable=True)  # Guruh nomi
@@ -400,8 +466,21 @@ class UserActivity(CreatedModel):
     """
     Foydalanuvchi faolligi
     Har bir muhim faoliyat saqlanadi (test, konspekt, video, folder...)
+    Oylik partition'larga bo'lingan (created_at bo'yicha) - db/partitions.py
     """
     __tablename__ = "user_activities"
+    __table_args__ = (
+        # Vaqt oralig'i (dashboard, rollup) va foydalanuvchi tarixi (admin)
+        Index('ix_user_activities_created_type', 'created_at', 'activity_type'),
+        Index('ix_user_activities_section_created', 'section', 'created_at'),
+        Index('ix_user_activities_user_created', 'user_id', 'created_at'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
+
+    # Partition kaliti primary key'ga kirishi shart
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=text(tz), primary_key=True
+    )
 
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete='CASCADE'))
     activity_type: Mapped[str] = mapped_column(String(50), nullable=False)
@@ -412,10 +491,182 @@ class UserActivity(CreatedModel):
 
     # 'nizomlar', 'kranlar', 'himoya_vositalari', 'qozonxonalar', ...
 
-    # created_at - avtomatik CreatedModel'dan
-
     def __str__(self):
         return f"{self.user_id} - {self.activity_type} ({self.section})"
 
 
+class ActivityDaily(CreatedModel):
+    """
+    Kunlik faollik rollup'i (user_activities'dan inkremental yig'iladi)
+    NULL section/parent_type '' sifatida, "barchasi" esa '*' sifatida saqlanadi:
+    (kun, '*', section, '*') - bo'lim bo'yicha, (kun, '*', '*', '*') - kun bo'yicha jami
+    """
+    __tablename__ = "activity_daily"
+
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    activity_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    section: Mapped[str] = mapped_column(String(10), nullable=False, default='')
+    parent_type: Mapped[str] = mapped_column(String(50), nullable=False, default='')
+    events: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    unique_users: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint('day', 'activity_type', 'section', 'parent_type', name='unique_activity_daily'),
+    )
+
+    def __str__(self):
+        return f"{self.day} - {self.activity_type} ({self.section}): {self.events}"
+
+
+class RollupWatermark(CreatedModel):
+    """Rollup qayerdan davom etishini saqlaydi (oxirgi yig'ilgan created_at)"""
+    __tablename__ = "rollup_watermarks"
+
+    name: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
+    watermark: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.watermark}"
+
+
+
+# ============================================
+# FON VAZIFALARI (JOBS)
+# Uzoq admin operatsiyalari - worker.py bajaradi
+# ============================================
+
+class Job(CreatedModel):
+    """
+    Fon vazifasi: import, eksport, rollup backfill, reindex...
+    Worker'lar navbatdan FOR UPDATE SKIP LOCKED bilan oladi (db/jobs.py)
+    """
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index('ix_jobs_status_created', 'status', 'created_at'),
+    )
+
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default='queued')
+    # 'queued', 'running', 'done', 'failed', 'cancelled'
+    params: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    result: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+
+    processed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    message: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    log: Mapped[str] = mapped_column(Text, nullable=False, default='')
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    cancel_requested: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    worker: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    @property
+    def percent(self) -> int:
+        """Bajarilish foizi (total noma'lum bo'lsa 0)"""
+        if self.status == 'done':
+            return 100
+        if not self.total:
+            return 0
+        return min(int(self.processed * 100 / self.total), 100)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ('done', 'failed', 'cancelled')
+
+    def __str__(self):
+        return f"Job #{self.id} {self.kind} ({self.status})"
+
+
+
+# ============================================
+# E'LONLAR (BROADCAST)
+# Admin paneldan yaratiladi, bot jarayoni yuboradi
+# ============================================
+
+class Broadcast(CreatedModel):
+    """
+    Barcha xodimlarga e'lon
+    last_user_id - checkpoint: bot qayta ishga tushsa shu id'dan davom etadi
+    """
+    __tablename__ = "broadcasts"
+
+    text: Mapped[str] = mapped_column(Text, nullable=False)
+    language_code: Mapped[str | None] = mapped_column(String(5), nullable=True)  # None - hammaga
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default='queued')
+    # 'queued', 'running', 'done', 'cancelled', 'failed'
+
+    total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    sent: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    failed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    blocked: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_user_id: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    cancel_requested: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    @property
+    def processed(self) -> int:
+        return self.sent + self.failed + self.blocked
+
+    @property
+    def percent(self) -> int:
+        if self.status == 'done':
+            return 100
+        if not self.total:
+            return 0
+        return min(int(self.processed * 100 / self.total), 100)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ('done', 'cancelled', 'failed')
+
+    def __str__(self):
+        return f"Broadcast #{self.id} ({self.status})"
+
+
+# ============================================
+# SQL PROFILER STATISTIKASI
+# db/profiler.py yig'adi, admin panel: /diagnostics
+# ============================================
+
+class QueryStat(CreatedModel):
+    """
+    Bot handler'i / admin sahifasi bo'yicha SQL so'rovlar yig'indisi
+    top_shape - bitta update/request ichida eng ko'p takrorlangan so'rov (N+1 belgisi)
+    """
+    __tablename__ = "query_stats"
+    __table_args__ = (
+        UniqueConstraint('source', 'name', name='unique_query_stat'),
+    )
+
+    source: Mapped[str] = mapped_column(String(10), nullable=False)  # 'bot' yoki 'web'
+    name: Mapped[str] = mapped_column(String(150), nullable=False)  # handler yoki endpoint
+    requests: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    queries: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    max_queries: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    db_ms: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    max_db_ms: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    flagged: Mapped[int] = mapped_column(Integer, nullable=False, default=0)  # chegaradan oshganlar
+    top_shape: Mapped[str | None] = mapped_column(Text, nullable=True)
+    top_shape_repeats: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_seen: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    @property
+    def avg_queries(self) -> float:
+        return self.queries / self.requests if self.requests else 0
+
+    @property
+    def avg_db_ms(self) -> float:
+        return self.db_ms / self.requests if self.requests else 0
+
+    def __str__(self):
+        return f"{self.source}:{self.name}"
+
+
 metadata = Base.metadata
@@ -0,0 +1,240 @@
+# db/partitions.py
+"""
+user_activities uchun oylik partition manager
+- Kelgusi oylar uchun partition'larni oldindan yaratadi
+- Retention: eski oylarni DELETE o'rniga butun partition sifatida ajratadi/o'chiradi
+"""
+import asyncio
+import logging
+from datetime import date, datetime
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "user_activities"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+MONTHS_AHEAD = 3
+PARTITION_LOCK_ID = 72_029_001  # pg_advisory_xact_lock uchun
+
+
+# ==================== HELPERS ====================
+
+def month_start(value: date | datetime) -> date:
+    """Oyning 1-sanasi"""
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    """Oylarni qo'shish (1-sana bo'yicha)"""
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """user_activities_y2025m01"""
+    return f"{PARENT_TABLE}_y{month.year}m{month.month:02d}"
+
+
+# ==================== QUERIES ====================
+
+def is_partitioned(conn) -> bool:
+    """user_activities partitioned table'mi?"""
+    return bool(conn.execute(
+        text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table))"),
+        {"table": PARENT_TABLE}
+    ).scalar())
+
+
+def list_partitions(conn) -> list[tuple[str, date | None, date | None]]:
+    """
+    Mavjud oylik partition'lar
+
+    Returns:
+        [(nomi, boshlanish, tugash), ...] - default partition uchun (nomi, None, None)
+    """
+    rows = conn.execute(
+        text("""
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass(:table)
+            ORDER BY c.relname
+        """),
+        {"table": PARENT_TABLE}
+    ).scalars().all()
+
+    partitions = []
+    prefix = f"{PARENT_TABLE}_y"
+    for name in rows:
+        if name.startswith(prefix):
+            year, month = name[len(prefix):].split('m')
+            start = date(int(year), int(month), 1)
+            partitions.append((name, start, add_months(start, 1)))
+        else:
+            partitions.append((name, None, None))
+    return partitions
+
+
+def estimated_rows(conn, table: str) -> int:
+    """
+    Planner statistikasidan taxminiy qatorlar soni (count() o'rniga)
+    Partitioned jadval uchun barcha partition'lar yig'indisi
+    """
+    value = conn.execute(
+        text("""
+            SELECT COALESCE(sum(GREATEST(c.reltuples, 0)), 0)::bigint
+            FROM pg_class c
+            WHERE c.oid = to_regclass(:table)
+               OR c.oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass(:table))
+        """),
+        {"table": table}
+    ).scalar()
+    return value or 0
+
+
+# ==================== MAINTENANCE ====================
+
+def create_partition(conn, month: date) -> bool:
+    """Bitta oy uchun partition yaratish (agar yo'q bo'lsa)"""
+    name = partition_name(month)
+    exists = conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar()
+    if exists:
+        return False
+
+    start, end = month, add_months(month, 1)
+    create_sql = text(
+        f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+    # Default partition'da shu oy qatorlari bo'lsa, CREATE "would be violated" bilan yiqiladi:
+    # default ajratiladi, qatorlar yangi partition'ga ko'chiriladi, default qayta ulanadi
+    if _default_rows(conn, start, end):
+        conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {DEFAULT_PARTITION}"))
+        conn.execute(create_sql)
+        moved = conn.execute(
+            text(f"""
+                WITH moved AS (
+                    DELETE FROM {DEFAULT_PARTITION}
+                    WHERE created_at >= CAST(:start AS timestamptz) AND created_at < CAST(:end AS timestamptz)
+                    RETURNING *
+                )
+                INSERT INTO {PARENT_TABLE} SELECT * FROM moved
+            """),
+            {"start": start.isoformat(), "end": end.isoformat()}
+        ).rowcount
+        conn.execute(text(f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+        logger.warning("Partition yaratildi: %s (default'dan %s qator ko'chirildi)", name, moved)
+    else:
+        conn.execute(create_sql)
+        logger.info(f"Partition yaratildi: {name}")
+    return True
+
+
+def _default_exists(conn) -> bool:
+    return conn.execute(text("SELECT to_regclass(:name)"), {"name": DEFAULT_PARTITION}).scalar() is not None
+
+
+def _default_rows(conn, start: date | None = None, end: date | None = None) -> bool:
+    """Default partition'da ([start, end) oralig'ida) qator bormi"""
+    if not _default_exists(conn):
+        return False
+    where, params = [], {}
+    if start:
+        where.append("created_at >= CAST(:start AS timestamptz)")
+        params["start"] = start.isoformat()
+    if end:
+        where.append("created_at < CAST(:end AS timestamptz)")
+        params["end"] = end.isoformat()
+    condition = f"WHERE {' AND '.join(where)}" if where else ""
+    return bool(conn.execute(
+        text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} {condition})"), params
+    ).scalar())
+
+
+def ensure_partitions(conn, months_ahead: int = MONTHS_AHEAD, today: date | None = None) -> list[str]:
+    """
+    Joriy oy va keyingi N oy uchun partition'larni oldindan yaratish
+
+    Returns:
+        list[str]: yangi yaratilgan partition'lar
+    """
+    if not is_partitioned(conn):
+        return []
+
+    conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": PARTITION_LOCK_ID})
+
+    current = month_start(today or date.today())
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if create_partition(conn, month):
+            created.append(partition_name(month))
+
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {PARENT_TABLE} DEFAULT"))
+
+    # Qolganlari - oylik partition'i yo'q (juda eski yoki juda uzoq kelajak) sanalar
+    if _default_rows(conn):
+        count = conn.execute(text(f"SELECT count(*) FROM {DEFAULT_PARTITION}")).scalar()
+        logger.warning("%s: %s qator oylik partition'dan tashqarida", DEFAULT_PARTITION, count)
+    return created
+
+
+def drop_partitions_before(conn, cutoff: date, detach_only: bool = False) -> list[tuple[str, int]]:
+    """
+    cutoff'dan oldingi oylarni butunlay olib tashlash (O(1) metadata operatsiya)
+
+    Args:
+        cutoff: shu sanadan oldin tugaydigan partition'lar olib tashlanadi
+        detach_only: True bo'lsa faqat DETACH (jadval arxiv sifatida qoladi)
+
+    Returns:
+        [(partition_nomi, taxminiy_qatorlar), ...]
+    """
+    conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": PARTITION_LOCK_ID})
+
+    removed = []
+    for name, start, end in list_partitions(conn):
+        if end is None or end > cutoff:
+            continue
+
+        rows = estimated_rows(conn, name)
+        conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        if not detach_only:
+            conn.execute(text(f"DROP TABLE {name}"))
+
+        removed.append((name, rows))
+        logger.info(f"Partition {'ajratildi' if detach_only else 'ochirildi'}: {name}")
+
+    # Default partition'ga tushib qolgan eski qatorlar (arxivlashda - tegilmaydi)
+    if not detach_only and _default_exists(conn):
+        purged = conn.execute(
+            text(f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at < CAST(:cutoff AS timestamptz)"),
+            {"cutoff": cutoff.isoformat()}
+        ).rowcount
+        if purged:
+            removed.append((DEFAULT_PARTITION, purged))
+            logger.info("%s: %s ta eski qator o'chirildi", DEFAULT_PARTITION, purged)
+
+    return removed
+
+
+async def run_partition_maintenance(engine, interval: int = 86400):
+    """
+    Bot process'ida partition'larni davriy yaratish (async engine)
+
+    Args:
+        engine: AsyncEngine
+        interval: soniya (default: kuniga 1 marta)
+    """
+    while True:
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(ensure_partitions)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Partition maintenance error: {e}")
+
+        await asyncio.sleep(interval)
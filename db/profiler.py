@@ -0,0 +1,269 @@
+# db/profiler.py
+"""
+SQL so'rovlar hisobi va N+1 aniqlash
+
+SQLAlchemy cursor event'lari orqali har bir bot update'i / Flask request'i
+uchun: so'rovlar soni, DB vaqti va takrorlangan so'rov shakllari
+(parametrlarsiz SQL). Chegara oshsa - logger.warning.
+
+Yig'ilgan natija jarayon xotirasida turadi va davriy ravishda query_stats
+jadvaliga qo'shiladi (bot va admin panel alohida jarayon) - admin
+panel: /diagnostics.
+
+    attach(engine)                 # sync engine yoki async_engine.sync_engine
+    with profile('test.categories', 'web'):
+        ...
+"""
+import asyncio
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event, text
+
+from utils.env_data import Config as cf
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar['QueryProfile | None'] = ContextVar('query_profile', default=None)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM = re.compile(r"%\([^)]+\)s|%s|\$\d+|(?<![:\w]):\w+")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*\?\s*,?)+\)", re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+
+
+def normalize(statement: str) -> str:
+    """So'rov shakli - literal va parametrlar '?' bilan almashtiriladi"""
+    shape = _STRING.sub('?', statement)
+    shape = _PARAM.sub('?', shape)
+    shape = _NUMBER.sub('?', shape)
+    shape = _IN_LIST.sub('IN (?)', shape)
+    return _SPACES.sub(' ', shape).strip()
+
+
+class QueryProfile:
+    def __init__(self, name: str, source: str):
+        self.name = name
+        self.source = source
+        self.queries = 0
+        self.db_time = 0.0
+        self.shapes = Counter()
+        self.finished = False
+
+    def record(self, statement: str, elapsed: float):
+        if self.finished:
+            # Handler yaratgan fon task'lari (timer va h.k.) - update allaqachon tugagan
+            return
+        self.queries += 1
+        self.db_time += elapsed
+        self.shapes[normalize(statement)] += 1
+
+    @property
+    def top_shape(self) -> tuple[str | None, int]:
+        if not self.shapes:
+            return None, 0
+        return self.shapes.most_common(1)[0]
+
+    def problems(self) -> list[str]:
+        shape, repeats = self.top_shape
+        found = []
+        if self.queries >= cf.db.PROFILE_WARN_QUERIES:
+            found.append(f"{self.queries} ta so'rov")
+        if repeats >= cf.db.PROFILE_WARN_REPEATS:
+            found.append(f"N+1? {repeats}x: {shape[:200]}")
+        if self.db_time * 1000 >= cf.db.PROFILE_WARN_MS:
+            found.append(f"DB {self.db_time * 1000:.0f} ms")
+        return found
+
+
+# ==================== YIG'ISH ====================
+
+class ProfileStore:
+    """Jarayon bo'yicha (source, name) -> yig'indi; flush() bilan bazaga"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: dict[tuple[str, str], dict] = {}
+
+    def add(self, profile: QueryProfile, flagged: bool):
+        shape, repeats = profile.top_shape
+        db_ms = profile.db_time * 1000
+        with self._lock:
+            row = self._stats.setdefault((profile.source, profile.name), {
+                'requests': 0, 'queries': 0, 'max_queries': 0, 'db_ms': 0.0, 'max_db_ms': 0.0,
+                'flagged': 0, 'top_shape': None, 'top_shape_repeats': 0,
+            })
+            row['requests'] += 1
+            row['queries'] += profile.queries
+            row['max_queries'] = max(row['max_queries'], profile.queries)
+            row['db_ms'] += db_ms
+            row['max_db_ms'] = max(row['max_db_ms'], db_ms)
+            row['flagged'] += int(flagged)
+            if repeats > row['top_shape_repeats']:
+                row['top_shape'], row['top_shape_repeats'] = shape, repeats
+
+    def take(self) -> list[dict]:
+        with self._lock:
+            stats, self._stats = self._stats, {}
+        return [{'source': source, 'name': name, **row} for (source, name), row in stats.items()]
+
+    def restore(self, rows: list[dict]):
+        """flush muvaffaqiyatsiz bo'lsa - keyingi safar qayta urinish"""
+        with self._lock:
+            for row in rows:
+                key = (row['source'], row['name'])
+                current = self._stats.get(key)
+                if current is None:
+                    self._stats[key] = {k: v for k, v in row.items() if k not in ('source', 'name')}
+                    continue
+                for field in ('requests', 'queries', 'db_ms', 'flagged'):
+                    current[field] += row[field]
+                current['max_queries'] = max(current['max_queries'], row['max_queries'])
+                current['max_db_ms'] = max(current['max_db_ms'], row['max_db_ms'])
+                if row['top_shape_repeats'] > current['top_shape_repeats']:
+                    current['top_shape'] = row['top_shape']
+                    current['top_shape_repeats'] = row['top_shape_repeats']
+
+
+store = ProfileStore()
+
+UPSERT_SQL = text("""
+    INSERT INTO query_stats (
+        source, name, requests, queries, max_queries, db_ms, max_db_ms,
+        flagged, top_shape, top_shape_repeats, last_seen
+    ) VALUES (
+        :source, :name, :requests, :queries, :max_queries, :db_ms, :max_db_ms,
+        :flagged, :top_shape, :top_shape_repeats, now()
+    )
+    ON CONFLICT (source, name) DO UPDATE SET
+        requests = query_stats.requests + EXCLUDED.requests,
+        queries = query_stats.queries + EXCLUDED.queries,
+        max_queries = GREATEST(query_stats.max_queries, EXCLUDED.max_queries),
+        db_ms = query_stats.db_ms + EXCLUDED.db_ms,
+        max_db_ms = GREATEST(query_stats.max_db_ms, EXCLUDED.max_db_ms),
+        flagged = query_stats.flagged + EXCLUDED.flagged,
+        top_shape = CASE WHEN EXCLUDED.top_shape_repeats > query_stats.top_shape_repeats
+                         THEN EXCLUDED.top_shape ELSE query_stats.top_shape END,
+        top_shape_repeats = GREATEST(query_stats.top_shape_repeats, EXCLUDED.top_shape_repeats),
+        last_seen = EXCLUDED.last_seen,
+        updated_at = now()
+""")
+
+
+def flush_profile_stats(conn) -> int:
+    """Xotiradagi yig'indini query_stats'ga qo'shish (sync connection)"""
+    rows = store.take()
+    if not rows:
+        return 0
+    try:
+        conn.execute(UPSERT_SQL, rows)
+    except Exception:
+        store.restore(rows)
+        raise
+    return len(rows)
+
+
+_last_flush = time.monotonic()
+_flush_lock = threading.Lock()
+
+
+def maybe_flush(engine, interval: int | None = None):
+    """Sync jarayon (Flask) - interval o'tgan bo'lsa flush, bir vaqtda faqat bitta thread"""
+    global _last_flush
+    interval = cf.db.PROFILE_FLUSH_INTERVAL if interval is None else interval
+    if time.monotonic() - _last_flush < interval or not _flush_lock.acquire(blocking=False):
+        return
+    try:
+        _last_flush = time.monotonic()
+        with engine.begin() as conn:
+            flush_profile_stats(conn)
+    except Exception as e:
+        logger.warning("Query stats flush error: %s", e)
+    finally:
+        _flush_lock.release()
+
+
+async def run_profiler_flush(engine, interval: int | None = None):
+    """Bot jarayonida davriy flush (async engine)"""
+    interval = cf.db.PROFILE_FLUSH_INTERVAL if interval is None else interval
+    while True:
+        try:
+            await asyncio.sleep(interval)
+            async with engine.begin() as conn:
+                await conn.run_sync(flush_profile_stats)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Query stats flush error: %s", e)
+
+
+# ==================== EVENT'LAR ====================
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault('profiler_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current.get()
+    if profile is None:
+        return
+    started = conn.info.get('profiler_started')
+    if started:
+        profile.record(statement, time.perf_counter() - started.pop())
+
+
+def attach(engine):
+    """Sync Engine'ga ulash (AsyncEngine uchun: engine.sync_engine)"""
+    if not cf.db.PROFILE_ENABLED or event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        return
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+# ==================== PROFIL ====================
+
+def start(name: str, source: str):
+    """Profilni boshlash - finish(token) bilan yopiladi"""
+    return _current.set(QueryProfile(name, source))
+
+
+def current() -> QueryProfile | None:
+    return _current.get()
+
+
+def set_name(name: str):
+    """Profil nomini aniqlashtirish (masalan, handler topilgandan keyin)"""
+    profile = _current.get()
+    if profile is not None:
+        profile.name = name
+
+
+def finish(token) -> QueryProfile | None:
+    profile = _current.get()
+    _current.reset(token)
+    if profile is None:
+        return None
+
+    profile.finished = True
+    if profile.queries:
+        problems = profile.problems()
+        if problems:
+            logger.warning("SQL [%s] %s: %s", profile.source, profile.name, '; '.join(problems))
+        store.add(profile, bool(problems))
+    return profile
+
+
+@contextmanager
+def profile(name: str, source: str):
+    token = start(name, source)
+    try:
+        yield _current.get()
+    finally:
+        finish(token)
@@ -0,0 +1,214 @@
+# db/rollup.py
+"""
+Kunlik faollik rollup'i (activity_daily)
+user_activities'dan watermark bo'yicha inkremental yig'iladi:
+har safar faqat watermark kunidan boshlab qayta hisoblanadi.
+"""
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import text, select, func
+
+from db.models import ActivityDaily
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_NAME = "activity_daily"
+ALL = '*'  # "Barchasi" (grouping set jami qatorlari)
+ROLLUP_LOCK_ID = 72_028_001  # pg_advisory_xact_lock uchun
+
+# (kun, tur, bo'lim, parent) + (kun, bo'lim) + (kun) - bitta o'tishda
+UPSERT_SQL = text("""
+    INSERT INTO activity_daily (day, activity_type, section, parent_type, events, unique_users)
+    SELECT
+        date(created_at) AS day,
+        CASE WHEN GROUPING(activity_type) = 1 THEN '*' ELSE activity_type END,
+        CASE WHEN GROUPING(section) = 1 THEN '*' ELSE COALESCE(section, '') END,
+        CASE WHEN GROUPING(parent_type) = 1 THEN '*' ELSE COALESCE(parent_type, '') END,
+        count(*),
+        count(DISTINCT user_id)
+    FROM user_activities
+    WHERE created_at >= :start AND created_at <= :end
+    GROUP BY GROUPING SETS (
+        (date(created_at), activity_type, section, parent_type),
+        (date(created_at), section),
+        (date(created_at))
+    )
+    ON CONFLICT (day, activity_type, section, parent_type)
+    DO UPDATE SET
+        events = EXCLUDED.events,
+        unique_users = EXCLUDED.unique_users,
+        updated_at = now()
+""")
+
+
+# ==================== WRITE ====================
+
+def _day_start(conn, value: datetime | date) -> datetime:
+    """
+    Kun boshi (00:00) - bazada, session TimeZone'i bo'yicha.
+    UPSERT_SQL'dagi date(created_at) ham shu TimeZone'da; asyncpg esa
+    datetime'ni UTC'da qaytaradi - Python'da kesish kunni noto'g'ri bo'lardi.
+    """
+    return conn.execute(
+        text("SELECT date_trunc('day', CAST(:value AS timestamptz))"), {"value": value}
+    ).scalar()
+
+
+def _get_watermark(conn):
+    return conn.execute(
+        text("SELECT watermark FROM rollup_watermarks WHERE name = :name FOR UPDATE"),
+        {"name": WATERMARK_NAME}
+    ).scalar()
+
+
+def _set_watermark(conn, watermark: datetime):
+    conn.execute(
+        text("""
+            INSERT INTO rollup_watermarks (name, watermark) VALUES (:name, :watermark)
+            ON CONFLICT (name) DO UPDATE SET
+                watermark = GREATEST(rollup_watermarks.watermark, EXCLUDED.watermark),
+                updated_at = now()
+        """),
+        {"name": WATERMARK_NAME, "watermark": watermark}
+    )
+
+
+def refresh_activity_rollup(conn) -> int:
+    """
+    Watermark'dan keyingi faollikni rollup'ga qo'shish (sync connection)
+
+    Watermark kuni to'liq qayta hisoblanadi, shuning uchun unique_users aniq qoladi.
+
+    Returns:
+        int: yangilangan rollup qatorlari soni
+    """
+    conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": ROLLUP_LOCK_ID})
+
+    watermark = _get_watermark(conn)
+    if watermark is None:
+        start = conn.execute(text("SELECT min(created_at) FROM user_activities")).scalar()
+        if start is None:
+            return 0
+    else:
+        start = watermark
+
+    start = _day_start(conn, start)
+    end = conn.execute(
+        text("SELECT max(created_at) FROM user_activities WHERE created_at >= :start"),
+        {"start": start}
+    ).scalar()
+    if end is None:
+        return 0
+
+    result = conn.execute(UPSERT_SQL, {"start": start, "end": end})
+    _set_watermark(conn, end)
+    return result.rowcount
+
+
+def backfill_activity_rollup(conn, start_day: date | None = None, end_day: date | None = None) -> int:
+    """
+    Berilgan kunlar oralig'ini [start_day, end_day] xom ma'lumotdan qayta hisoblash
+
+    Eslatma: xom ma'lumoti o'chirilgan kunlar (cleanup) o'zgarmaydi.
+    """
+    conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": ROLLUP_LOCK_ID})
+
+    bounds = conn.execute(text("SELECT min(created_at), max(created_at) FROM user_activities")).one()
+    if bounds[0] is None:
+        return 0
+
+    start = _day_start(conn, start_day or bounds[0])
+    end = _day_start(conn, end_day) + timedelta(days=1) - timedelta(microseconds=1) if end_day else bounds[1]
+
+    result = conn.execute(UPSERT_SQL, {"start": start, "end": end})
+    if end_day is None:
+        _set_watermark(conn, bounds[1])
+    return result.rowcount
+
+
+async def run_rollup_scheduler(engine, interval: int = 300):
+    """
+    Bot process'ida rollup'ni davriy yangilash (async engine)
+
+    Args:
+        engine: AsyncEngine
+        interval: soniya
+    """
+    while True:
+        try:
+            async with engine.begin() as conn:
+                rows = await conn.run_sync(refresh_activity_rollup)
+            logger.debug("Activity rollup: %s rows", rows)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Activity rollup error: {e}")
+
+        await asyncio.sleep(interval)
+
+
+# ==================== READ ====================
+
+def _restore(value: str) -> str | None:
+    return value or None
+
+
+def activity_breakdown(session, start_day: date, end_day: date) -> list[tuple]:
+    """
+    [start_day, end_day) oralig'idagi batafsil qatorlar
+
+    Returns:
+        [(activity_type, section, parent_type, events), ...]
+    """
+    rows = session.execute(
+        select(
+            ActivityDaily.activity_type,
+            ActivityDaily.section,
+            ActivityDaily.parent_type,
+            func.sum(ActivityDaily.events)
+        ).where(
+            ActivityDaily.day >= start_day,
+            ActivityDaily.day < end_day,
+            ActivityDaily.activity_type != ALL
+        ).group_by(
+            ActivityDaily.activity_type,
+            ActivityDaily.section,
+            ActivityDaily.parent_type
+        )
+    ).all()
+    return [(t, _restore(s), _restore(p), int(c)) for t, s, p, c in rows]
+
+
+def daily_unique_users(session, start_day: date, end_day: date, section: str = ALL) -> dict:
+    """
+    Kunlik unique foydalanuvchilar - {date: count}
+
+    Args:
+        section: '*' (barchasi), 'MM' yoki 'SX'
+    """
+    rows = session.execute(
+        select(ActivityDaily.day, ActivityDaily.unique_users).where(
+            ActivityDaily.day >= start_day,
+            ActivityDaily.day < end_day,
+            ActivityDaily.activity_type == ALL,
+            ActivityDaily.section == section,
+            ActivityDaily.parent_type == ALL
+        )
+    ).all()
+    return dict(rows)
+
+
+def daily_events(session, start_day: date, end_day: date) -> dict:
+    """Kunlik jami harakatlar - {date: events}"""
+    rows = session.execute(
+        select(ActivityDaily.day, ActivityDaily.events).where(
+            ActivityDaily.day >= start_day,
+            ActivityDaily.day < end_day,
+            ActivityDaily.activity_type == ALL,
+            ActivityDaily.section == ALL,
+            ActivityDaily.parent_type == ALL
+        )
+    ).all()
+    return dict(rows)
@@ -0,0 +1,306 @@
+# explain_check.py
+"""
+Query plan tekshiruvi (EXPLAIN regression)
+
+Asosiy bot va admin so'rovlarini sun'iy ma'lumotlar bilan EXPLAIN qiladi.
+Katta jadvalda Seq Scan chiqsa - xatolik (exit code 1).
+
+Hammasi bitta tranzaksiyada: seed -> ANALYZE -> EXPLAIN -> ROLLBACK,
+ya'ni bazada hech narsa qolmaydi. Baribir production'da emas, dev/test bazada ishlating.
+
+Ishlatish:
+    python explain_check.py
+    python explain_check.py --scale 2 --verbose
+"""
+
+import argparse
+import json
+from datetime import date
+import sys
+import os
+
+# Project root'ni PATH'ga qo'shish
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+
+from db import get_sync_engine
+from db.partitions import ensure_partitions, is_partitioned, month_start, add_months, create_partition
+
+# Seq Scan shu jadvallarda (va ularning partition'larida) taqiqlanadi
+LARGE_TABLES = (
+    'user_activities', 'folders', 'files', 'videos', 'conspects',
+    'accidents', 'tests', 'test_answers', 'test_category_association', 'users',
+)
+MIN_ROWS = 1000  # bundan kichik jadval/partition'dagi Seq Scan normal
+
+# Seed hajmi (scale=1)
+SEED = {
+    'categories': 40,
+    'folders': 2000,
+    'files': 20000,
+    'videos': 10000,
+    'conspects': 10000,
+    'tests': 20000,
+    'accidents': 10000,
+    'users': 5000,
+    'activities': 200000,
+}
+
+
+# ==================== SEED ====================
+
+def _ids(conn, sql: str, **params) -> list[int]:
+    return list(conn.execute(text(sql), params).scalars().all())
+
+
+def seed(conn, scale: float = 1):
+    """Sun'iy ma'lumotlar (tranzaksiya ichida, oxirida ROLLBACK)"""
+    n = {key: max(int(value * scale), 1) for key, value in SEED.items()}
+
+    test_categories = _ids(conn, """
+        INSERT INTO test_categories (name, section)
+        SELECT '__explain_' || g, CASE WHEN g % 2 = 0 THEN 'MM' ELSE 'SX' END
+        FROM generate_series(1, :n) g RETURNING id
+    """, n=n['categories'])
+    video_categories = _ids(conn, """
+        INSERT INTO video_categories (name, section)
+        SELECT '__explain_' || g, CASE WHEN g % 2 = 0 THEN 'MM' ELSE 'SX' END
+        FROM generate_series(1, :n) g RETURNING id
+    """, n=n['categories'])
+    conspect_categories = _ids(conn, """
+        INSERT INTO conspect_categories (name, section)
+        SELECT '__explain_' || g, CASE WHEN g % 2 = 0 THEN 'MM' ELSE 'SX' END
+        FROM generate_series(1, :n) g RETURNING id
+    """, n=n['categories'])
+    accident_years = _ids(conn, """
+        INSERT INTO accident_years (name) SELECT '__explain_' || g || ' yil'
+        FROM generate_series(1, :n) g RETURNING id
+    """, n=n['categories'])
+    accident_categories = _ids(conn, """
+        INSERT INTO accident_categories (name) SELECT '__explain_' || g
+        FROM generate_series(1, :n) g RETURNING id
+    """, n=n['categories'])
+
+    folders = _ids(conn, """
+        INSERT INTO folders (name, section, parent_type, order_index)
+        SELECT '__explain_' || g,
+               CASE WHEN g % 2 = 0 THEN 'MM' ELSE 'SX' END,
+               (ARRAY['himoya_vositalari', 'nizomlar', 'oquv_texnik', 'kranlar',
+                      'qozonxonalar', 'bosim_idishlari', 'toliq_texnik'])[1 + g % 7],
+               g % 50
+        FROM generate_series(1, :n) g RETURNING id
+    """, n=n['folders'])
+
+    conn.execute(text("""
+        INSERT INTO files (name, file_id, folder_id, order_index)
+        SELECT '__explain_' || g, 'file_' || g, (:ids)[1 + g % cardinality(:ids)], g % 20
+        FROM generate_series(1, :n) g
+    """), {"n": n['files'], "ids": folders})
+    conn.execute(text("""
+        INSERT INTO videos (name, description, file, category_id)
+        SELECT '__explain_' || g, '', 'video_' || g, (:ids)[1 + g % cardinality(:ids)]
+        FROM generate_series(1, :n) g
+    """), {"n": n['videos'], "ids": video_categories})
+    conn.execute(text("""
+        INSERT INTO conspects (name, description, file, category_id)
+        SELECT '__explain_' || g, '', 'conspect_' || g, (:ids)[1 + g % cardinality(:ids)]
+        FROM generate_series(1, :n) g
+    """), {"n": n['conspects'], "ids": conspect_categories})
+    conn.execute(text("""
+        INSERT INTO accidents (title, file_pdf, year_id, category_id)
+        SELECT '__explain_' || g, 'pdf_' || g,
+               (:years)[1 + g % cardinality(:years)],
+               (:categories)[1 + (g / 7) % cardinality(:categories)]
+        FROM generate_series(1, :n) g
+    """), {"n": n['accidents'], "years": accident_years, "categories": accident_categories})
+
+    tests = _ids(conn, """
+        INSERT INTO tests (text) SELECT '__explain_' || g
+        FROM generate_series(1, :n) g RETURNING id
+    """, n=n['tests'])
+    conn.execute(text("""
+        INSERT INTO test_category_association (test_id, category_id)
+        SELECT t, (:categories)[1 + (t + k) % cardinality(:categories)]
+        FROM unnest(CAST(:tests AS bigint[])) t, generate_series(0, 1) k
+        ON CONFLICT DO NOTHING
+    """), {"tests": tests, "categories": test_categories})
+    conn.execute(text("""
+        INSERT INTO test_answers (text, is_correct, test_id)
+        SELECT chr(65 + k), k = 0, t
+        FROM unnest(CAST(:tests AS bigint[])) t, generate_series(0, 3) k
+    """), {"tests": tests})
+
+    users = _ids(conn, """
+        INSERT INTO users (telegram_id, full_name, phone_number, language_code, is_active)
+        SELECT -g, '__explain_' || g, '+998' || g, 'uz', true
+        FROM generate_series(1, :n) g RETURNING id
+    """, n=n['users'])
+
+    # Oxirgi 3 oy bo'yicha faollik
+    current = month_start(date.today())
+    if is_partitioned(conn):
+        for offset in (-2, -1):
+            create_partition(conn, add_months(current, offset))
+        ensure_partitions(conn)
+
+    conn.execute(text("""
+        INSERT INTO user_activities (user_id, activity_type, section, parent_type, created_at)
+        SELECT (:users)[1 + g % cardinality(:users)],
+               (ARRAY['test_start', 'conspect_view', 'video_view', 'folder_open', 'accident_view'])[1 + g % 5],
+               CASE WHEN g % 3 = 0 THEN 'SX' ELSE 'MM' END,
+               CASE WHEN g % 5 = 3 THEN 'nizomlar' END,
+               CAST(:start AS timestamptz) + (now() - CAST(:start AS timestamptz)) * random()
+        FROM generate_series(1, :n) g
+    """), {"n": n['activities'], "users": users, "start": add_months(current, -2)})
+
+    for table in LARGE_TABLES:
+        conn.execute(text(f"ANALYZE {table}"))
+
+    return {
+        'folder': folders[0],
+        'video_category': video_categories[0],
+        'conspect_category': conspect_categories[0],
+        'test_category': test_categories[0],
+        'test': tests[0],
+        'accident_year': accident_years[0],
+        'accident_category': accident_categories[0],
+        'user': users[0],
+        'month_start': current,
+        'today': date.today(),
+        'pattern': '%explain_1234%',
+    }
+
+
+# ==================== QUERIES ====================
+
+# (nomi, SQL) - bot helper'lari va admin route'laridagi so'rovlar shakli
+QUERIES = [
+    ('bot: papkalar (section + parent_type)', """
+        SELECT * FROM folders WHERE section = 'MM' AND parent_type = 'nizomlar'
+        ORDER BY order_index, created_at
+    """),
+    ('bot: papka fayllari', """
+        SELECT * FROM files WHERE folder_id = :folder ORDER BY order_index, created_at
+    """),
+    ('bot: kategoriya videolari', """
+        SELECT * FROM videos WHERE category_id = :video_category ORDER BY created_at
+    """),
+    ('bot: kategoriya konspektlari', """
+        SELECT * FROM conspects WHERE category_id = :conspect_category ORDER BY created_at DESC
+    """),
+    ('bot: kategoriya testlari', """
+        SELECT tests.* FROM tests
+        JOIN test_category_association a ON a.test_id = tests.id
+        WHERE a.category_id = :test_category
+    """),
+    ('bot: test javoblari', """
+        SELECT * FROM test_answers WHERE test_id = :test
+    """),
+    ('bot: yil + kategoriya hodisalari', """
+        SELECT * FROM accidents WHERE year_id = :accident_year AND category_id = :accident_category
+        ORDER BY created_at DESC
+    """),
+    ('admin: kategoriya hodisalari', """
+        SELECT * FROM accidents WHERE category_id = :accident_category ORDER BY created_at DESC LIMIT 20
+    """),
+    ('admin: foydalanuvchi faolligi', """
+        SELECT * FROM user_activities WHERE user_id = :user ORDER BY created_at DESC LIMIT 50
+    """),
+    ('dashboard: bugungi faollik', """
+        SELECT activity_type, count(*) FROM user_activities
+        WHERE created_at >= :today
+        GROUP BY activity_type
+    """),
+    ('admin: test qidiruvi (pg_trgm)', """
+        SELECT * FROM tests WHERE text ILIKE :pattern ORDER BY created_at DESC LIMIT 21
+    """),
+    ('admin: xodim qidiruvi (pg_trgm)', """
+        SELECT * FROM users WHERE full_name ILIKE :pattern OR phone_number ILIKE :pattern
+    """),
+    ('rollup: oxirgi faollik', """
+        SELECT max(created_at) FROM user_activities WHERE created_at >= :month_start
+    """),
+]
+
+
+# ==================== PLAN ====================
+
+def _relation_rows(conn, relation: str) -> int:
+    value = conn.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:name)"),
+        {"name": relation}
+    ).scalar()
+    return max(value or 0, 0)
+
+
+def _walk(node):
+    yield node
+    for child in node.get('Plans', []):
+        yield from _walk(child)
+
+
+def seq_scans(conn, plan: dict) -> list[tuple[str, int]]:
+    """Katta jadvallardagi Seq Scan'lar - [(relation, rows), ...]"""
+    found = []
+    for node in _walk(plan['Plan']):
+        if node.get('Node Type') != 'Seq Scan':
+            continue
+        relation = node.get('Relation Name', '')
+        if not relation.startswith(LARGE_TABLES):
+            continue
+        rows = _relation_rows(conn, relation)
+        if rows >= MIN_ROWS:
+            found.append((relation, rows))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Asosiy so'rovlar uchun EXPLAIN tekshiruvi")
+    parser.add_argument('--scale', type=float, default=1, help="Seed hajmi koeffitsienti")
+    parser.add_argument('--verbose', action='store_true', help="Plan'larni chiqarish")
+    args = parser.parse_args()
+
+    failures = 0
+    conn = get_sync_engine().connect()
+    trans = conn.begin()
+
+    try:
+        print("🌱 Seed...")
+        params = seed(conn, args.scale)
+
+        for name, sql in QUERIES:
+            raw = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"), params).scalar()
+            plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]
+            scans = seq_scans(conn, plan)
+
+            if scans:
+                failures += 1
+                detail = ', '.join(f"{relation} (~{rows})" for relation, rows in scans)
+                print(f"❌ {name}: Seq Scan - {detail}")
+            else:
+                print(f"✅ {name}")
+
+            if args.verbose or scans:
+                raw_text = conn.execute(text(f"EXPLAIN {sql}"), params).scalars().all()
+                print("   " + "\n   ".join(raw_text))
+
+    except Exception as e:
+        print(f"\n❌ XATOLIK: {e}\n")
+        import traceback
+        traceback.print_exc()
+        failures += 1
+
+    finally:
+        trans.rollback()
+        conn.close()
+
+    if failures:
+        print(f"\n❌ {failures} ta muammo topildi")
+    else:
+        print(f"\n✅ Barcha {len(QUERIES)} ta so'rov index ishlatadi")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
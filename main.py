@@ -1,21 +1,39 @@
 import asyncio
-import logging
-import sys
 
 from aiogram import Bot
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
 from aiogram.types import BotCommand
-from aiogram.utils.i18n import I18n, FSMI18nMiddleware
+from aiogram.utils.i18n import I18n
 
 from bot.handlers import dp
-from bot.middlewares import DbSessionMiddleware, JoinGroupMiddleware, UserBlockMiddleware, UserLanguageMiddleware, RateLimitMiddleware
+from bot.middlewares import setup_middlewares
 from utils.env_data import Config as cf
-
-from db import db
+from utils.logging_setup import setup_logging
+
+from db import db, async_engine
+from db.rollup import run_rollup_scheduler
+from db.profiler import run_profiler_flush
+from db.partitions import ensure_partitions, run_partition_maintenance
+from bot.utils.broadcast import run_broadcast_scheduler
+from bot.utils.metrics import start_metrics_server
+from bot.utils.api_session import InstrumentedSession
+from bot.utils.render_cache import RenderCache
+from bot.utils.loop_monitor import loop_monitor
+from bot.utils.content_stats import content_stats
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 
-bot = Bot(token=cf.bot.TOKEN, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
+# Bot API chaqiruvlari metrikalari (bot/utils/api_session.py) va o'zgarmagan edit'larni
+# o'tkazib yuborish (bot/utils/render_cache.py)
+# TELEGRAM_API_URL - yuklama testlari uchun soxta server (benchmarks/fake_api_server.py)
+session = InstrumentedSession(
+    api_url=cf.bot.API_URL,
+    limit=cf.bot.API_POOL_SIZE,
+    keepalive=cf.bot.API_KEEPALIVE,
+    dns_ttl=cf.bot.API_DNS_TTL,
+    render_cache=RenderCache(cf.bot.RENDER_CACHE_SIZE) if cf.bot.RENDER_CACHE_SIZE else None,
+)
+bot = Bot(token=cf.bot.TOKEN, session=session, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
 
 
 async def set_bot_commands(bot: Bot, i18n: I18n) -> None:
@@ -30,52 +48,52 @@ async def main() -> None:
     # Database initialization
     await db.create_all()
 
+    # user_activities partition'lari (joriy + kelgusi oylar)
+    async with async_engine.begin() as conn:
+        await conn.run_sync(ensure_partitions)
+
     async_session_maker = async_sessionmaker(
         db._engine,
         class_=AsyncSession,
         expire_on_commit=False
     )
 
-    # Rate Limiting middleware qo'shish
-    dp.message.middleware(RateLimitMiddleware(rate_limit=0.5))  # 0.5 soniya
-    dp.callback_query.middleware(RateLimitMiddleware(rate_limit=0.3))  # 0.3 soniya
-
     i18n = I18n(path="locales", default_locale="uz", domain="messages")
 
+    # Middleware'lar (tartib muhim - bot/middlewares.py: setup_middlewares)
+    setup_middlewares(dp, async_session_maker, i18n)
 
-    # 1. I18n middleware - ENG BIRINCHI (til funksiyalarini beradi)
-    dp.message.outer_middleware(FSMI18nMiddleware(i18n))
-    dp.callback_query.outer_middleware(FSMI18nMiddleware(i18n))
+    await set_bot_commands(bot, i18n)
 
-    # 2. Database session - ikkinchi
-    dp.message.outer_middleware(DbSessionMiddleware(async_session_maker))
-    dp.callback_query.outer_middleware(DbSessionMiddleware(async_session_maker))
+    # Prometheus metrikalari (middleware/handler vaqtlari)
+    if cf.bot.METRICS_PORT:
+        await start_metrics_server(cf.bot.METRICS_HOST, cf.bot.METRICS_PORT)
 
-    # 3. Channel check - uchinchi
-    dp.message.outer_middleware(JoinGroupMiddleware(async_session_maker))
-    dp.callback_query.outer_middleware(JoinGroupMiddleware(async_session_maker))
+    # Event loop kechikishi va sekin callback'lar (/metrics, /debug)
+    monitor_task = asyncio.create_task(loop_monitor.run())
 
-    # 4. USER BLOCK CHECK - TO'RTINCHI ← SHU YERGA! YANGI!
-    dp.message.outer_middleware(UserBlockMiddleware())
-    dp.callback_query.outer_middleware(UserBlockMiddleware())
+    # 7. Faollik rollup'i (fon rejimida)
+    rollup_task = asyncio.create_task(run_rollup_scheduler(async_engine, interval=cf.db.ROLLUP_INTERVAL))
+    partition_task = asyncio.create_task(run_partition_maintenance(async_engine))
 
-    # 5. User language loading - OXIRIDA (til o'rnatadi va override qiladi)
-    dp.message.outer_middleware(UserLanguageMiddleware(async_session_maker, i18n))
-    dp.callback_query.outer_middleware(UserLanguageMiddleware(async_session_maker, i18n))
+    # SQL profiler yig'indisi -> query_stats (admin: /diagnostics)
+    profiler_task = asyncio.create_task(run_profiler_flush(async_engine))
 
-    # 6. Group router'ga middleware qo'shish
-    from bot.handlers.group_events import group_router
-    group_router.chat_member.outer_middleware(DbSessionMiddleware(async_session_maker))
+    # Bo'limlar statistikasi xotirada - admin paneldagi o'zgarishlar pg_notify orqali
+    if cf.bot.CONTENT_STATS_RESYNC:
+        stats_task = asyncio.create_task(content_stats.run(
+            db._engine, resync=cf.bot.CONTENT_STATS_RESYNC
+        ))
 
+    # 8. Admin paneldan yaratilgan e'lonlar (token bucket bilan)
+    broadcast_task = asyncio.create_task(run_broadcast_scheduler(
+        bot, async_session_maker, rate=cf.bot.BROADCAST_RATE, batch_size=cf.bot.BROADCAST_BATCH
+    ))
 
-    await set_bot_commands(bot, i18n)
     await dp.start_polling(bot, skip_updates=True)
 
 
 if __name__ == "__main__":
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        stream=sys.stdout
-    )
+    # Navbat orqali (stdout I/O event loop'da emas) - utils/logging_setup.py
+    setup_logging('bot')
     asyncio.run(main())
\ No newline at end of file
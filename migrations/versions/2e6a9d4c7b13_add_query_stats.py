@@ -0,0 +1,44 @@
+"""Add query_stats table (SQL profiler)
+
+Revision ID: 2e6a9d4c7b13
+Revises: 9c3d7e2a5f18
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2e6a9d4c7b13'
+down_revision: Union[str, None] = '9c3d7e2a5f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'query_stats',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('source', sa.String(length=10), nullable=False),
+        sa.Column('name', sa.String(length=150), nullable=False),
+        sa.Column('requests', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('queries', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('max_queries', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('db_ms', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('max_db_ms', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('flagged', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('top_shape', sa.Text(), nullable=True),
+        sa.Column('top_shape_repeats', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_seen', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text("TIMEZONE('Asia/Tashkent', NOW())"), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text("TIMEZONE('Asia/Tashkent', NOW())"), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('source', 'name', name='unique_query_stat')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('query_stats')
@@ -0,0 +1,100 @@
+"""Partition user_activities by month
+
+Revision ID: 8a4d6e2f1c53
+Revises: 3f1c2a7d9b41
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a4d6e2f1c53'
+down_revision: Union[str, None] = '3f1c2a7d9b41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+TZ_DEFAULT = "TIMEZONE('Asia/Tashkent', NOW())"
+
+
+def _add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # 1. Eski jadvalni chetga olish
+    op.execute("ALTER TABLE user_activities RENAME TO user_activities_old")
+    op.execute("ALTER TABLE user_activities_old RENAME CONSTRAINT user_activities_pkey TO user_activities_old_pkey")
+    op.execute("ALTER TABLE user_activities_old DROP CONSTRAINT IF EXISTS user_activities_user_id_fkey")
+
+    # 2. Partitioned jadval (PK partition kalitini o'z ichiga oladi)
+    op.execute(f"""
+        CREATE TABLE user_activities (
+            id INTEGER NOT NULL DEFAULT nextval('user_activities_id_seq'),
+            user_id BIGINT REFERENCES users (id) ON DELETE CASCADE,
+            activity_type VARCHAR(50) NOT NULL,
+            section VARCHAR(10),
+            parent_type VARCHAR(50),
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT {TZ_DEFAULT},
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT {TZ_DEFAULT},
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+
+    # 3. Mavjud ma'lumotlar oralig'i + kelgusi oylar uchun partition'lar
+    oldest = conn.execute(sa.text("SELECT min(created_at) FROM user_activities_old")).scalar()
+    today = date.today()
+    month = date((oldest or today).year, (oldest or today).month, 1)
+    last = _add_months(date(today.year, today.month, 1), MONTHS_AHEAD)
+
+    while month <= last:
+        name = f"user_activities_y{month.year}m{month.month:02d}"
+        op.execute(
+            f"CREATE TABLE {name} PARTITION OF user_activities "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+        )
+        month = _add_months(month, 1)
+
+    op.execute("CREATE TABLE user_activities_default PARTITION OF user_activities DEFAULT")
+
+    # 4. Ma'lumotlarni ko'chirish
+    op.execute(f"""
+        INSERT INTO user_activities (id, user_id, activity_type, section, parent_type, created_at, updated_at)
+        SELECT id, user_id, activity_type, section, parent_type, COALESCE(created_at, {TZ_DEFAULT}), updated_at
+        FROM user_activities_old
+    """)
+
+    # 5. Sequence'ni yangi jadvalga o'tkazish va eski jadvalni o'chirish
+    op.execute("ALTER SEQUENCE user_activities_id_seq OWNED BY user_activities.id")
+    op.execute("DROP TABLE user_activities_old")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE user_activities RENAME TO user_activities_partitioned")
+    op.execute(f"""
+        CREATE TABLE user_activities (
+            id INTEGER NOT NULL DEFAULT nextval('user_activities_id_seq'),
+            user_id BIGINT REFERENCES users (id) ON DELETE CASCADE,
+            activity_type VARCHAR(50) NOT NULL,
+            section VARCHAR(10),
+            parent_type VARCHAR(50),
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT {TZ_DEFAULT},
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT {TZ_DEFAULT},
+            CONSTRAINT user_activities_pkey PRIMARY KEY (id)
+        )
+    """)
+    op.execute("""
+        INSERT INTO user_activities (id, user_id, activity_type, section, parent_type, created_at, updated_at)
+        SELECT id, user_id, activity_type, section, parent_type, created_at, updated_at
+        FROM user_activities_partitioned
+    """)
+    op.execute("ALTER SEQUENCE user_activities_id_seq OWNED BY user_activities.id")
+    op.execute("DROP TABLE user_activities_partitioned CASCADE")
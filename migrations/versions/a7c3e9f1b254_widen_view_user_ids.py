@@ -0,0 +1,31 @@
+"""Widen file_views/accident_views user_id to BIGINT
+
+Revision ID: a7c3e9f1b254
+Revises: f4b2a8c6d391
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e9f1b254'
+down_revision: Union[str, None] = 'f4b2a8c6d391'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Telegram user_id 2^31 dan oshadi (users.telegram_id allaqachon BIGINT)
+TABLES = ('file_views', 'accident_views')
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.alter_column(table, 'user_id', type_=sa.BigInteger(), existing_type=sa.Integer(), existing_nullable=False)
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.alter_column(table, 'user_id', type_=sa.Integer(), existing_type=sa.BigInteger(), existing_nullable=False)
@@ -0,0 +1,50 @@
+"""Add composite indexes for bot browsing and admin filters
+
+Revision ID: c7e2b5a1d830
+Revises: 8a4d6e2f1c53
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e2b5a1d830'
+down_revision: Union[str, None] = '8a4d6e2f1c53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index, jadval, ustunlar) - db/models.py dagi Index'lar bilan bir xil
+INDEXES = [
+    ('ix_user_activities_created_type', 'user_activities', ['created_at', 'activity_type']),
+    ('ix_user_activities_section_created', 'user_activities', ['section', 'created_at']),
+    ('ix_user_activities_user_created', 'user_activities', ['user_id', 'created_at']),
+    ('ix_folders_section_parent_order', 'folders', ['section', 'parent_type', 'order_index', 'created_at']),
+    ('ix_files_folder_order', 'files', ['folder_id', 'order_index', 'created_at']),
+    ('ix_videos_category_created', 'videos', ['category_id', 'created_at']),
+    ('ix_conspects_category_created', 'conspects', ['category_id', 'created_at']),
+    ('ix_accidents_year_category', 'accidents', ['year_id', 'category_id']),
+    ('ix_accidents_category_created', 'accidents', ['category_id', 'created_at']),
+    ('ix_test_category_association_category', 'test_category_association', ['category_id', 'test_id']),
+    ('ix_test_answers_test_id', 'test_answers', ['test_id']),
+    ('ix_test_categories_section_created', 'test_categories', ['section', 'created_at']),
+    ('ix_video_categories_section_created', 'video_categories', ['section', 'created_at']),
+    ('ix_conspect_categories_section_created', 'conspect_categories', ['section', 'created_at']),
+]
+
+
+def upgrade() -> None:
+    # user_activities partitioned - index parent'da yaratiladi va barcha partition'larga tarqaladi
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False, if_not_exists=True)
+
+    for _, table, _ in INDEXES:
+        op.execute(f"ANALYZE {table}")
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
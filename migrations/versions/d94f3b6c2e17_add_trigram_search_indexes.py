@@ -0,0 +1,52 @@
+"""Add pg_trgm GIN indexes for admin substring search
+
+Revision ID: d94f3b6c2e17
+Revises: c7e2b5a1d830
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd94f3b6c2e17'
+down_revision: Union[str, None] = 'c7e2b5a1d830'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (jadval, ustun) - web/services/search.py da qidiriladigan ustunlar
+TRGM_COLUMNS = [
+    ('tests', 'text'),
+    ('users', 'full_name'),
+    ('users', 'phone_number'),
+    ('users', 'username'),
+    ('files', 'name'),
+    ('folders', 'name'),
+    ('groups', 'title'),
+    ('videos', 'name'),
+    ('videos', 'description'),
+    ('conspects', 'name'),
+    ('conspects', 'description'),
+    ('accidents', 'title'),
+    ('accidents', 'description'),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for table, column in TRGM_COLUMNS:
+        op.create_index(
+            f'ix_{table}_{column}_trgm', table, [column],
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    for table, column in reversed(TRGM_COLUMNS):
+        op.drop_index(f'ix_{table}_{column}_trgm', table_name=table, if_exists=True)
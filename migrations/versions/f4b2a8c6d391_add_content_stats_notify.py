@@ -0,0 +1,61 @@
+"""Notify content changes for the bot statistics cache
+
+Revision ID: f4b2a8c6d391
+Revises: 2e6a9d4c7b13
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b2a8c6d391'
+down_revision: Union[str, None] = '2e6a9d4c7b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# bot/utils/content_stats.py: CHANNEL, ITEM_TABLES, CONTAINER_TABLES
+TABLES = (
+    'video_categories', 'videos',
+    'conspect_categories', 'conspects',
+    'folders', 'files',
+    'accident_years', 'accident_categories', 'accidents',
+)
+
+# pg_notify payload 8000 baytdan oshmasin - katta matn ustunlari olib tashlanadi
+FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION notify_content_stats() RETURNS trigger AS $$
+DECLARE
+    -- xid: bot yuklagan snapshot'da bu o'zgarish bor-yo'qligini aniqlash uchun
+    payload jsonb := jsonb_build_object('table', TG_TABLE_NAME, 'op', TG_OP, 'xid', pg_current_xact_id()::text);
+    dropped text[] := ARRAY['description', 'file', 'file_pdf', 'file_id', 'title'];
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        payload := payload || jsonb_build_object('old', to_jsonb(OLD) - dropped);
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        payload := payload || jsonb_build_object('new', to_jsonb(NEW) - dropped);
+    END IF;
+    PERFORM pg_notify('content_stats', payload::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    op.execute(FUNCTION_SQL)
+    for table in TABLES:
+        op.execute(f"""
+            CREATE TRIGGER {table}_content_stats
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION notify_content_stats()
+        """)
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_content_stats ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS notify_content_stats()")
@@ -0,0 +1,47 @@
+# rollup_activity.py
+"""
+Faollik rollup'ini yangilash (activity_daily)
+
+Ishlatish:
+    python rollup_activity.py                       # watermark'dan inkremental
+    python rollup_activity.py --backfill            # butun tarixni qayta hisoblash
+    python rollup_activity.py --backfill --from 2025-01-01 --to 2025-01-31
+"""
+
+import argparse
+from datetime import date
+import sys
+import os
+
+# Project root'ni PATH'ga qo'shish
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from db import get_sync_engine
+from db.rollup import refresh_activity_rollup, backfill_activity_rollup
+
+
+def main():
+    parser = argparse.ArgumentParser(description="activity_daily rollup'ini yangilash")
+    parser.add_argument('--backfill', action='store_true', help="Xom ma'lumotdan qayta hisoblash")
+    parser.add_argument('--from', dest='start_day', type=date.fromisoformat, help='YYYY-MM-DD')
+    parser.add_argument('--to', dest='end_day', type=date.fromisoformat, help='YYYY-MM-DD')
+    args = parser.parse_args()
+
+    try:
+        with get_sync_engine().begin() as conn:
+            if args.backfill:
+                rows = backfill_activity_rollup(conn, args.start_day, args.end_day)
+            else:
+                rows = refresh_activity_rollup(conn)
+
+        print(f"✅ Activity rollup: {rows} ta qator yangilandi")
+
+    except Exception as e:
+        print(f"\n❌ XATOLIK: {e}\n")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
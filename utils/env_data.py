@@ -7,6 +7,48 @@ load_dotenv(ENV_PATH)
 class BotConfig:
     TOKEN = getenv("BOT_TOKEN")
 
+    # Admin'lar (rate limit yo'q, /debug) - vergul bilan
+    ADMIN_IDS = {int(i) for i in getenv("BOT_ADMIN_IDS", "900172087").split(",") if i.strip()}
+
+    # Boshqa Bot API server (masalan, benchmarks/fake_api_server.py) - bo'sh bo'lsa api.telegram.org
+    API_URL = getenv("TELEGRAM_API_URL")
+
+    # Bot API ulanishlari: umumiy limit, keep-alive (soniya), DNS keshi (soniya)
+    API_POOL_SIZE = int(getenv("TELEGRAM_POOL_SIZE", 100))
+    API_KEEPALIVE = float(getenv("TELEGRAM_KEEPALIVE", 60))
+    API_DNS_TTL = int(getenv("TELEGRAM_DNS_TTL", 600))
+
+    # Xabarlarning oxirgi ko'rinishi keshi (bot/utils/render_cache.py) - o'zgarmagan
+    # edit'lar yuborilmaydi. 0 - o'chirilgan
+    RENDER_CACHE_SIZE = int(getenv("RENDER_CACHE_SIZE", 50000))
+
+    # Handler o'qish funksiyalari (bot/utils/single_flight.py): bir xil parallel so'rovlar
+    # bitta bo'ladi, natija yana shuncha soniya qayta ishlatiladi. 0 - faqat birlashtirish
+    READ_CACHE_TTL = float(getenv("READ_CACHE_TTL", 2))
+
+    # Bo'limlar statistikasi xotirada (bot/utils/content_stats.py): o'zgarishlar pg_notify
+    # orqali, to'liq qayta yuklash oralig'i (soniya). 0 - o'chirilgan, har safar bazadan
+    CONTENT_STATS_RESYNC = int(getenv("CONTENT_STATS_RESYNC", 600))
+
+    # E'lon yuborish tezligi (xabar/soniya). Telegram umumiy limiti ~30/s -
+    # qolgani interaktiv javoblar uchun
+    BROADCAST_RATE = float(getenv("BROADCAST_RATE", 20))
+    BROADCAST_BATCH = int(getenv("BROADCAST_BATCH", 200))
+
+    # Test taymeri: barcha taymer edit'lari uchun umumiy byudjet (edit/soniya),
+    # oxirgi soniyalar ustuvor, yangilanishlar shundan kam bo'lsa - "HH:MM:SS gacha" matni
+    COUNTDOWN_EDIT_RATE = float(getenv("COUNTDOWN_EDIT_RATE", 10))
+    COUNTDOWN_FINAL_SECONDS = int(getenv("COUNTDOWN_FINAL_SECONDS", 10))
+    COUNTDOWN_MIN_UPDATES = int(getenv("COUNTDOWN_MIN_UPDATES", 3))
+
+    # Prometheus /metrics (bot jarayonida). 0 - o'chirilgan
+    METRICS_HOST = getenv("METRICS_HOST", "127.0.0.1")
+    METRICS_PORT = int(getenv("METRICS_PORT", 9101))
+
+    # Event loop monitori: namuna oralig'i (soniya) va "sekin callback" chegarasi (ms)
+    LOOP_MONITOR_INTERVAL = float(getenv("LOOP_MONITOR_INTERVAL", 0.5))
+    SLOW_CALLBACK_MS = int(getenv("SLOW_CALLBACK_MS", 100))
+
 class DBConfig:
     DB_NAME = getenv("DB_NAME")
     DB_USER = getenv("DB_USER")
@@ -15,6 +57,40 @@ class DBConfig:
     DB_PORT = getenv("DB_PORT")
     DB_URL = getenv("DB_ASYNC_URL")
 
+    # Sync engine pool (Flask admin panel)
+    POOL_SIZE = int(getenv("DB_POOL_SIZE", 5))
+    MAX_OVERFLOW = int(getenv("DB_MAX_OVERFLOW", 10))
+    POOL_TIMEOUT = int(getenv("DB_POOL_TIMEOUT", 30))
+    POOL_RECYCLE = int(getenv("DB_POOL_RECYCLE", 1800))  # soniya
+
+    # activity_daily rollup yangilanish intervali (soniya)
+    ROLLUP_INTERVAL = int(getenv("ACTIVITY_ROLLUP_INTERVAL", 300))
+
+    # SQL profiler (db/profiler.py) - update/request bo'yicha chegaralar
+    PROFILE_ENABLED = getenv("DB_PROFILE", "true").lower() in ("1", "true", "yes")
+    PROFILE_WARN_QUERIES = int(getenv("DB_PROFILE_WARN_QUERIES", 25))
+    PROFILE_WARN_REPEATS = int(getenv("DB_PROFILE_WARN_REPEATS", 5))  # bir xil so'rov shakli - N+1 belgisi
+    PROFILE_WARN_MS = int(getenv("DB_PROFILE_WARN_MS", 500))
+    PROFILE_FLUSH_INTERVAL = int(getenv("DB_PROFILE_FLUSH_INTERVAL", 60))  # query_stats'ga yozish (soniya)
+
+
+class JobConfig:
+    # worker.py - fon vazifalari
+    WORKERS = int(getenv("JOB_WORKERS", 2))
+    POLL_INTERVAL = float(getenv("JOB_POLL_INTERVAL", 2))  # soniya
+    STALE_TIMEOUT = int(getenv("JOB_STALE_TIMEOUT", 300))  # heartbeat'siz shuncha soniya - qayta navbatga
+    FILES_DIR = getenv("JOB_FILES_DIR", "uploads/jobs")  # web va worker uchun umumiy papka
+
+
+class LogConfig:
+    # utils/logging_setup.py
+    LEVEL = getenv("LOG_LEVEL", "INFO")
+    FORMAT = getenv("LOG_FORMAT", "json")  # json | text
+    # Modul bo'yicha daraja: "aiogram.event=WARNING,sqlalchemy.engine=WARNING"
+    LEVELS = getenv("LOG_LEVELS", "aiogram.event=WARNING")
+    # Shovqinli logger'lar: N tadan bittasi yoziladi ("bot.ratelimit=100")
+    SAMPLE = getenv("LOG_SAMPLE", "bot.ratelimit=100")
+
 
 class WEBConfig:
     ADMIN_USERNAME = getenv("ADMIN_USERNAME")
@@ -25,6 +101,8 @@ class Config:
     bot = BotConfig()
     db = DBConfig()
     web = WEBConfig()
+    jobs = JobConfig()
+    log = LogConfig()
 
 
 
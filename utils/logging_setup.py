@@ -0,0 +1,143 @@
+# utils/logging_setup.py
+"""
+Loglash - bloklamaydigan, strukturali (JSON)
+
+    logger.info(...) -> QueueHandler (navbatga qo'yish, I/O yo'q)
+                     -> QueueListener thread -> stdout
+
+Event loop (bot) va Flask request thread'lari stdout'ga o'zi yozmaydi.
+Har bir yozuvga joriy kontekst qo'shiladi (bind()): bot'da update_id,
+user_id, handler; admin panelda endpoint. LOG_LEVELS - modul bo'yicha
+daraja, LOG_SAMPLE - shovqinli logger'lardan N tadan bittasi.
+
+    setup_logging('bot')   # main.py, web/app.py, cleanup_monthly.py
+"""
+import atexit
+import itertools
+import json
+import logging
+import queue
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from utils.env_data import Config as cf
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+LOG_CONTEXT: ContextVar[dict] = ContextVar('log_context', default={})
+
+# LogRecord'ning o'z atributlari - qolganlari extra={...} maydonlari
+_RESERVED = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+_listener: QueueListener | None = None
+
+
+def bind(**fields):
+    """Joriy kontekstga maydon qo'shish - unbind(token) bilan qaytariladi"""
+    return LOG_CONTEXT.set({**LOG_CONTEXT.get(), **fields})
+
+
+def unbind(token):
+    LOG_CONTEXT.reset(token)
+
+
+def _pairs(value: str) -> list[tuple[str, str]]:
+    """"a=1,b=2" -> [('a', '1'), ('b', '2')]"""
+    pairs = []
+    for item in value.split(','):
+        name, _, setting = item.partition('=')
+        if name.strip() and setting.strip():
+            pairs.append((name.strip(), setting.strip()))
+    return pairs
+
+
+class ContextFilter(logging.Filter):
+    """LOG_CONTEXT maydonlarini yozuvga (chaqiruvchi thread/task'da)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for key, value in LOG_CONTEXT.get().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+
+class SampleFilter(logging.Filter):
+    """N tadan bittasini o'tkazish; yozuvda sample=N (qayta tiklash uchun)"""
+
+    def __init__(self, every: int):
+        super().__init__()
+        self.every = max(every, 1)
+        self._counter = itertools.count()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if next(self._counter) % self.every:
+            return False
+        record.sample = self.every
+        return True
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Standart prepare() yozuvni chaqiruvchi thread'da to'liq formatlaydi -
+    bu yerda faqat xabar va traceback matni, qolgani listener thread'ida.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    def __init__(self, service: str):
+        super().__init__()
+        self.service = service
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'service': self.service,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED:
+                data[key] = value
+        if record.exc_text:
+            data['exc'] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+def setup_logging(service: str, fmt: str | None = None) -> QueueListener:
+    """Root logger -> navbat -> stdout (bir marta, jarayon bo'yicha)"""
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    stream = logging.StreamHandler(sys.stdout)
+    fmt = fmt or cf.log.FORMAT
+    stream.setFormatter(JsonFormatter(service) if fmt == 'json' else logging.Formatter(TEXT_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    handler = DeferredQueueHandler(log_queue)
+    handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(cf.log.LEVEL.upper())
+
+    for name, level in _pairs(cf.log.LEVELS):
+        logging.getLogger(name).setLevel(level.upper())
+    for name, every in _pairs(cf.log.SAMPLE):
+        logging.getLogger(name).addFilter(SampleFilter(int(every)))
+
+    _listener = QueueListener(log_queue, stream)
+    _listener.start()
+    atexit.register(_listener.stop)
+    return _listener
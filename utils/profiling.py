@@ -0,0 +1,136 @@
+# utils/profiling.py
+"""
+Ishlab turgan jarayonni profil qilish (qayta ishga tushirmasdan)
+
+Bot (/profile, /memory - bot/handlers/debug_handler.py) va admin panel
+(/diagnostics/profile, /diagnostics/memory) bir xil ishlatadi.
+
+- sample_stacks(): N soniya davomida barcha thread'larning stack'ini
+  sys._current_frames() orqali namuna qiladi -> collapsed stack format
+  (flamegraph.pl, speedscope, inferno):
+
+      MainThread;run (asyncio/base_events.py);... 42
+
+- memory_diff(): tracemalloc bilan ikki snapshot orasidagi farq + berilgan
+  konteynerlar (dict'lar) hajmi o'zgarishi
+
+Ikkalasi ham bloklaydi - bot'da asyncio.to_thread() orqali chaqiriladi.
+"""
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+
+from utils.settings import BASE_DIR
+
+PROJECT_DIR = str(BASE_DIR.resolve())
+
+MAX_PROFILE_SECONDS = 60
+MAX_MEMORY_SECONDS = 300
+
+# Bir vaqtda faqat bitta yozib olish (jarayon bo'yicha)
+_capture_lock = threading.Lock()
+
+
+class ProfilerBusy(Exception):
+    """Boshqa profil yozilayotgan bo'lsa"""
+
+
+def _frame_label(code) -> str:
+    filename = os.path.abspath(code.co_filename)
+    if filename.startswith(PROJECT_DIR):
+        filename = os.path.relpath(filename, PROJECT_DIR)
+    else:
+        # site-packages/aiogram/... -> aiogram/...
+        filename = os.path.join(*filename.split(os.sep)[-2:])
+    return f'{code.co_name} ({filename})'
+
+
+def sample_stacks(seconds: float, interval: float = 0.005) -> str:
+    """N soniyalik sampling profil - collapsed stack matni"""
+    seconds = min(max(seconds, 1), MAX_PROFILE_SECONDS)
+    if not _capture_lock.acquire(blocking=False):
+        raise ProfilerBusy()
+
+    try:
+        me = threading.get_ident()
+        stacks = defaultdict(int)
+        deadline = time.monotonic() + seconds
+
+        while time.monotonic() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me:
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                labels.append(names.get(thread_id, str(thread_id)))
+                stacks[';'.join(reversed(labels))] += 1
+            time.sleep(interval)
+    finally:
+        _capture_lock.release()
+
+    return ''.join(f'{stack} {count}\n' for stack, count in sorted(stacks.items()))
+
+
+def _size(container) -> int:
+    try:
+        return len(container)
+    except TypeError:
+        return 0
+
+
+def memory_diff(seconds: float, containers: dict | None = None, limit: int = 25) -> str:
+    """
+    tracemalloc: N soniya ichida qayerda xotira o'sgan (fayl:qator) va
+    containers ({nomi: dict}) elementlari soni qanchaga o'zgargan.
+    """
+    seconds = min(max(seconds, 1), MAX_MEMORY_SECONDS)
+    containers = containers or {}
+    if not _capture_lock.acquire(blocking=False):
+        raise ProfilerBusy()
+
+    started_here = not tracemalloc.is_tracing()
+    try:
+        if started_here:
+            tracemalloc.start()
+        before_sizes = {name: _size(container) for name, container in containers.items()}
+        before = tracemalloc.take_snapshot()
+
+        time.sleep(seconds)
+
+        after = tracemalloc.take_snapshot()
+        after_sizes = {name: _size(container) for name, container in containers.items()}
+    finally:
+        if started_here:
+            tracemalloc.stop()
+        _capture_lock.release()
+
+    ignore = (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+    )
+    stats = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), 'lineno')
+
+    lines = [f"tracemalloc: {seconds:.0f} s oralig'idagi farq", '']
+    if containers:
+        lines.append("Konteynerlar (elementlar soni):")
+        for name in sorted(containers, key=lambda n: after_sizes[n] - before_sizes[n], reverse=True):
+            delta = after_sizes[name] - before_sizes[name]
+            lines.append(f"  {name:<45} {after_sizes[name]:>8} ({delta:+d})")
+        lines.append('')
+
+    lines.append(f"Eng ko'p o'sgan joylar (top {limit}):")
+    for stat in stats[:limit]:
+        frame = stat.traceback[0]
+        filename = os.path.abspath(frame.filename)
+        if filename.startswith(PROJECT_DIR):
+            filename = os.path.relpath(filename, PROJECT_DIR)
+        lines.append(
+            f"  {stat.size_diff / 1024:>+10.1f} KiB {stat.count_diff:>+8d} obj  {filename}:{frame.lineno}"
+        )
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,64 @@
+# utils/telegram_html.py
+"""
+Telegram HTML (parse_mode=HTML) belgilarini oldindan tekshirish
+
+Noto'g'ri teg bo'lsa Telegram "can't parse entities" qaytaradi - e'lon
+(bot/utils/broadcast.py) har bir qabul qiluvchiga xato bo'ladi. Admin panel
+e'lonni saqlashdan oldin shu yerda tekshiradi:
+
+    error = html_error(text)   # None - to'g'ri
+"""
+import re
+from html.parser import HTMLParser
+
+# https://core.telegram.org/bots/api#html-style
+ALLOWED_TAGS = {
+    'b', 'strong', 'i', 'em', 'u', 'ins', 's', 'strike', 'del',
+    'span', 'tg-spoiler', 'a', 'code', 'pre', 'blockquote', 'tg-emoji',
+}
+# Teg yoki entity'ning boshi bo'lmagan "<" va "&"
+_BARE_LT = re.compile(r'<(?![a-zA-Z/])')
+_BARE_AMP = re.compile(r'&(?!(?:[a-zA-Z]+|#\d+|#x[0-9a-fA-F]+);)')
+
+
+class _TagChecker(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack: list[str] = []
+        self.error: str | None = None
+
+    def _fail(self, message: str):
+        if self.error is None:
+            self.error = message
+
+    def handle_starttag(self, tag, attrs):
+        if tag not in ALLOWED_TAGS:
+            return self._fail(f"Qo'llab-quvvatlanmaydigan teg: <{tag}>")
+        if tag == 'a' and not dict(attrs).get('href'):
+            return self._fail("<a> tegida href yo'q")
+        self.stack.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self._fail(f"Yopiq (self-closing) teg: <{tag}/>")
+
+    def handle_endtag(self, tag):
+        if not self.stack or self.stack[-1] != tag:
+            return self._fail(f"Kutilmagan yopuvchi teg: </{tag}>")
+        self.stack.pop()
+
+
+def html_error(text: str) -> str | None:
+    """Xato izohi yoki None"""
+    if _BARE_LT.search(text):
+        return "\"<\" belgisi - &lt; deb yozing"
+    if _BARE_AMP.search(text):
+        return "\"&\" belgisi - &amp; deb yozing"
+
+    checker = _TagChecker()
+    checker.feed(text)
+    checker.close()
+    if checker.error:
+        return checker.error
+    if checker.stack:
+        return f"Yopilmagan teg: <{checker.stack[-1]}>"
+    return None
@@ -2,19 +2,22 @@
 """
 RJUTB Admin Panel - Custom Flask Application
 """
-from flask import Flask, render_template, redirect, url_for, session
+from flask import Flask, render_template, redirect, url_for, session, g, request
 from flask_login import LoginManager, login_required, current_user
 from datetime import datetime
+import logging
 import sys
+import time
 from pathlib import Path
 
 # Add parent directory to path
 BASE_DIR = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(BASE_DIR))
 
+from utils.logging_setup import setup_logging, bind, unbind
 from web.config import FlaskConfig
 from web.models import User  # ← YANGI IMPORT!
-from db import get_sync_session
+from web.database import init_app as init_db
 from db.models import (
     Folder, File,
     Accident, AccidentYear, AccidentCategory,
@@ -24,10 +27,36 @@ from db.models import (
     User as BotUser
 )
 
+# ========== LOGGING (navbat orqali, JSON) ==========
+setup_logging('web')
+request_logger = logging.getLogger('web.request')
+
 # ========== FLASK APP ==========
 app = Flask(__name__)
 app.config.from_object(FlaskConfig)
 
+
+@app.before_request
+def bind_log_context():
+    """Request ichidagi barcha loglarga endpoint va method"""
+    g.log_started = time.perf_counter()
+    g.log_context = bind(endpoint=request.endpoint, method=request.method)
+
+
+@app.teardown_request
+def unbind_log_context(exception=None):
+    context = g.pop('log_context', None)
+    if context is None:
+        return
+    request_logger.debug(
+        "Request", extra={'latency_ms': round((time.perf_counter() - g.log_started) * 1000, 1)}
+    )
+    unbind(context)
+
+
+# ========== DATABASE (request-scoped session) ==========
+init_db(app)
+
 # ========== FLASK-LOGIN ==========
 login_manager = LoginManager()
 login_manager.init_app(app)
@@ -62,6 +91,11 @@ from web.routes.video import video_bp
 from web.routes.test import test_bp
 from web.routes.users import users_bp
 from web.routes.groups import groups_bp
+from web.routes.search import search_bp
+from web.routes.exports import export_bp
+from web.routes.jobs import jobs_bp
+from web.routes.broadcast import broadcast_bp
+from web.routes.diagnostics import diagnostics_bp
 
 # Register blueprints
 app.register_blueprint(auth_bp)
@@ -74,6 +108,11 @@ app.register_blueprint(video_bp)
 app.register_blueprint(test_bp)
 app.register_blueprint(users_bp)
 app.register_blueprint(groups_bp)
+app.register_blueprint(search_bp)
+app.register_blueprint(export_bp)
+app.register_blueprint(jobs_bp)
+app.register_blueprint(broadcast_bp)
+app.register_blueprint(diagnostics_bp)
 
 # ========== ERROR HANDLERS ==========
 @app.errorhandler(404)
@@ -20,6 +20,11 @@ class FlaskConfig:
         'postgresql+psycopg2'
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    DB_QUERY_COUNTING = os.getenv('DB_QUERY_COUNTING', '').lower() in ('1', 'true', 'yes')  # Request bo'yicha SQL soni
+
+    # Dashboard snapshot keshi (soniya)
+    DASHBOARD_REFRESH_SECONDS = int(os.getenv('DASHBOARD_REFRESH_SECONDS', 60))
+    DASHBOARD_MAX_STALE_SECONDS = int(os.getenv('DASHBOARD_MAX_STALE_SECONDS', 900))
 
     # Upload settings
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB
@@ -0,0 +1,54 @@
+# web/database.py
+"""
+Request-scoped Database Session
+Har bir Flask request uchun bitta session (birinchi ishlatilganda ochiladi,
+teardown_appcontext'da yopiladi).
+
+SQL profiler (db/profiler.py) har bir request'ni endpoint nomi bilan o'lchaydi.
+"""
+from flask import g, current_app, request
+
+from db import get_sync_session, get_sync_engine, profiler
+
+
+def get_db():
+    """Joriy request uchun session (kerak bo'lganda yaratiladi)"""
+    if 'db_session' not in g:
+        g.db_session = get_sync_session()
+    return g.db_session
+
+
+def close_db(exception=None):
+    """Request oxirida session'ni yopish"""
+    session = g.pop('db_session', None)
+
+    if session is not None:
+        if exception is not None:
+            session.rollback()
+        session.close()
+
+    token = g.pop('db_profile_token', None)
+    if token is None:
+        return
+
+    profile = profiler.finish(token)
+    if profile is not None and current_app.config.get('DB_QUERY_COUNTING'):
+        current_app.logger.info(
+            "%s - %s ta SQL so'rov, %.1f ms",
+            profile.name, profile.queries, profile.db_time * 1000
+        )
+
+    # Profil yig'indisi -> query_stats (interval bilan, request'dan tashqarida)
+    profiler.maybe_flush(get_sync_engine())
+
+
+def _start_profile():
+    if not request.endpoint or request.endpoint == 'static':
+        return
+    g.db_profile_token = profiler.start(request.endpoint, 'web')
+
+
+def init_app(app):
+    """Flask app'ga session lifecycle'ni ulash"""
+    app.teardown_appcontext(close_db)
+    app.before_request(_start_profile)
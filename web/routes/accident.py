@@ -2,15 +2,19 @@
 """
 Accident Routes - Years, Categories, Accidents CRUD
 """
+import logging
+
 from flask import Blueprint, render_template, redirect, url_for, request, flash
 from flask_login import login_required
-from db import get_sync_session
+from web.database import get_db
+from web.services.search import text_filter
+from web.services.counts import attach_counts, count_for
 from db.models import AccidentYear, AccidentCategory, Accident
-from sqlalchemy import func
 from sqlalchemy.orm import joinedload
 from datetime import datetime
 
 accident_bp = Blueprint('accident', __name__, url_prefix='/accident')
+logger = logging.getLogger(__name__)
 
 
 # ==================== YEARS ====================
@@ -19,23 +23,18 @@ accident_bp = Blueprint('accident', __name__, url_prefix='/accident')
 @login_required
 def years():
     """List all accident years"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         years_list = session.query(AccidentYear).order_by(AccidentYear.name.desc()).all()
 
-        # Count accidents for each year
-        for year in years_list:
-            year.accidents_count = session.query(func.count(Accident.id)).filter(
-                Accident.year_id == year.id
-            ).scalar() or 0
+        # Count accidents for all years (bitta GROUP BY)
+        attach_counts(session, years_list, Accident.year_id, 'accidents_count')
 
     except Exception as e:
-        print(f"Years list error: {e}")
+        logger.exception("Years list error: %s", e)
         years_list = []
         flash('Xatolik yuz berdi!', 'error')
-    finally:
-        session.close()
 
     return render_template('accident/years.html', years=years_list)
 
@@ -45,7 +44,7 @@ def years():
 def years_create():
     """Create new year"""
     if request.method == 'POST':
-        session = get_sync_session()
+        session = get_db()
 
         try:
             year = request.form.get('year', '').strip()
@@ -69,11 +68,9 @@ def years_create():
 
         except Exception as e:
             session.rollback()
-            print(f"Year create error: {e}")
+            logger.exception("Year create error: %s", e)
             flash(f'Xatolik: {str(e)}', 'error')
             return redirect(url_for('accident.years_create'))
-        finally:
-            session.close()
 
     return render_template('accident/years_create.html')
 
@@ -82,7 +79,7 @@ def years_create():
 @login_required
 def years_delete(id):
     """Delete year"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         year = session.query(AccidentYear).get(id)
@@ -92,9 +89,7 @@ def years_delete(id):
             return redirect(url_for('accident.years'))
 
         # Check if year has accidents
-        accidents_count = session.query(func.count(Accident.id)).filter(
-            Accident.year_id == id
-        ).scalar()
+        accidents_count = count_for(session, Accident.year_id, id)
 
         if accidents_count > 0:
             flash(f'Bu yilda {accidents_count} ta hodisa bor! Avval hodisalarni o\'chiring.', 'warning')
@@ -108,10 +103,8 @@ def years_delete(id):
 
     except Exception as e:
         session.rollback()
-        print(f"Year delete error: {e}")
+        logger.exception("Year delete error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
-    finally:
-        session.close()
 
     return redirect(url_for('accident.years'))
 
@@ -122,25 +115,20 @@ def years_delete(id):
 @login_required
 def categories():
     """List all accident categories"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         categories_list = session.query(AccidentCategory).order_by(
             AccidentCategory.name.asc()
         ).all()
 
-        # Count accidents for each category
-        for category in categories_list:
-            category.accidents_count = session.query(func.count(Accident.id)).filter(
-                Accident.category_id == category.id
-            ).scalar() or 0
+        # Count accidents for all categories (bitta GROUP BY)
+        attach_counts(session, categories_list, Accident.category_id, 'accidents_count')
 
     except Exception as e:
-        print(f"Categories list error: {e}")
+        logger.exception("Categories list error: %s", e)
         categories_list = []
         flash('Xatolik yuz berdi!', 'error')
-    finally:
-        session.close()
 
     return render_template('accident/categories.html', categories=categories_list)
 
@@ -150,7 +138,7 @@ def categories():
 def categories_create():
     """Create new category"""
     if request.method == 'POST':
-        session = get_sync_session()
+        session = get_db()
 
         try:
             name = request.form.get('name', '').strip()
@@ -169,11 +157,9 @@ def categories_create():
 
         except Exception as e:
             session.rollback()
-            print(f"Category create error: {e}")
+            logger.exception("Category create error: %s", e)
             flash(f'Xatolik: {str(e)}', 'error')
             return redirect(url_for('accident.categories_create'))
-        finally:
-            session.close()
 
     return render_template('accident/categories_create.html')
 
@@ -182,7 +168,7 @@ def categories_create():
 @login_required
 def categories_edit(id):
     """Edit category"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         category = session.query(AccidentCategory).get(id)
@@ -208,18 +194,16 @@ def categories_edit(id):
 
     except Exception as e:
         session.rollback()
-        print(f"Category edit error: {e}")
+        logger.exception("Category edit error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
         return redirect(url_for('accident.categories'))
-    finally:
-        session.close()
 
 
 @accident_bp.route('/categories/<int:id>/delete', methods=['POST'])
 @login_required
 def categories_delete(id):
     """Delete category"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         category = session.query(AccidentCategory).get(id)
@@ -229,9 +213,7 @@ def categories_delete(id):
             return redirect(url_for('accident.categories'))
 
         # Check if category has accidents
-        accidents_count = session.query(func.count(Accident.id)).filter(
-            Accident.category_id == id
-        ).scalar()
+        accidents_count = count_for(session, Accident.category_id, id)
 
         if accidents_count > 0:
             flash(f'Bu kategoriyada {accidents_count} ta hodisa bor!', 'warning')
@@ -245,10 +227,8 @@ def categories_delete(id):
 
     except Exception as e:
         session.rollback()
-        print(f"Category delete error: {e}")
+        logger.exception("Category delete error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
-    finally:
-        session.close()
 
     return redirect(url_for('accident.categories'))
 
@@ -260,7 +240,7 @@ def categories_delete(id):
 @login_required
 def list():
     """List all accidents with pagination"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         # Get parameters
@@ -278,8 +258,7 @@ def list():
 
         if search:
             query = query.filter(
-                (Accident.title.ilike(f'%{search}%')) |
-                (Accident.description.ilike(f'%{search}%'))
+                text_filter([Accident.title, Accident.description], search)
             )
 
         if year_filter:
@@ -308,9 +287,7 @@ def list():
         has_next = page < total_pages
 
     except Exception as e:
-        print(f"Accidents list error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Accidents list error: %s", e)
         accidents = []
         years_list = []
         categories_list = []
@@ -319,8 +296,6 @@ def list():
         has_prev = False
         has_next = False
         flash('Xatolik yuz berdi!', 'error')
-    finally:
-        session.close()
 
     return render_template(
         'accident/list.html',
@@ -343,7 +318,7 @@ def list():
 @login_required
 def create():
     """Create new accident"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         if request.method == 'POST':
@@ -397,20 +372,16 @@ def create():
 
     except Exception as e:
         session.rollback()
-        print(f"Accident create error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Accident create error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
         return redirect(url_for('accident.create'))
-    finally:
-        session.close()
 
 
 @accident_bp.route('/<int:id>/edit', methods=['GET', 'POST'])
 @login_required
 def edit(id):
     """Edit accident"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         accident = session.query(Accident).options(
@@ -471,18 +442,16 @@ def edit(id):
 
     except Exception as e:
         session.rollback()
-        print(f"Accident edit error: {e}")
+        logger.exception("Accident edit error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
         return redirect(url_for('accident.list'))
-    finally:
-        session.close()
 
 
 @accident_bp.route('/<int:id>/delete', methods=['POST'])
 @login_required
 def delete(id):
     """Delete accident"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         accident = session.query(Accident).get(id)
@@ -498,10 +467,8 @@ def delete(id):
 
     except Exception as e:
         session.rollback()
-        print(f"Accident delete error: {e}")
+        logger.exception("Accident delete error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
-    finally:
-        session.close()
 
     return redirect(url_for('accident.list'))
 
@@ -510,7 +477,7 @@ def delete(id):
 @login_required
 def view(id):
     """View accident details"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         accident = session.query(Accident).options(
@@ -525,8 +492,6 @@ def view(id):
         return render_template('accident/view.html', accident=accident)
 
     except Exception as e:
-        print(f"Accident view error: {e}")
+        logger.exception("Accident view error: %s", e)
         flash('Xatolik yuz berdi!', 'error')
         return redirect(url_for('accident.list'))
-    finally:
-        session.close()
\ No newline at end of file
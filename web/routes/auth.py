@@ -2,6 +2,8 @@
 """
 Authentication Routes - Login/Logout
 """
+import logging
+
 from flask import Blueprint, render_template, redirect, url_for, request, flash, session
 from flask_login import login_user, logout_user, current_user
 from web.config import FlaskConfig
@@ -9,6 +11,7 @@ from web.models import User  # ← YANGI IMPORT!
 import bcrypt
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
+logger = logging.getLogger(__name__)
 
 
 @auth_bp.route('/login', methods=['GET', 'POST'])
@@ -39,7 +42,7 @@ def login():
                     return redirect(next_page or url_for('dashboard.index'))
 
             except Exception as e:
-                print(f"❌ Login error: {e}")
+                logger.exception("Login error: %s", e)
                 error = "Tizimda xatolik yuz berdi!"
                 return render_template('auth/login.html', error=error)
 
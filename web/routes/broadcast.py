@@ -0,0 +1,132 @@
+# web/routes/broadcast.py
+"""
+Broadcast Routes - barcha xodimlarga e'lon
+E'lonni bot jarayoni yuboradi (bot/utils/broadcast.py)
+"""
+import logging
+
+from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask_login import login_required
+from sqlalchemy import func, update
+
+from web.database import get_db
+from db.models import Broadcast, User
+from utils.telegram_html import html_error
+
+broadcast_bp = Blueprint('broadcast', __name__, url_prefix='/broadcast')
+logger = logging.getLogger(__name__)
+
+LANGUAGES = {'uz': "O'zbek", 'ru': 'Rus', 'kk': 'Qoraqalpoq'}
+STATUS_NAMES = {
+    'queued': 'Navbatda',
+    'running': 'Yuborilmoqda',
+    'done': 'Yuborildi',
+    'cancelled': 'Bekor qilindi',
+    'failed': 'Xatolik',
+}
+MAX_TEXT_LENGTH = 4096  # Telegram xabar limiti
+
+
+def audience_count(session, language_code: str | None = None) -> int:
+    """Qabul qiluvchilar soni (faol va botni bloklamagan)"""
+    query = session.query(func.count(User.id)).filter(User.is_active == True, User.bot_blocked == False)
+    if language_code:
+        query = query.filter(User.language_code == language_code)
+    return query.scalar() or 0
+
+
+@broadcast_bp.route('/', methods=['GET', 'POST'])
+@login_required
+def index():
+    """E'lonlar ro'yxati va yangi e'lon"""
+    session = get_db()
+
+    if request.method == 'POST':
+        try:
+            text = request.form.get('text', '').strip()
+            language_code = request.form.get('language_code', '').strip() or None
+
+            if not text:
+                flash('E\'lon matni kiritilishi shart!', 'error')
+                return redirect(url_for('broadcast.index'))
+
+            if len(text) > MAX_TEXT_LENGTH:
+                flash(f'E\'lon {MAX_TEXT_LENGTH} belgidan oshmasligi kerak!', 'error')
+                return redirect(url_for('broadcast.index'))
+
+            # Bot HTML parse_mode bilan yuboradi - noto'g'ri teg har bir xodimga xato bo'lardi
+            error = html_error(text)
+            if error:
+                flash(f'HTML xatosi: {error}', 'error')
+                return redirect(url_for('broadcast.index'))
+
+            if language_code and language_code not in LANGUAGES:
+                language_code = None
+
+            broadcast = Broadcast(
+                text=text,
+                language_code=language_code,
+                total=audience_count(session, language_code)
+            )
+            session.add(broadcast)
+            session.commit()
+
+            flash(f'E\'lon navbatga qo\'shildi ({broadcast.total} ta qabul qiluvchi)', 'success')
+            return redirect(url_for('broadcast.index'))
+
+        except Exception as e:
+            session.rollback()
+            logger.exception("Broadcast create error: %s", e)
+            flash(f'Xatolik: {str(e)}', 'error')
+            return redirect(url_for('broadcast.index'))
+
+    try:
+        broadcasts = session.query(Broadcast).order_by(Broadcast.id.desc()).limit(30).all()
+        # Til bo'yicha qabul qiluvchilar - bitta GROUP BY
+        audience = dict(session.query(User.language_code, func.count(User.id)).filter(
+            User.is_active == True, User.bot_blocked == False
+        ).group_by(User.language_code).all())
+        audience[''] = sum(audience.values())
+        blocked_count = session.query(func.count(User.id)).filter(User.bot_blocked == True).scalar() or 0
+    except Exception as e:
+        logger.exception("Broadcast list error: %s", e)
+        broadcasts, audience, blocked_count = [], {}, 0
+        flash('Xatolik yuz berdi!', 'error')
+
+    return render_template(
+        'broadcast/index.html',
+        broadcasts=broadcasts,
+        audience=audience,
+        blocked_count=blocked_count,
+        languages=LANGUAGES,
+        status_names=STATUS_NAMES,
+        has_running=any(not b.is_finished for b in broadcasts)
+    )
+
+
+@broadcast_bp.route('/<int:id>/cancel', methods=['POST'])
+@login_required
+def cancel(id):
+    """E'lonni to'xtatish (bot keyingi bo'lakdan oldin to'xtaydi)"""
+    session = get_db()
+
+    try:
+        result = session.execute(
+            update(Broadcast).where(
+                Broadcast.id == id,
+                Broadcast.status.in_(('queued', 'running'))
+            ).values(cancel_requested=True)
+        )
+        session.commit()
+
+        if result.rowcount:
+            flash('E\'lon to\'xtatilmoqda', 'success')
+        else:
+            flash('E\'lon allaqachon tugagan', 'warning')
+
+    except Exception as e:
+        session.rollback()
+        logger.exception("Broadcast cancel error: %s", e)
+        flash(f'Xatolik: {str(e)}', 'error')
+
+    return redirect(url_for('broadcast.index'))
@@ -2,14 +2,19 @@
 """
 Conspect Routes - Categories and Conspects CRUD
 """
+import logging
+
 from flask import Blueprint, render_template, redirect, url_for, request, flash
 from flask_login import login_required
-from db import get_sync_session
+from web.database import get_db
+from web.services.search import text_filter
+from web.services.pagination import paginate, empty_page
+from web.services.counts import attach_counts, count_for
 from db.models import ConspectCategory, Conspect
-from sqlalchemy import func
 from sqlalchemy.orm import joinedload
 
 conspect_bp = Blueprint('conspect', __name__, url_prefix='/conspect')
+logger = logging.getLogger(__name__)
 
 
 # ==================== CATEGORIES ====================
@@ -18,7 +23,7 @@ conspect_bp = Blueprint('conspect', __name__, url_prefix='/conspect')
 @login_required
 def categories():
     """List all conspect categories"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         categories_list = session.query(ConspectCategory).order_by(
@@ -26,17 +31,12 @@ def categories():
             ConspectCategory.name.asc()
         ).all()
 
-        for category in categories_list:
-            category.conspects_count = session.query(func.count(Conspect.id)).filter(
-                Conspect.category_id == category.id
-            ).scalar() or 0
+        attach_counts(session, categories_list, Conspect.category_id, 'conspects_count')
 
     except Exception as e:
-        print(f"Categories list error: {e}")
+        logger.exception("Categories list error: %s", e)
         categories_list = []
         flash('Xatolik yuz berdi!', 'error')
-    finally:
-        session.close()
 
     return render_template('conspect/categories.html', categories=categories_list)
 
@@ -46,7 +46,7 @@ def categories():
 def categories_create():
     """Create new category"""
     if request.method == 'POST':
-        session = get_sync_session()
+        session = get_db()
 
         try:
             name = request.form.get('name', '').strip()
@@ -73,11 +73,9 @@ def categories_create():
 
         except Exception as e:
             session.rollback()
-            print(f"Category create error: {e}")
+            logger.exception("Category create error: %s", e)
             flash(f'Xatolik: {str(e)}', 'error')
             return redirect(url_for('conspect.categories_create'))
-        finally:
-            session.close()
 
     return render_template('conspect/categories_create.html')
 
@@ -86,7 +84,7 @@ def categories_create():
 @login_required
 def categories_edit(id):
     """Edit category"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         category = session.query(ConspectCategory).get(id)
@@ -118,18 +116,16 @@ def categories_edit(id):
 
     except Exception as e:
         session.rollback()
-        print(f"Category edit error: {e}")
+        logger.exception("Category edit error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
         return redirect(url_for('conspect.categories'))
-    finally:
-        session.close()
 
 
 @conspect_bp.route('/categories/<int:id>/delete', methods=['POST'])
 @login_required
 def categories_delete(id):
     """Delete category"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         category = session.query(ConspectCategory).get(id)
@@ -138,9 +134,7 @@ def categories_delete(id):
             flash('Kategoriya topilmadi!', 'error')
             return redirect(url_for('conspect.categories'))
 
-        conspects_count = session.query(func.count(Conspect.id)).filter(
-            Conspect.category_id == id
-        ).scalar()
+        conspects_count = count_for(session, Conspect.category_id, id)
 
         if conspects_count > 0:
             flash(f'Bu kategoriyada {conspects_count} ta konspekt bor!', 'warning')
@@ -154,10 +148,8 @@ def categories_delete(id):
 
     except Exception as e:
         session.rollback()
-        print(f"Category delete error: {e}")
+        logger.exception("Category delete error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
-    finally:
-        session.close()
 
     return redirect(url_for('conspect.categories'))
 
@@ -169,10 +161,9 @@ def categories_delete(id):
 @login_required
 def list():
     """List all conspects with pagination"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
-        page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 20, type=int)
         section_filter = request.args.get('section', '').strip()
         category_filter = request.args.get('category', '', type=int)
@@ -184,8 +175,7 @@ def list():
 
         if search:
             query = query.filter(
-                (Conspect.name.ilike(f'%{search}%')) |
-                (Conspect.description.ilike(f'%{search}%'))
+                text_filter([Conspect.name, Conspect.description], search)
             )
 
         if section_filter:
@@ -196,35 +186,22 @@ def list():
         if category_filter:
             query = query.filter(Conspect.category_id == category_filter)
 
-        query = query.order_by(Conspect.created_at.desc())
-
-        total = query.count()
-
-        offset = (page - 1) * per_page
-        conspects = query.limit(per_page).offset(offset).all()
+        pagination = paginate(
+            session, query, [(Conspect.created_at, True), (Conspect.id, True)], request.args, per_page
+        )
+        conspects = pagination.items
 
         categories_list = session.query(ConspectCategory).order_by(
             ConspectCategory.section.asc(),
             ConspectCategory.name.asc()
         ).all()
 
-        total_pages = (total + per_page - 1) // per_page
-        has_prev = page > 1
-        has_next = page < total_pages
-
     except Exception as e:
-        print(f"Conspects list error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Conspects list error: %s", e)
         conspects = []
         categories_list = []
-        total = 0
-        total_pages = 0
-        has_prev = False
-        has_next = False
+        pagination = empty_page(per_page)
         flash('Xatolik yuz berdi!', 'error')
-    finally:
-        session.close()
 
     return render_template(
         'conspect/list.html',
@@ -233,12 +210,7 @@ def list():
         search=search,
         section_filter=section_filter,
         category_filter=category_filter,
-        page=page,
-        per_page=per_page,
-        total=total,
-        total_pages=total_pages,
-        has_prev=has_prev,
-        has_next=has_next
+        **pagination.template_args()
     )
 
 
@@ -246,7 +218,7 @@ def list():
 @login_required
 def create():
     """Create new conspect"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         if request.method == 'POST':
@@ -298,20 +270,16 @@ def create():
 
     except Exception as e:
         session.rollback()
-        print(f"Conspect create error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Conspect create error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
         return redirect(url_for('conspect.create'))
-    finally:
-        session.close()
 
 
 @conspect_bp.route('/<int:id>/edit', methods=['GET', 'POST'])
 @login_required
 def edit(id):
     """Edit conspect"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         conspect = session.query(Conspect).options(
@@ -384,20 +352,16 @@ def edit(id):
 
     except Exception as e:
         session.rollback()
-        print(f"Conspect edit error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Conspect edit error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
         return redirect(url_for('conspect.list'))
-    finally:
-        session.close()
 
 
 @conspect_bp.route('/<int:id>/delete', methods=['POST'])
 @login_required
 def delete(id):
     """Delete conspect"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         conspect = session.query(Conspect).get(id)
@@ -413,10 +377,8 @@ def delete(id):
 
     except Exception as e:
         session.rollback()
-        print(f"Conspect delete error: {e}")
+        logger.exception("Conspect delete error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
-    finally:
-        session.close()
 
     return redirect(url_for('conspect.list'))
 
@@ -425,7 +387,7 @@ def delete(id):
 @login_required
 def view(id):
     """View conspect details"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         conspect = session.query(Conspect).options(
@@ -439,8 +401,6 @@ def view(id):
         return render_template('conspect/view.html', conspect=conspect)
 
     except Exception as e:
-        print(f"Conspect view error: {e}")
+        logger.exception("Conspect view error: %s", e)
         flash('Xatolik yuz berdi!', 'error')
         return redirect(url_for('conspect.list'))
-    finally:
-        session.close()
\ No newline at end of file
@@ -0,0 +1,133 @@
+# web/routes/diagnostics.py
+"""
+Diagnostics Routes - SQL profiler natijalari (db/profiler.py)
+Bot handler'lari va admin sahifalari bo'yicha eng ko'p so'rov yuboradiganlar.
+Admin panel jarayonini profil qilish: /profile, /memory (utils/profiling.py)
+"""
+import logging
+
+from datetime import datetime
+
+from flask import Blueprint, render_template, request, redirect, url_for, flash, Response
+from flask_login import login_required
+from sqlalchemy import delete
+
+from web.database import get_db
+from db import profiler, get_sync_engine
+from db.models import QueryStat
+from utils.env_data import Config as cf
+from utils.profiling import sample_stacks, memory_diff, ProfilerBusy, MAX_PROFILE_SECONDS, MAX_MEMORY_SECONDS
+
+diagnostics_bp = Blueprint('diagnostics', __name__, url_prefix='/diagnostics')
+logger = logging.getLogger(__name__)
+
+SOURCES = {'bot': 'Bot', 'web': 'Admin panel'}
+
+# Saralash -> (nomi, ifoda)
+SORTS = {
+    'avg_queries': ("O'rtacha so'rovlar", (QueryStat.queries / QueryStat.requests).desc()),
+    'max_queries': ("Maks. so'rovlar", QueryStat.max_queries.desc()),
+    'repeats': ('Takrorlanish (N+1)', QueryStat.top_shape_repeats.desc()),
+    'db_ms': ('Jami DB vaqti', QueryStat.db_ms.desc()),
+    'flagged': ('Ogohlantirishlar', QueryStat.flagged.desc()),
+}
+LIMIT = 50
+PROFILE_SECONDS = 10
+MEMORY_SECONDS = 30
+
+
+def _download(text: str, prefix: str, extension: str) -> Response:
+    filename = f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+    return Response(
+        text,
+        mimetype='text/plain',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
+
+
+@diagnostics_bp.route('/')
+@login_required
+def index():
+    """Top offender'lar"""
+    session = get_db()
+
+    source = request.args.get('source', '')
+    sort = request.args.get('sort', 'avg_queries')
+    if sort not in SORTS:
+        sort = 'avg_queries'
+
+    try:
+        # Joriy jarayonning yozilmagan yig'indisi ham ko'rinsin
+        profiler.maybe_flush(get_sync_engine(), interval=0)
+
+        query = session.query(QueryStat).filter(QueryStat.requests > 0)
+        if source in SOURCES:
+            query = query.filter(QueryStat.source == source)
+        stats = query.order_by(SORTS[sort][1], QueryStat.id).limit(LIMIT).all()
+    except Exception as e:
+        logger.exception("Diagnostics error: %s", e)
+        stats = []
+        flash('Xatolik yuz berdi!', 'error')
+
+    return render_template(
+        'diagnostics/index.html',
+        stats=stats,
+        sources=SOURCES,
+        sorts={key: name for key, (name, _) in SORTS.items()},
+        current_source=source,
+        current_sort=sort,
+        thresholds={
+            'queries': cf.db.PROFILE_WARN_QUERIES,
+            'repeats': cf.db.PROFILE_WARN_REPEATS,
+            'ms': cf.db.PROFILE_WARN_MS,
+        },
+        enabled=cf.db.PROFILE_ENABLED
+    )
+
+
+@diagnostics_bp.route('/reset', methods=['POST'])
+@login_required
+def reset():
+    """Statistikani tozalash (masalan, optimizatsiyadan keyin)"""
+    session = get_db()
+
+    try:
+        session.execute(delete(QueryStat))
+        session.commit()
+        flash('Statistika tozalandi', 'success')
+    except Exception as e:
+        session.rollback()
+        logger.exception("Diagnostics reset error: %s", e)
+        flash(f'Xatolik: {str(e)}', 'error')
+
+    return redirect(url_for('diagnostics.index'))
+
+
+@diagnostics_bp.route('/profile', methods=['POST'])
+@login_required
+def profile():
+    """Admin panel jarayoni - N soniyalik sampling profil (collapsed stack)"""
+    seconds = request.form.get('seconds', PROFILE_SECONDS, type=int)
+
+    try:
+        folded = sample_stacks(min(seconds, MAX_PROFILE_SECONDS))
+    except ProfilerBusy:
+        flash("Boshqa profil yozilmoqda, keyinroq urinib ko'ring", 'warning')
+        return redirect(url_for('diagnostics.index'))
+
+    return _download(folded, 'web_profile', 'folded')
+
+
+@diagnostics_bp.route('/memory', methods=['POST'])
+@login_required
+def memory():
+    """Admin panel jarayoni - tracemalloc farqi"""
+    seconds = request.form.get('seconds', MEMORY_SECONDS, type=int)
+
+    try:
+        report = memory_diff(min(seconds, MAX_MEMORY_SECONDS))
+    except ProfilerBusy:
+        flash("Boshqa profil yozilmoqda, keyinroq urinib ko'ring", 'warning')
+        return redirect(url_for('diagnostics.index'))
+
+    return _download(report, 'web_memory', 'txt')
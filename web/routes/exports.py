@@ -0,0 +1,87 @@
+# web/routes/exports.py
+"""
+Export Routes - CSV / XLSX yuklab olish (oqimli)
+"""
+import logging
+
+from datetime import datetime
+
+from flask import Blueprint, render_template, request, redirect, url_for, flash, Response, stream_with_context
+from flask_login import login_required
+
+from web.database import get_db
+from web.services.dashboard_stats import ACTIVITY_NAMES
+from web.services.exports import DATASETS, ExportFilters, stream_csv, stream_xlsx
+from db.jobs import enqueue
+
+export_bp = Blueprint('export', __name__, url_prefix='/export')
+logger = logging.getLogger(__name__)
+
+FORMATS = {
+    'csv': (stream_csv, 'text/csv; charset=utf-8'),
+    'xlsx': (stream_xlsx, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
+
+
+@export_bp.route('/')
+@login_required
+def index():
+    """Export sahifasi"""
+    return render_template(
+        'exports/index.html',
+        datasets=DATASETS,
+        activity_names=ACTIVITY_NAMES
+    )
+
+
+@export_bp.route('/<dataset>')
+@login_required
+def download(dataset):
+    """Datasetni oqim sifatida yuklab berish"""
+    if dataset not in DATASETS:
+        flash('Bunday eksport yo\'q!', 'error')
+        return redirect(url_for('export.index'))
+
+    file_format = request.args.get('format', 'csv')
+    if file_format not in FORMATS:
+        file_format = 'csv'
+
+    writer, mimetype = FORMATS[file_format]
+    filters = ExportFilters.from_args(request.args)
+    session = get_db()
+
+    filename = f"{dataset}_{datetime.now().strftime('%Y%m%d_%H%M')}.{file_format}"
+    return Response(
+        stream_with_context(writer(session, dataset, filters)),
+        mimetype=mimetype,
+        headers={
+            'Content-Disposition': f'attachment; filename={filename}',
+            'X-Accel-Buffering': 'no',  # nginx oqimni buferlamasin
+        }
+    )
+
+
+@export_bp.route('/<dataset>/job', methods=['POST'])
+@login_required
+def enqueue_job(dataset):
+    """Katta eksport - fonda faylga yoziladi, tayyor bo'lgach vazifa sahifasidan yuklanadi"""
+    if dataset not in DATASETS:
+        flash('Bunday eksport yo\'q!', 'error')
+        return redirect(url_for('export.index'))
+
+    session = get_db()
+    params = {
+        'dataset': dataset,
+        'file_format': request.form.get('format', 'csv'),
+        'filters': {key: request.form.get(key, '') for key in ('date_from', 'date_to', 'section', 'activity_type')},
+    }
+
+    try:
+        job = enqueue(session, 'export', params)
+        flash(f'Eksport navbatga qo\'shildi (vazifa #{job.id})', 'success')
+        return redirect(url_for('jobs.view', id=job.id))
+    except Exception as e:
+        session.rollback()
+        logger.exception("Export enqueue error: %s", e)
+        flash(f'Xatolik: {str(e)}', 'error')
+        return redirect(url_for('export.index'))
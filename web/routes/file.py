@@ -2,14 +2,19 @@
 """
 File Routes - CRUD Operations with Pagination
 """
+import logging
+
 from flask import Blueprint, render_template, redirect, url_for, request, flash
 from flask_login import login_required
-from db import get_sync_session
+from web.database import get_db
+from web.services.search import text_filter
+from web.services.pagination import paginate, empty_page
 from db.models import File, Folder
 from sqlalchemy import func
 from sqlalchemy.orm import joinedload
 
 file_bp = Blueprint('file', __name__, url_prefix='/file')
+logger = logging.getLogger(__name__)
 
 
 @file_bp.route('/')
@@ -17,11 +22,10 @@ file_bp = Blueprint('file', __name__, url_prefix='/file')
 @login_required
 def list():
     """List all files with pagination"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         # Get parameters
-        page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 20, type=int)
         search = request.args.get('search', '').strip()
         folder_filter = request.args.get('folder', '', type=int)
@@ -31,7 +35,7 @@ def list():
         query = session.query(File).options(joinedload(File.folder))
 
         if search:
-            query = query.filter(File.name.ilike(f'%{search}%'))
+            query = query.filter(text_filter([File.name], search))
 
         if folder_filter:
             query = query.filter(File.folder_id == folder_filter)
@@ -40,37 +44,23 @@ def list():
             # Join with Folder to filter by section
             query = query.join(Folder).filter(Folder.section == section_filter)
 
-        # Order by
-        query = query.order_by(File.order_index.asc(), File.created_at.desc())
-
-        # Total count
-        total = query.count()
-
-        # Pagination
-        offset = (page - 1) * per_page
-        files = query.limit(per_page).offset(offset).all()
+        # Keyset pagination (order_index, created_at, id) + taxminiy jami
+        pagination = paginate(
+            session, query,
+            [(File.order_index, False), (File.created_at, True), (File.id, True)],
+            request.args, per_page
+        )
+        files = pagination.items
 
         # Get all folders for filter dropdown
         folders = session.query(Folder).order_by(Folder.name).all()
 
-        # Calculate pagination info
-        total_pages = (total + per_page - 1) // per_page
-        has_prev = page > 1
-        has_next = page < total_pages
-
     except Exception as e:
-        print(f"File list error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("File list error: %s", e)
         files = []
         folders = []
-        total = 0
-        total_pages = 0
-        has_prev = False
-        has_next = False
+        pagination = empty_page(per_page)
         flash('Xatolik yuz berdi!', 'error')
-    finally:
-        session.close()
 
     return render_template(
         'file/list.html',
@@ -79,12 +69,7 @@ def list():
         search=search,
         folder_filter=folder_filter,
         section_filter=section_filter,
-        page=page,
-        per_page=per_page,
-        total=total,
-        total_pages=total_pages,
-        has_prev=has_prev,
-        has_next=has_next
+        **pagination.template_args()
     )
 
 
@@ -92,7 +77,7 @@ def list():
 @login_required
 def create():
     """Create new file"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         if request.method == 'POST':
@@ -147,20 +132,16 @@ def create():
 
     except Exception as e:
         session.rollback()
-        print(f"File create error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("File create error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
         return redirect(url_for('file.create'))
-    finally:
-        session.close()
 
 
 @file_bp.route('/<int:id>/edit', methods=['GET', 'POST'])
 @login_required
 def edit(id):
     """Edit file"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         file = session.query(File).options(joinedload(File.folder)).get(id)
@@ -206,18 +187,16 @@ def edit(id):
 
     except Exception as e:
         session.rollback()
-        print(f"File edit error: {e}")
+        logger.exception("File edit error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
         return redirect(url_for('file.list'))
-    finally:
-        session.close()
 
 
 @file_bp.route('/<int:id>/delete', methods=['POST'])
 @login_required
 def delete(id):
     """Delete file"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         file = session.query(File).get(id)
@@ -234,10 +213,8 @@ def delete(id):
 
     except Exception as e:
         session.rollback()
-        print(f"File delete error: {e}")
+        logger.exception("File delete error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
-    finally:
-        session.close()
 
     return redirect(url_for('file.list'))
 
@@ -246,7 +223,7 @@ def delete(id):
 @login_required
 def view(id):
     """View file details"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         file = session.query(File).options(joinedload(File.folder)).get(id)
@@ -258,8 +235,6 @@ def view(id):
         return render_template('file/view.html', file=file)
 
     except Exception as e:
-        print(f"File view error: {e}")
+        logger.exception("File view error: %s", e)
         flash('Xatolik yuz berdi!', 'error')
         return redirect(url_for('file.list'))
-    finally:
-        session.close()
\ No newline at end of file
@@ -2,13 +2,17 @@
 """
 Folder Routes - CRUD Operations with Pagination
 """
+import logging
+
 from flask import Blueprint, render_template, redirect, url_for, request, flash
 from flask_login import login_required
-from db import get_sync_session
-from db.models import Folder
-from sqlalchemy import func
+from web.database import get_db
+from web.services.search import text_filter
+from web.services.counts import attach_counts, has_children
+from db.models import Folder, File
 
 folder_bp = Blueprint('folder', __name__, url_prefix='/folder')
+logger = logging.getLogger(__name__)
 
 
 @folder_bp.route('/')
@@ -16,7 +20,7 @@ folder_bp = Blueprint('folder', __name__, url_prefix='/folder')
 @login_required
 def list():
     """List all folders with pagination"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         # Get parameters
@@ -29,7 +33,7 @@ def list():
         query = session.query(Folder)
 
         if search:
-            query = query.filter(Folder.name.ilike(f'%{search}%'))
+            query = query.filter(text_filter([Folder.name], search))
 
         if section_filter:
             query = query.filter(Folder.section == section_filter)
@@ -44,9 +48,8 @@ def list():
         offset = (page - 1) * per_page
         folders = query.limit(per_page).offset(offset).all()
 
-        # Count files for each folder
-        for folder in folders:
-            folder.files_count = len(folder.files) if folder.files else 0
+        # Count files for page folders (bitta GROUP BY, files lazy-load qilinmaydi)
+        attach_counts(session, folders, File.folder_id, 'files_count')
 
         # Calculate pagination info
         total_pages = (total + per_page - 1) // per_page
@@ -54,15 +57,13 @@ def list():
         has_next = page < total_pages
 
     except Exception as e:
-        print(f"Folder list error: {e}")
+        logger.exception("Folder list error: %s", e)
         folders = []
         total = 0
         total_pages = 0
         has_prev = False
         has_next = False
         flash('Xatolik yuz berdi!', 'error')
-    finally:
-        session.close()
 
     return render_template(
         'folder/list.html',
@@ -83,7 +84,7 @@ def list():
 def create():
     """Create new folder"""
     if request.method == 'POST':
-        session = get_sync_session()
+        session = get_db()
 
         try:
             # Get form data
@@ -141,13 +142,9 @@ def create():
 
         except Exception as e:
             session.rollback()
-            print(f"Folder create error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Folder create error: %s", e)
             flash(f'Xatolik: {str(e)}', 'error')
             return redirect(url_for('folder.create'))
-        finally:
-            session.close()
 
     # GET request - show form
     return render_template('folder/create.html')
@@ -157,7 +154,7 @@ def create():
 @login_required
 def edit(id):
     """Edit folder"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         folder = session.query(Folder).get(id)
@@ -194,18 +191,16 @@ def edit(id):
 
     except Exception as e:
         session.rollback()
-        print(f"Folder edit error: {e}")
+        logger.exception("Folder edit error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
         return redirect(url_for('folder.list'))
-    finally:
-        session.close()
 
 
 @folder_bp.route('/<int:id>/delete', methods=['POST'])
 @login_required
 def delete(id):
     """Delete folder"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         folder = session.query(Folder).get(id)
@@ -215,7 +210,7 @@ def delete(id):
             return redirect(url_for('folder.list'))
 
         # Check if folder has files
-        if folder.files and len(folder.files) > 0:
+        if has_children(session, File.folder_id, id):
             flash('Bu papkada fayllar bor! Avval fayllarni o\'chiring.', 'warning')
             return redirect(url_for('folder.list'))
 
@@ -227,10 +222,8 @@ def delete(id):
 
     except Exception as e:
         session.rollback()
-        print(f"Folder delete error: {e}")
+        logger.exception("Folder delete error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
-    finally:
-        session.close()
 
     return redirect(url_for('folder.list'))
 
@@ -239,7 +232,7 @@ def delete(id):
 @login_required
 def view(id):
     """View folder details"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         folder = session.query(Folder).get(id)
@@ -258,8 +251,6 @@ def view(id):
         )
 
     except Exception as e:
-        print(f"Folder view error: {e}")
+        logger.exception("Folder view error: %s", e)
         flash('Xatolik yuz berdi!', 'error')
         return redirect(url_for('folder.list'))
-    finally:
-        session.close()
\ No newline at end of file
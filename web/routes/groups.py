@@ -2,76 +2,63 @@
 Groups Management Routes
 Telegram guruhlarini boshqarish (CRUD)
 """
+import logging
+
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 from flask_login import login_required
-from sqlalchemy import func
 
-from db import get_sync_session
+from web.database import get_db
+from web.services.search import text_filter
+from web.services.counts import count_by
+from web.services.pagination import paginate, empty_page
 from db.models import Group
 
 groups_bp = Blueprint('groups', __name__, url_prefix='/groups')
+logger = logging.getLogger(__name__)
 
 
 @groups_bp.route('/')
 @login_required
 def list_groups():
     """Guruhlar ro'yxati"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
-        # Pagination
-        page = request.args.get('page', 1, type=int)
         per_page = 20
 
         # Search
         search = request.args.get('search', '').strip()
 
         # Query
-        query = session.query(Group).order_by(Group.created_at.desc())
+        query = session.query(Group)
 
         if search:
-            query = query.filter(Group.title.ilike(f'%{search}%'))
-
-        # Total count
-        total = query.count()
+            query = query.filter(text_filter([Group.title], search))
 
-        # Paginate
-        offset = (page - 1) * per_page
-        groups = query.limit(per_page).offset(offset).all()
+        # Keyset pagination (created_at, id)
+        pagination = paginate(session, query, [(Group.created_at, True), (Group.id, True)], request.args, per_page)
+        groups = pagination.items
 
         # Stats
-        required_total = session.query(func.count(Group.id)).filter(
-            Group.is_required == True
-        ).scalar() or 0
-
-        optional_total = session.query(func.count(Group.id)).filter(
-            Group.is_required == False
-        ).scalar() or 0
-
-        # Pagination info
-        total_pages = (total + per_page - 1) // per_page
+        by_required = count_by(session, Group.is_required)
+        required_total = by_required.get(True, 0)
+        optional_total = by_required.get(False, 0)
 
     except Exception as e:
-        print(f"Groups list error: {e}")
+        logger.exception("Groups list error: %s", e)
         groups = []
-        total = 0
-        total_pages = 0
+        pagination = empty_page(per_page)
         required_total = 0
         optional_total = 0
         flash('Xatolik yuz berdi!', 'error')
-    finally:
-        session.close()
 
     return render_template(
         'groups/list.html',
         groups=groups,
-        page=page,
-        per_page=per_page,
-        total=total,
-        total_pages=total_pages,
         required_total=required_total,
         optional_total=optional_total,
-        search=search
+        search=search,
+        **pagination.template_args()
     )
 
 
@@ -80,7 +67,7 @@ def list_groups():
 def add_group():
     """Yangi guruh qo'shish"""
     if request.method == 'POST':
-        session = get_sync_session()
+        session = get_db()
 
         try:
             chat_id = request.form.get('chat_id', '').strip()
@@ -126,11 +113,9 @@ def add_group():
 
         except Exception as e:
             session.rollback()
-            print(f"Group add error: {e}")
+            logger.exception("Group add error: %s", e)
             flash(f'Xatolik: {str(e)}', 'error')
             return redirect(url_for('groups.add_group'))
-        finally:
-            session.close()
 
     return render_template('groups/form.html')
 
@@ -139,7 +124,7 @@ def add_group():
 @login_required
 def edit_group(group_id):
     """Guruhni tahrirlash"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         group = session.query(Group).get(group_id)
@@ -166,18 +151,16 @@ def edit_group(group_id):
 
     except Exception as e:
         session.rollback()
-        print(f"Group edit error: {e}")
+        logger.exception("Group edit error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
         return redirect(url_for('groups.list_groups'))
-    finally:
-        session.close()
 
 
 @groups_bp.route('/delete/<int:group_id>', methods=['POST'])
 @login_required
 def delete_group(group_id):
     """Guruhni o'chirish"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         group = session.query(Group).get(group_id)
@@ -195,10 +178,8 @@ def delete_group(group_id):
 
     except Exception as e:
         session.rollback()
-        print(f"Group delete error: {e}")
+        logger.exception("Group delete error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
-    finally:
-        session.close()
 
     return redirect(url_for('groups.list_groups'))
 
@@ -207,7 +188,7 @@ def delete_group(group_id):
 @login_required
 def toggle_required(group_id):
     """Majburiy/Ixtiyoriy o'zgartirish"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         group = session.query(Group).get(group_id)
@@ -226,9 +207,7 @@ def toggle_required(group_id):
 
     except Exception as e:
         session.rollback()
-        print(f"Group toggle error: {e}")
+        logger.exception("Group toggle error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
-    finally:
-        session.close()
 
     return redirect(url_for('groups.list_groups'))
\ No newline at end of file
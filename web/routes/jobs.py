@@ -0,0 +1,138 @@
+# web/routes/jobs.py
+"""
+Jobs Routes - fon vazifalari (holat, progress, bekor qilish)
+Vazifalarni worker.py bajaradi
+"""
+import logging
+import os
+
+from flask import Blueprint, render_template, request, redirect, url_for, flash, send_file
+from flask_login import login_required
+
+from web.database import get_db
+from web.services.pagination import paginate
+from db.jobs import HANDLERS, STATUS_NAMES, enqueue, request_cancel
+from db.models import Job
+import web.services.job_handlers  # noqa: F401 - HANDLERS ro'yxatini to'ldiradi
+
+jobs_bp = Blueprint('jobs', __name__, url_prefix='/jobs')
+logger = logging.getLogger(__name__)
+
+# Admin sahifasidan qo'lda ishga tushiriladigan vazifalar
+MANUAL_KINDS = ('rollup_backfill', 'db_maintenance')
+
+
+@jobs_bp.route('/')
+@login_required
+def list():
+    """Vazifalar ro'yxati"""
+    session = get_db()
+    per_page = request.args.get('per_page', 20, type=int)
+    status = request.args.get('status', '')
+    kind = request.args.get('kind', '')
+
+    query = session.query(Job)
+    if status:
+        query = query.filter(Job.status == status)
+    if kind:
+        query = query.filter(Job.kind == kind)
+
+    pagination = paginate(session, query, [(Job.created_at, True), (Job.id, True)], request.args, per_page)
+    jobs = pagination.items
+
+    return render_template(
+        'jobs/list.html',
+        jobs=jobs,
+        status=status,
+        kind=kind,
+        status_names=STATUS_NAMES,
+        kinds={key: name for key, (name, _) in HANDLERS.items()},
+        manual_kinds=MANUAL_KINDS,
+        has_running=any(not job.is_finished for job in jobs),
+        **pagination.template_args()
+    )
+
+
+@jobs_bp.route('/<int:id>')
+@login_required
+def view(id):
+    """Vazifa tafsilotlari (tugamaguncha sahifa o'zi yangilanadi)"""
+    session = get_db()
+    job = session.get(Job, id)
+
+    if not job:
+        flash('Vazifa topilmadi!', 'error')
+        return redirect(url_for('jobs.list'))
+
+    return render_template(
+        'jobs/view.html',
+        job=job,
+        status_names=STATUS_NAMES,
+        kind_name=HANDLERS.get(job.kind, (job.kind, None))[0]
+    )
+
+
+@jobs_bp.route('/<int:id>/cancel', methods=['POST'])
+@login_required
+def cancel(id):
+    """Vazifani bekor qilish"""
+    session = get_db()
+
+    try:
+        if request_cancel(session, id):
+            flash('Bekor qilish so\'rovi yuborildi', 'success')
+        else:
+            flash('Vazifa allaqachon tugagan', 'warning')
+    except Exception as e:
+        session.rollback()
+        logger.exception("Job cancel error: %s", e)
+        flash(f'Xatolik: {str(e)}', 'error')
+
+    return redirect(url_for('jobs.view', id=id))
+
+
+@jobs_bp.route('/<int:id>/download')
+@login_required
+def download(id):
+    """Eksport vazifasi natijasini yuklab olish"""
+    session = get_db()
+    job = session.get(Job, id)
+
+    path = (job.result or {}).get('path') if job and job.status == 'done' else None
+    if not path or not os.path.exists(path):
+        flash('Fayl topilmadi!', 'error')
+        return redirect(url_for('jobs.list'))
+
+    return send_file(os.path.abspath(path), as_attachment=True, download_name=job.result.get('filename'))
+
+
+@jobs_bp.route('/run/<kind>', methods=['POST'])
+@login_required
+def run(kind):
+    """Qo'lda vazifa qo'shish (rollup backfill, baza xizmati)"""
+    if kind not in MANUAL_KINDS:
+        flash('Bunday vazifa yo\'q!', 'error')
+        return redirect(url_for('jobs.list'))
+
+    session = get_db()
+
+    if kind == 'rollup_backfill':
+        params = {
+            'start_day': request.form.get('start_day') or None,
+            'end_day': request.form.get('end_day') or None,
+        }
+    else:
+        params = {
+            'tables': request.form.getlist('tables'),
+            'reindex': request.form.get('reindex') == '1',
+        }
+
+    try:
+        job = enqueue(session, kind, params)
+        flash(f'Vazifa #{job.id} navbatga qo\'shildi', 'success')
+        return redirect(url_for('jobs.view', id=job.id))
+    except Exception as e:
+        session.rollback()
+        logger.exception("Job enqueue error: %s", e)
+        flash(f'Xatolik: {str(e)}', 'error')
+        return redirect(url_for('jobs.list'))
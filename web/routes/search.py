@@ -0,0 +1,48 @@
+# web/routes/search.py
+"""
+Global Search - barcha bo'limlar bo'yicha qidiruv
+"""
+import logging
+
+from flask import Blueprint, render_template, request, flash
+from flask_login import login_required
+
+from web.database import get_db
+from web.services.search import global_search
+
+search_bp = Blueprint('search', __name__, url_prefix='/search')
+logger = logging.getLogger(__name__)
+
+# Natija turi -> (endpoint, id parametri, nomi, ikonka)
+RESULT_LINKS = {
+    'test': ('test.view', 'id', 'Test', 'fa-question-circle'),
+    'user': ('users.view_user', 'user_id', 'Foydalanuvchi', 'fa-user'),
+    'folder': ('folder.view', 'id', 'Papka', 'fa-folder'),
+    'file': ('file.view', 'id', 'Fayl', 'fa-file'),
+    'video': ('video.view', 'id', 'Video', 'fa-video'),
+    'conspect': ('conspect.view', 'id', 'Konspekt', 'fa-book'),
+    'accident': ('accident.view', 'id', 'Baxtsiz hodisa', 'fa-exclamation-triangle'),
+    'group': ('groups.edit_group', 'group_id', 'Guruh', 'fa-users'),
+}
+
+
+@search_bp.route('/')
+@login_required
+def index():
+    """Global qidiruv natijalari"""
+    session = get_db()
+    query = request.args.get('q', '').strip()
+
+    try:
+        results = global_search(session, query)
+    except Exception as e:
+        logger.exception("Global search error: %s", e)
+        results = []
+        flash('Xatolik yuz berdi!', 'error')
+
+    return render_template(
+        'search/results.html',
+        query=query,
+        results=results,
+        links=RESULT_LINKS
+    )
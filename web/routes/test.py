@@ -2,14 +2,25 @@
 """
 Test Routes - Categories, Tests (Questions) and Answers CRUD
 """
-from flask import Blueprint, render_template, redirect, url_for, request, flash
+import logging
+import uuid
+
+from flask import Blueprint, render_template, redirect, url_for, request, flash, Response
 from flask_login import login_required
-from db import get_sync_session
+from web.database import get_db
+from web.services.search import text_filter
+from web.services.pagination import paginate, empty_page
+from web.services.counts import attach_counts, count_for
+from web.services.test_import import sample_csv
+from web.services.job_handlers import files_dir
+from db.jobs import enqueue
 from db.models import TestCategory, Test, TestAnswer, test_category_association
-from sqlalchemy import func
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import selectinload
 
 test_bp = Blueprint('test', __name__, url_prefix='/test')
+logger = logging.getLogger(__name__)
+
+IMPORT_EXTENSIONS = ('csv', 'xlsx', 'json', 'jsonl')
 
 
 # ==================== CATEGORIES ====================
@@ -18,7 +29,7 @@ test_bp = Blueprint('test', __name__, url_prefix='/test')
 @login_required
 def categories():
     """List all test categories"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         categories_list = session.query(TestCategory).order_by(
@@ -26,18 +37,13 @@ def categories():
             TestCategory.name.asc()
         ).all()
 
-        # Count tests for each category
-        for category in categories_list:
-            category.tests_count = session.query(func.count(test_category_association.c.test_id)).filter(
-                test_category_association.c.category_id == category.id
-            ).scalar() or 0
+        # Count tests for all categories (bitta GROUP BY)
+        attach_counts(session, categories_list, test_category_association.c.category_id, 'tests_count')
 
     except Exception as e:
-        print(f"Categories list error: {e}")
+        logger.exception("Categories list error: %s", e)
         categories_list = []
         flash('Xatolik yuz berdi!', 'error')
-    finally:
-        session.close()
 
     return render_template('test/categories.html', categories=categories_list)
 
@@ -47,7 +53,7 @@ def categories():
 def categories_create():
     """Create new category"""
     if request.method == 'POST':
-        session = get_sync_session()
+        session = get_db()
 
         try:
             name = request.form.get('name', '').strip()
@@ -74,11 +80,9 @@ def categories_create():
 
         except Exception as e:
             session.rollback()
-            print(f"Category create error: {e}")
+            logger.exception("Category create error: %s", e)
             flash(f'Xatolik: {str(e)}', 'error')
             return redirect(url_for('test.categories_create'))
-        finally:
-            session.close()
 
     return render_template('test/categories_create.html')
 
@@ -87,7 +91,7 @@ def categories_create():
 @login_required
 def categories_edit(id):
     """Edit category"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         category = session.query(TestCategory).get(id)
@@ -119,18 +123,16 @@ def categories_edit(id):
 
     except Exception as e:
         session.rollback()
-        print(f"Category edit error: {e}")
+        logger.exception("Category edit error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
         return redirect(url_for('test.categories'))
-    finally:
-        session.close()
 
 
 @test_bp.route('/categories/<int:id>/delete', methods=['POST'])
 @login_required
 def categories_delete(id):
     """Delete category"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         category = session.query(TestCategory).get(id)
@@ -140,9 +142,7 @@ def categories_delete(id):
             return redirect(url_for('test.categories'))
 
         # Check if category has tests
-        tests_count = session.query(func.count(test_category_association.c.test_id)).filter(
-            test_category_association.c.category_id == id
-        ).scalar()
+        tests_count = count_for(session, test_category_association.c.category_id, id)
 
         if tests_count > 0:
             flash(f'Bu kategoriyada {tests_count} ta test bor!', 'warning')
@@ -156,10 +156,8 @@ def categories_delete(id):
 
     except Exception as e:
         session.rollback()
-        print(f"Category delete error: {e}")
+        logger.exception("Category delete error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
-    finally:
-        session.close()
 
     return redirect(url_for('test.categories'))
 
@@ -171,43 +169,36 @@ def categories_delete(id):
 @login_required
 def list():
     """List all tests with pagination"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         # Get parameters
-        page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 20, type=int)
         section_filter = request.args.get('section', '').strip()
         category_filter = request.args.get('category', '', type=int)
         search = request.args.get('search', '').strip()
 
-        # Query with eager loading
+        # Collection'lar alohida IN so'rovi bilan (LIMIT'li JOIN qatorlarni ko'paytirmaydi)
         query = session.query(Test).options(
-            joinedload(Test.categories),
-            joinedload(Test.answers)
+            selectinload(Test.categories),
+            selectinload(Test.answers)
         )
 
         if search:
-            query = query.filter(Test.text.ilike(f'%{search}%'))
-
-        if section_filter or category_filter:
-            query = query.join(Test.categories)
-
-            if section_filter:
-                query = query.filter(TestCategory.section == section_filter)
+            query = query.filter(text_filter([Test.text], search))
 
-            if category_filter:
-                query = query.filter(TestCategory.id == category_filter)
+        # EXISTS - bir nechta kategoriyadagi test takrorlanmaydi
+        if section_filter:
+            query = query.filter(Test.categories.any(TestCategory.section == section_filter))
 
-        # Order by
-        query = query.order_by(Test.created_at.desc())
+        if category_filter:
+            query = query.filter(Test.categories.any(TestCategory.id == category_filter))
 
-        # Total count
-        total = query.count()
-
-        # Pagination
-        offset = (page - 1) * per_page
-        tests = query.limit(per_page).offset(offset).all()
+        # Keyset pagination (created_at, id) + taxminiy jami
+        pagination = paginate(
+            session, query, [(Test.created_at, True), (Test.id, True)], request.args, per_page
+        )
+        tests = pagination.items
 
         # Get categories for filters
         categories_list = session.query(TestCategory).order_by(
@@ -215,24 +206,12 @@ def list():
             TestCategory.name.asc()
         ).all()
 
-        # Calculate pagination info
-        total_pages = (total + per_page - 1) // per_page
-        has_prev = page > 1
-        has_next = page < total_pages
-
     except Exception as e:
-        print(f"Tests list error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Tests list error: %s", e)
         tests = []
         categories_list = []
-        total = 0
-        total_pages = 0
-        has_prev = False
-        has_next = False
+        pagination = empty_page(per_page)
         flash('Xatolik yuz berdi!', 'error')
-    finally:
-        session.close()
 
     return render_template(
         'test/list.html',
@@ -241,12 +220,7 @@ def list():
         search=search,
         section_filter=section_filter,
         category_filter=category_filter,
-        page=page,
-        per_page=per_page,
-        total=total,
-        total_pages=total_pages,
-        has_prev=has_prev,
-        has_next=has_next
+        **pagination.template_args()
     )
 
 
@@ -254,7 +228,7 @@ def list():
 @login_required
 def create():
     """Create new test with answers"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         if request.method == 'POST':
@@ -342,13 +316,57 @@ def create():
 
     except Exception as e:
         session.rollback()
-        print(f"Test create error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Test create error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
         return redirect(url_for('test.create'))
-    finally:
-        session.close()
+
+
+# ==================== BULK IMPORT ====================
+
+@test_bp.route('/import', methods=['GET', 'POST'])
+@login_required
+def import_file():
+    """Bulk import tests from CSV / XLSX / JSON (fon vazifasi sifatida)"""
+    if request.method == 'POST':
+        session = get_db()
+        upload = request.files.get('file')
+
+        if not upload or not upload.filename:
+            flash('Fayl tanlanmagan!', 'error')
+            return redirect(url_for('test.import_file'))
+
+        extension = upload.filename.rsplit('.', 1)[-1].lower() if '.' in upload.filename else ''
+        if extension not in IMPORT_EXTENSIONS:
+            flash('Faqat .csv, .xlsx, .json yoki .jsonl fayllar qabul qilinadi', 'error')
+            return redirect(url_for('test.import_file'))
+
+        try:
+            # Worker o'qishi uchun umumiy papkaga saqlanadi
+            path = files_dir('imports') / f"{uuid.uuid4().hex}.{extension}"
+            upload.save(path)
+
+            job = enqueue(session, 'test_import', {'path': str(path), 'filename': upload.filename})
+            flash(f'Import navbatga qo\'shildi (vazifa #{job.id})', 'success')
+            return redirect(url_for('jobs.view', id=job.id))
+
+        except Exception as e:
+            session.rollback()
+            logger.exception("Test import error: %s", e)
+            flash(f'Xatolik: {str(e)}', 'error')
+            return redirect(url_for('test.import_file'))
+
+    return render_template('test/import.html')
+
+
+@test_bp.route('/import/sample.csv')
+@login_required
+def import_sample():
+    """Sample CSV for bulk import"""
+    return Response(
+        sample_csv(),
+        mimetype='text/csv',
+        headers={'Content-Disposition': 'attachment; filename=tests_sample.csv'}
+    )
 
 
 # EDIT funksiyasi ham xuddi shunday yangilanadi (370-qator atrofida)
@@ -356,12 +374,12 @@ def create():
 @login_required
 def edit(id):
     """Edit test with answers"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         test = session.query(Test).options(
-            joinedload(Test.categories),
-            joinedload(Test.answers)
+            selectinload(Test.categories),
+            selectinload(Test.answers)
         ).get(id)
 
         if not test:
@@ -464,20 +482,16 @@ def edit(id):
 
     except Exception as e:
         session.rollback()
-        print(f"Test edit error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Test edit error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
         return redirect(url_for('test.list'))
-    finally:
-        session.close()
 
 
 @test_bp.route('/<int:id>/delete', methods=['POST'])
 @login_required
 def delete(id):
     """Delete test"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         test = session.query(Test).get(id)
@@ -493,10 +507,8 @@ def delete(id):
 
     except Exception as e:
         session.rollback()
-        print(f"Test delete error: {e}")
+        logger.exception("Test delete error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
-    finally:
-        session.close()
 
     return redirect(url_for('test.list'))
 
@@ -505,12 +517,12 @@ def delete(id):
 @login_required
 def view(id):
     """View test details"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         test = session.query(Test).options(
-            joinedload(Test.categories),
-            joinedload(Test.answers)
+            selectinload(Test.categories),
+            selectinload(Test.answers)
         ).get(id)
 
         if not test:
@@ -523,8 +535,6 @@ def view(id):
         return render_template('test/view.html', test=test, answers=answers)
 
     except Exception as e:
-        print(f"Test view error: {e}")
+        logger.exception("Test view error: %s", e)
         flash('Xatolik yuz berdi!', 'error')
         return redirect(url_for('test.list'))
-    finally:
-        session.close()
\ No newline at end of file
@@ -7,7 +7,10 @@ from flask_login import login_required
 from sqlalchemy import func
 from datetime import datetime, timedelta
 
-from db import get_sync_session
+from web.database import get_db
+from web.services.search import text_filter
+from web.services.counts import count_by
+from web.services.pagination import paginate
 from db.models import User, UserActivity
 
 users_bp = Blueprint('users', __name__, url_prefix='/users')
@@ -17,120 +20,121 @@ users_bp = Blueprint('users', __name__, url_prefix='/users')
 @login_required
 def list_users():
     """User ro'yxati"""
-    with get_sync_session() as session:
-        # Pagination
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)  # ← DEFAULT 20
-
-        # Filter
-        search = request.args.get('search', '')
-        language = request.args.get('language', '')
-        is_active = request.args.get('is_active', '')
-
-        # Query
-        query = session.query(User)
-
-        if search:
-            query = query.filter(
-                (User.full_name.ilike(f'%{search}%')) |
-                (User.phone_number.ilike(f'%{search}%')) |
-                (User.username.ilike(f'%{search}%'))
-            )
-
-        if language:
-            query = query.filter(User.language_code == language)
-
-        if is_active:
-            query = query.filter(User.is_active == (is_active == 'true'))
-
-        # Total
-        total = query.count()
-
-        # Paginate
-        users = query.order_by(User.created_at.desc()).offset((page - 1) * per_page).limit(per_page).all()
-
-        # Statistics
-        stats = {
-            'total': session.query(User).count(),
-            'active': session.query(User).filter(User.is_active == True).count(),
-            'uz': session.query(User).filter(User.language_code == 'uz').count(),
-            'ru': session.query(User).filter(User.language_code == 'ru').count(),
-            'kk': session.query(User).filter(User.language_code == 'kk').count(),
-            'today': session.query(User).filter(
-                User.created_at >= datetime.now().replace(hour=0, minute=0, second=0)
-            ).count(),
-        }
-
-        return render_template(
-            'users/list.html',
-            users=users,
-            stats=stats,
-            page=page,
-            per_page=per_page,
-            total=total,
-            search=search,
-            language=language,
-            is_active=is_active
+    session = get_db()
+
+    # Pagination
+    per_page = request.args.get('per_page', 20, type=int)  # ← DEFAULT 20
+
+    # Filter
+    search = request.args.get('search', '')
+    language = request.args.get('language', '')
+    is_active = request.args.get('is_active', '')
+
+    # Query
+    query = session.query(User)
+
+    if search:
+        query = query.filter(
+            text_filter([User.full_name, User.phone_number, User.username], search)
         )
 
+    if language:
+        query = query.filter(User.language_code == language)
+
+    if is_active:
+        query = query.filter(User.is_active == (is_active == 'true'))
+
+    # Keyset pagination (created_at, id) + taxminiy jami
+    pagination = paginate(session, query, [(User.created_at, True), (User.id, True)], request.args, per_page)
+    users = pagination.items
+
+    # Statistics
+    by_language = count_by(session, User.language_code)
+    total_users, active_users, today_users = session.query(
+        func.count(User.id),
+        func.count(User.id).filter(User.is_active == True),
+        func.count(User.id).filter(
+            User.created_at >= datetime.now().replace(hour=0, minute=0, second=0)
+        ),
+    ).one()
+
+    stats = {
+        'total': total_users,
+        'active': active_users,
+        'uz': by_language.get('uz', 0),
+        'ru': by_language.get('ru', 0),
+        'kk': by_language.get('kk', 0),
+        'today': today_users,
+    }
+
+    return render_template(
+        'users/list.html',
+        users=users,
+        stats=stats,
+        search=search,
+        language=language,
+        is_active=is_active,
+        **pagination.template_args()
+    )
+
 
 @users_bp.route('/toggle_active/<int:user_id>', methods=['POST'])
 @login_required
 def toggle_active(user_id):
     """User active/inactive almashtirish"""
-    with get_sync_session() as session:
-        user = session.query(User).filter(User.id == user_id).first()
+    session = get_db()
+
+    user = session.query(User).filter(User.id == user_id).first()
 
-        if not user:
-            flash('Foydalanuvchi topilmadi!', 'error')
-            return redirect(url_for('users.list_users'))
+    if not user:
+        flash('Foydalanuvchi topilmadi!', 'error')
+        return redirect(url_for('users.list_users'))
 
-        # Toggle
-        user.is_active = not user.is_active
-        session.commit()
+    # Toggle
+    user.is_active = not user.is_active
+    session.commit()
 
-        status = 'blokdan chiqarildi' if user.is_active else 'bloklandi'
-        flash(f'{user.full_name} {status}!', 'success')
+    status = 'blokdan chiqarildi' if user.is_active else 'bloklandi'
+    flash(f'{user.full_name} {status}!', 'success')
 
-        return redirect(url_for('users.list_users'))
+    return redirect(url_for('users.list_users'))
 
 
 @users_bp.route('/view/<int:user_id>')
 @login_required
 def view_user(user_id):
     """User tafsilotlari"""
-    with get_sync_session() as session:
-        user = session.query(User).filter(User.id == user_id).first()
-
-        if not user:
-            flash('Foydalanuvchi topilmadi!', 'error')
-            return redirect(url_for('users.list_users'))
-
-        # Activity
-        activities = session.query(UserActivity).filter(
-            UserActivity.user_id == user_id
-        ).order_by(UserActivity.created_at.desc()).limit(50).all()
-
-        # Statistics
-        activity_stats = {
-            'total': session.query(UserActivity).filter(UserActivity.user_id == user_id).count(),
-            'tests': session.query(UserActivity).filter(
-                UserActivity.user_id == user_id,
-                UserActivity.activity_type == 'test_start'
-            ).count(),
-            'conspects': session.query(UserActivity).filter(
-                UserActivity.user_id == user_id,
-                UserActivity.activity_type == 'conspect_view'
-            ).count(),
-            'videos': session.query(UserActivity).filter(
-                UserActivity.user_id == user_id,
-                UserActivity.activity_type == 'video_view'
-            ).count(),
-        }
-
-        return render_template(
-            'users/view.html',
-            user=user,
-            activities=activities,
-            activity_stats=activity_stats
-        )
\ No newline at end of file
+    session = get_db()
+
+    user = session.query(User).filter(User.id == user_id).first()
+
+    if not user:
+        flash('Foydalanuvchi topilmadi!', 'error')
+        return redirect(url_for('users.list_users'))
+
+    # Activity
+    activities = session.query(UserActivity).filter(
+        UserActivity.user_id == user_id
+    ).order_by(UserActivity.created_at.desc()).limit(50).all()
+
+    # Statistics - bitta so'rovda (FILTER)
+    row = session.query(
+        func.count(UserActivity.id),
+        func.count(UserActivity.id).filter(UserActivity.activity_type == 'test_start'),
+        func.count(UserActivity.id).filter(UserActivity.activity_type == 'conspect_view'),
+        func.count(UserActivity.id).filter(UserActivity.activity_type == 'video_view'),
+    ).filter(UserActivity.user_id == user_id).one()
+
+    activity_stats = {
+        'total': row[0],
+        'tests': row[1],
+        'conspects': row[2],
+        'videos': row[3],
+    }
+
+    return render_template(
+        'users/view.html',
+        user=user,
+        activities=activities,
+        activity_stats=activity_stats
+    )
\ No newline at end of file
@@ -2,14 +2,19 @@
 """
 Video Routes - Categories and Videos CRUD
 """
+import logging
+
 from flask import Blueprint, render_template, redirect, url_for, request, flash
 from flask_login import login_required
-from db import get_sync_session
+from web.database import get_db
+from web.services.search import text_filter
+from web.services.pagination import paginate, empty_page
+from web.services.counts import attach_counts, count_for
 from db.models import VideoCategory, Video
-from sqlalchemy import func
 from sqlalchemy.orm import joinedload
 
 video_bp = Blueprint('video', __name__, url_prefix='/video')
+logger = logging.getLogger(__name__)
 
 
 # ==================== CATEGORIES ====================
@@ -18,7 +23,7 @@ video_bp = Blueprint('video', __name__, url_prefix='/video')
 @login_required
 def categories():
     """List all video categories"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         categories_list = session.query(VideoCategory).order_by(
@@ -26,18 +31,13 @@ def categories():
             VideoCategory.name.asc()
         ).all()
 
-        # Count videos for each category
-        for category in categories_list:
-            category.videos_count = session.query(func.count(Video.id)).filter(
-                Video.category_id == category.id
-            ).scalar() or 0
+        # Count videos for all categories (bitta GROUP BY)
+        attach_counts(session, categories_list, Video.category_id, 'videos_count')
 
     except Exception as e:
-        print(f"Categories list error: {e}")
+        logger.exception("Categories list error: %s", e)
         categories_list = []
         flash('Xatolik yuz berdi!', 'error')
-    finally:
-        session.close()
 
     return render_template('video/categories.html', categories=categories_list)
 
@@ -47,7 +47,7 @@ def categories():
 def categories_create():
     """Create new category"""
     if request.method == 'POST':
-        session = get_sync_session()
+        session = get_db()
 
         try:
             name = request.form.get('name', '').strip()
@@ -74,11 +74,9 @@ def categories_create():
 
         except Exception as e:
             session.rollback()
-            print(f"Category create error: {e}")
+            logger.exception("Category create error: %s", e)
             flash(f'Xatolik: {str(e)}', 'error')
             return redirect(url_for('video.categories_create'))
-        finally:
-            session.close()
 
     return render_template('video/categories_create.html')
 
@@ -87,7 +85,7 @@ def categories_create():
 @login_required
 def categories_edit(id):
     """Edit category"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         category = session.query(VideoCategory).get(id)
@@ -119,18 +117,16 @@ def categories_edit(id):
 
     except Exception as e:
         session.rollback()
-        print(f"Category edit error: {e}")
+        logger.exception("Category edit error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
         return redirect(url_for('video.categories'))
-    finally:
-        session.close()
 
 
 @video_bp.route('/categories/<int:id>/delete', methods=['POST'])
 @login_required
 def categories_delete(id):
     """Delete category"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         category = session.query(VideoCategory).get(id)
@@ -140,9 +136,7 @@ def categories_delete(id):
             return redirect(url_for('video.categories'))
 
         # Check if category has videos
-        videos_count = session.query(func.count(Video.id)).filter(
-            Video.category_id == id
-        ).scalar()
+        videos_count = count_for(session, Video.category_id, id)
 
         if videos_count > 0:
             flash(f'Bu kategoriyada {videos_count} ta video bor!', 'warning')
@@ -156,10 +150,8 @@ def categories_delete(id):
 
     except Exception as e:
         session.rollback()
-        print(f"Category delete error: {e}")
+        logger.exception("Category delete error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
-    finally:
-        session.close()
 
     return redirect(url_for('video.categories'))
 
@@ -171,11 +163,10 @@ def categories_delete(id):
 @login_required
 def list():
     """List all videos with pagination"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         # Get parameters
-        page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 20, type=int)
         section_filter = request.args.get('section', '').strip()
         category_filter = request.args.get('category', '', type=int)
@@ -188,8 +179,7 @@ def list():
 
         if search:
             query = query.filter(
-                (Video.name.ilike(f'%{search}%')) |
-                (Video.description.ilike(f'%{search}%'))
+                text_filter([Video.name, Video.description], search)
             )
 
         if section_filter:
@@ -200,15 +190,11 @@ def list():
         if category_filter:
             query = query.filter(Video.category_id == category_filter)
 
-        # Order by
-        query = query.order_by(Video.created_at.desc())
-
-        # Total count
-        total = query.count()
-
-        # Pagination
-        offset = (page - 1) * per_page
-        videos = query.limit(per_page).offset(offset).all()
+        # Keyset pagination (created_at, id) + taxminiy jami
+        pagination = paginate(
+            session, query, [(Video.created_at, True), (Video.id, True)], request.args, per_page
+        )
+        videos = pagination.items
 
         # Get categories for filters
         categories_list = session.query(VideoCategory).order_by(
@@ -216,24 +202,12 @@ def list():
             VideoCategory.name.asc()
         ).all()
 
-        # Calculate pagination info
-        total_pages = (total + per_page - 1) // per_page
-        has_prev = page > 1
-        has_next = page < total_pages
-
     except Exception as e:
-        print(f"Videos list error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Videos list error: %s", e)
         videos = []
         categories_list = []
-        total = 0
-        total_pages = 0
-        has_prev = False
-        has_next = False
+        pagination = empty_page(per_page)
         flash('Xatolik yuz berdi!', 'error')
-    finally:
-        session.close()
 
     return render_template(
         'video/list.html',
@@ -242,12 +216,7 @@ def list():
         search=search,
         section_filter=section_filter,
         category_filter=category_filter,
-        page=page,
-        per_page=per_page,
-        total=total,
-        total_pages=total_pages,
-        has_prev=has_prev,
-        has_next=has_next
+        **pagination.template_args()
     )
 
 
@@ -255,7 +224,7 @@ def list():
 @login_required
 def create():
     """Create new video"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         if request.method == 'POST':
@@ -312,20 +281,16 @@ def create():
 
     except Exception as e:
         session.rollback()
-        print(f"Video create error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Video create error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
         return redirect(url_for('video.create'))
-    finally:
-        session.close()
 
 
 @video_bp.route('/<int:id>/edit', methods=['GET', 'POST'])
 @login_required
 def edit(id):
     """Edit video"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         video = session.query(Video).options(
@@ -405,20 +370,16 @@ def edit(id):
 
     except Exception as e:
         session.rollback()
-        print(f"Video edit error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Video edit error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
         return redirect(url_for('video.list'))
-    finally:
-        session.close()
 
 
 @video_bp.route('/<int:id>/delete', methods=['POST'])
 @login_required
 def delete(id):
     """Delete video"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         video = session.query(Video).get(id)
@@ -434,10 +395,8 @@ def delete(id):
 
     except Exception as e:
         session.rollback()
-        print(f"Video delete error: {e}")
+        logger.exception("Video delete error: %s", e)
         flash(f'Xatolik: {str(e)}', 'error')
-    finally:
-        session.close()
 
     return redirect(url_for('video.list'))
 
@@ -446,7 +405,7 @@ def delete(id):
 @login_required
 def view(id):
     """View video details"""
-    session = get_sync_session()
+    session = get_db()
 
     try:
         video = session.query(Video).options(
@@ -460,8 +419,6 @@ def view(id):
         return render_template('video/view.html', video=video)
 
     except Exception as e:
-        print(f"Video view error: {e}")
+        logger.exception("Video view error: %s", e)
         flash('Xatolik yuz berdi!', 'error')
         return redirect(url_for('video.list'))
-    finally:
-        session.close()
\ No newline at end of file
@@ -0,0 +1,3 @@
+"""
+Services package - admin panel uchun umumiy biznes-logika
+"""
@@ -0,0 +1,49 @@
+# web/services/counts.py
+"""
+Bola yozuvlar sonini bitta GROUP BY bilan hisoblash
+List sahifalarida har bir qator uchun alohida count() (N+1) o'rniga
+"""
+from sqlalchemy import func, select
+
+
+def count_by(session, fk_column, parent_ids=None) -> dict[int, int]:
+    """
+    fk_column bo'yicha guruhlangan sonlar - {parent_id: count}
+
+    Args:
+        fk_column: masalan Video.category_id yoki test_category_association.c.category_id
+        parent_ids: faqat shu parent'lar uchun (None - hammasi)
+    """
+    query = select(fk_column, func.count()).group_by(fk_column)
+
+    if parent_ids is not None:
+        parent_ids = [pid for pid in parent_ids if pid is not None]
+        if not parent_ids:
+            return {}
+        query = query.where(fk_column.in_(parent_ids))
+
+    return dict(session.execute(query).all())
+
+
+def attach_counts(session, items, fk_column, attr: str):
+    """
+    Har bir obyektga son atributini qo'shish (masalan category.videos_count)
+
+    Bitta so'rov: SELECT fk, count(*) ... WHERE fk IN (...) GROUP BY fk
+    """
+    counts = count_by(session, fk_column, [item.id for item in items])
+    for item in items:
+        setattr(item, attr, counts.get(item.id, 0))
+    return items
+
+
+def count_for(session, fk_column, parent_id) -> int:
+    """Bitta parent uchun son (o'chirishdan oldin tekshirish)"""
+    return count_by(session, fk_column, [parent_id]).get(parent_id, 0)
+
+
+def has_children(session, fk_column, parent_id) -> bool:
+    """Kamida bitta bola yozuv bormi? (EXISTS - hammasini sanamaydi)"""
+    return session.execute(
+        select(select(fk_column).where(fk_column == parent_id).exists())
+    ).scalar()
@@ -0,0 +1,377 @@
+# web/services/dashboard_stats.py
+"""
+Dashboard Statistics Service
+Barcha hisoblagichlar bir nechta guruhlangan so'rovda hisoblanadi
+(FILTER (WHERE ...) + sargable sana oraliqlari) va snapshot sifatida
+keshlanadi (stale-while-revalidate). Faollik grafiklari activity_daily
+rollup'idan o'qiladi.
+"""
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, func, distinct, true
+
+from db import get_sync_session
+from db.rollup import refresh_activity_rollup, activity_breakdown, daily_unique_users
+from db.models import (
+    Folder, File, Accident, User,
+    ConspectCategory, Conspect,
+    VideoCategory, Video,
+    TestCategory, Test,
+    AccidentYear, AccidentCategory, test_category_association,
+    UserActivity
+)
+from web.config import FlaskConfig
+
+logger = logging.getLogger(__name__)
+
+# ==================== CONSTANTS ====================
+ACTIVITY_NAMES = {
+    'test_start': 'Test Boshlash',
+    'conspect_view': 'Konspekt Ko\'rish',
+    'video_view': 'Video Ko\'rish',
+    'folder_open': 'Papka Ochish',
+    'accident_view': 'Hodisa Ko\'rish'
+}
+
+# Tartib: test, conspect, video, folder, accident
+ORDERED_ACTIVITY_TYPES = ['test_start', 'conspect_view', 'video_view', 'folder_open', 'accident_view']
+
+FOLDER_NAMES = {
+    'nizomlar': 'Nizomlar',
+    'himoya_vositalari': 'Himoya Vositalari',
+    'oquv_texnik': 'O\'quv Texnik Mashg\'ulot',
+    'kranlar': 'Kranlar',
+    'qozonxonalar': 'Qozonxonalar',
+    'bosim_idishlari': 'Bosim Ostidagi Sig\'im',
+    'toliq_texnik': 'To\'liq Texnik Ko\'rik'
+}
+
+SECTION_LABELS = {
+    'MM': 'MM (Mehnat Muhofazasi)',
+    'SX': 'SX (Sanoat Xavfsizligi)'
+}
+
+
+# ==================== DATE RANGES ====================
+
+def month_range(today: datetime) -> tuple[datetime, datetime]:
+    """Joriy oy oralig'i [1-sana, keyingi oy 1-sanasi)"""
+    start = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    if start.month == 12:
+        end = start.replace(year=start.year + 1, month=1)
+    else:
+        end = start.replace(month=start.month + 1)
+    return start, end
+
+
+def last_days_start(today: datetime, days: int = 7) -> datetime:
+    """Oxirgi N kunning birinchi kuni (00:00)"""
+    day_start = today.replace(hour=0, minute=0, second=0, microsecond=0)
+    return day_start - timedelta(days=days - 1)
+
+
+# ==================== QUERIES ====================
+
+def _section_counts(count_column, section_column):
+    """Jami, MM va SX sonlari - bitta aggregate"""
+    return (
+        func.count(count_column),
+        func.count(count_column).filter(section_column == 'MM'),
+        func.count(count_column).filter(section_column == 'SX'),
+    )
+
+
+def query_totals(session) -> dict:
+    """Barcha entity hisoblagichlari - bitta so'rov"""
+    folders = select(*[
+        c.label(n) for c, n in zip(_section_counts(Folder.id, Folder.section), ('total', 'mm', 'sx'))
+    ]).subquery()
+
+    conspects = select(*[
+        c.label(n) for c, n in zip(
+            _section_counts(Conspect.id, ConspectCategory.section), ('total', 'mm', 'sx')
+        )
+    ]).select_from(Conspect).join(ConspectCategory, isouter=True).subquery()
+
+    videos = select(*[
+        c.label(n) for c, n in zip(
+            _section_counts(Video.id, VideoCategory.section), ('total', 'mm', 'sx')
+        )
+    ]).select_from(Video).join(VideoCategory, isouter=True).subquery()
+
+    tests = select(
+        func.count(distinct(test_category_association.c.test_id))
+        .filter(TestCategory.section == 'MM').label('mm'),
+        func.count(distinct(test_category_association.c.test_id))
+        .filter(TestCategory.section == 'SX').label('sx'),
+    ).select_from(test_category_association).join(
+        TestCategory, TestCategory.id == test_category_association.c.category_id
+    ).subquery()
+
+    def total(model):
+        return select(func.count(model.id)).scalar_subquery()
+
+    stmt = select(
+        folders.c.total.label('folder_count'),
+        folders.c.mm.label('mm_folders'),
+        folders.c.sx.label('sx_folders'),
+        conspects.c.total.label('conspect_count'),
+        conspects.c.mm.label('mm_conspects'),
+        conspects.c.sx.label('sx_conspects'),
+        videos.c.total.label('video_count'),
+        videos.c.mm.label('mm_videos'),
+        videos.c.sx.label('sx_videos'),
+        tests.c.mm.label('mm_tests'),
+        tests.c.sx.label('sx_tests'),
+        total(File).label('file_count'),
+        total(Accident).label('accident_count'),
+        total(User).label('user_count'),
+        total(AccidentYear).label('accident_years_count'),
+        total(AccidentCategory).label('accident_categories_count'),
+        total(ConspectCategory).label('conspect_categories_count'),
+        total(VideoCategory).label('video_categories_count'),
+        total(TestCategory).label('test_categories_count'),
+        total(Test).label('test_count'),
+    ).select_from(
+        folders.join(conspects, true()).join(videos, true()).join(tests, true())
+    )
+
+    row = session.execute(stmt).mappings().one()
+    return {key: value or 0 for key, value in row.items()}
+
+
+def query_monthly_unique_by_section(session, start: datetime, end: datetime) -> dict:
+    """
+    Oylik unique foydalanuvchilar - bo'limlar bo'yicha
+
+    Kunlik unique'larni qo'shib bo'lmaydi, shuning uchun xom jadvaldan (faqat joriy oy)
+    """
+    rows = session.execute(
+        select(
+            UserActivity.section,
+            func.count(distinct(UserActivity.user_id))
+        ).where(
+            UserActivity.section.isnot(None),
+            UserActivity.created_at >= start,
+            UserActivity.created_at < end
+        ).group_by(UserActivity.section)
+    ).all()
+    return dict(rows)
+
+
+def query_accidents_by_year(session) -> list:
+    """Baxtsiz hodisalar yillar bo'yicha"""
+    return session.execute(
+        select(AccidentYear.name, func.count(Accident.id))
+        .join(Accident)
+        .group_by(AccidentYear.id, AccidentYear.name)
+        .order_by(AccidentYear.name)
+    ).all()
+
+
+# ==================== SNAPSHOT ====================
+
+def _section_series(counts: dict) -> tuple[list, list]:
+    """MM/SX grafik ma'lumotlari"""
+    if not counts:
+        return [SECTION_LABELS['MM'], SECTION_LABELS['SX']], [0, 0]
+
+    labels, values = [], []
+    for section in ('MM', 'SX'):
+        if section in counts:
+            labels.append(SECTION_LABELS[section])
+            values.append(counts[section])
+    return labels, values
+
+
+def build_snapshot(
+        totals: dict,
+        activity_rows: list,
+        section_unique: dict,
+        daily_unique: dict,
+        accidents_by_year: list,
+        today: datetime
+) -> dict:
+    """So'rov natijalaridan template o'zgaruvchilarini yig'ish"""
+    by_type, by_folder, by_section = {}, {}, {}
+    for activity_type, section, parent_type, count in activity_rows:
+        by_type[activity_type] = by_type.get(activity_type, 0) + count
+        if activity_type == 'folder_open' and parent_type is not None:
+            by_folder[parent_type] = by_folder.get(parent_type, 0) + count
+        if section is not None:
+            by_section[section] = by_section.get(section, 0) + count
+
+    # 1. Oylik faollik
+    activity_labels = [ACTIVITY_NAMES[t] for t in ORDERED_ACTIVITY_TYPES]
+    activity_counts = [by_type.get(t, 0) for t in ORDERED_ACTIVITY_TYPES]
+
+    # 2. Papkalar bo'yicha (eng ko'p birinchi)
+    if by_folder:
+        sorted_folders = sorted(by_folder.items(), key=lambda x: x[1], reverse=True)
+        folder_labels = [FOLDER_NAMES.get(p, p) for p, _ in sorted_folders]
+        folder_counts = [c for _, c in sorted_folders]
+    else:
+        folder_labels = ['Ma\'lumot yo\'q']
+        folder_counts = [0]
+
+    # 3. Bo'limlar bo'yicha
+    section_total_labels, section_total_counts = _section_series(by_section)
+    section_unique_labels, section_unique_counts = _section_series(section_unique)
+
+    # 4. Oxirgi 7 kun
+    daily_labels, daily_counts = [], []
+    for i in range(7):
+        day = today - timedelta(days=6 - i)
+        daily_labels.append(day.strftime('%d.%m'))
+        daily_counts.append(daily_unique.get(day.date(), 0))
+
+    # 7. Baxtsiz hodisalar yillar bo'yicha
+    if accidents_by_year:
+        accident_year_labels = [name for name, _ in accidents_by_year]
+        accident_year_counts = [count for _, count in accidents_by_year]
+    else:
+        accident_year_labels = [f'{today.year - 4 + i}-yil' for i in range(5)]
+        accident_year_counts = [0] * 5
+
+    return {
+        **totals,
+        'activity_labels': json.dumps(activity_labels),
+        'activity_counts': json.dumps(activity_counts),
+        'folder_labels': json.dumps(folder_labels),
+        'folder_counts': json.dumps(folder_counts),
+        'section_labels': json.dumps(section_total_labels),
+        'section_counts': json.dumps(section_total_counts),
+        'section_unique_labels': json.dumps(section_unique_labels),
+        'section_unique_counts': json.dumps(section_unique_counts),
+        'daily_labels': json.dumps(daily_labels),
+        'daily_counts': json.dumps(daily_counts),
+        'test_comparison_labels': json.dumps(['MM Testlari', 'SX Testlari']),
+        'test_comparison_counts': json.dumps([totals['mm_tests'], totals['sx_tests']]),
+        'conspect_comparison_labels': json.dumps(['MM Konspektlari', 'SX Konspektlari']),
+        'conspect_comparison_counts': json.dumps([totals['mm_conspects'], totals['sx_conspects']]),
+        'accident_year_labels': json.dumps(accident_year_labels),
+        'accident_year_counts': json.dumps(accident_year_counts),
+        'video_comparison_labels': json.dumps(['MM Videolari', 'SX Videolari']),
+        'video_comparison_counts': json.dumps([totals['mm_videos'], totals['sx_videos']]),
+    }
+
+
+def compute_snapshot() -> dict:
+    """Dashboard snapshot'ini bazadan hisoblash"""
+    session = get_sync_session()
+
+    try:
+        today = datetime.now()
+        start, end = month_range(today)
+
+        # Rollup'ni yangilash (faqat watermark kunidan boshlab - arzon)
+        refresh_activity_rollup(session.connection())
+        session.commit()
+
+        return build_snapshot(
+            totals=query_totals(session),
+            activity_rows=activity_breakdown(session, start.date(), end.date()),
+            section_unique=query_monthly_unique_by_section(session, start, end),
+            daily_unique=daily_unique_users(
+                session, last_days_start(today).date(), today.date() + timedelta(days=1)
+            ),
+            accidents_by_year=query_accidents_by_year(session),
+            today=today
+        )
+    finally:
+        session.close()
+
+
+def empty_snapshot() -> dict:
+    """Xatolik bo'lganda ko'rsatiladigan bo'sh snapshot"""
+    totals = {
+        key: 0 for key in (
+            'folder_count', 'file_count', 'accident_count', 'user_count',
+            'accident_years_count', 'accident_categories_count',
+            'conspect_categories_count', 'conspect_count',
+            'video_categories_count', 'video_count',
+            'test_categories_count', 'test_count',
+            'mm_folders', 'sx_folders', 'mm_conspects', 'sx_conspects',
+            'mm_videos', 'sx_videos', 'mm_tests', 'sx_tests'
+        )
+    }
+    return build_snapshot(totals, [], {}, {}, [], datetime.now())
+
+
+# ==================== CACHE ====================
+
+class DashboardStats:
+    """
+    Snapshot keshi (stale-while-revalidate)
+
+    - refresh_interval ichida: keshdan qaytariladi
+    - max_stale ichida: eski snapshot qaytariladi, fon thread'da yangilanadi
+    - undan keyin (yoki kesh bo'sh): sinxron hisoblanadi
+    """
+
+    def __init__(self, refresh_interval: int = 60, max_stale: int = 900, compute=compute_snapshot):
+        self.refresh_interval = refresh_interval
+        self.max_stale = max_stale
+        self._compute = compute
+        self._snapshot = None
+        self._computed_at = 0.0
+        self._lock = threading.Lock()
+        self._flag_lock = threading.Lock()
+        self._refreshing = False
+
+    def get_snapshot(self) -> dict:
+        """Snapshot olish"""
+        snapshot = self._snapshot
+        if snapshot is not None:
+            age = time.monotonic() - self._computed_at
+            if age < self.refresh_interval:
+                return snapshot
+            if age < self.max_stale:
+                self._refresh_in_background()
+                return snapshot
+
+        return self.refresh()
+
+    def refresh(self) -> dict:
+        """Sinxron yangilash"""
+        with self._lock:
+            # Boshqa thread allaqachon yangilagan bo'lishi mumkin
+            if self._snapshot is not None and time.monotonic() - self._computed_at < self.refresh_interval:
+                return self._snapshot
+
+            snapshot = self._compute()
+            self._snapshot = snapshot
+            self._computed_at = time.monotonic()
+            return snapshot
+
+    def invalidate(self):
+        """Keshni eskirgan deb belgilash"""
+        self._computed_at = 0.0
+
+    def _refresh_in_background(self):
+        """Fon thread'da yangilash (bir vaqtda faqat bittasi)"""
+        with self._flag_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def worker():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.exception("Dashboard refresh error: %s", e)
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=worker, name='dashboard-stats-refresh', daemon=True).start()
+
+
+# Global instance
+dashboard_stats = DashboardStats(
+    refresh_interval=FlaskConfig.DASHBOARD_REFRESH_SECONDS,
+    max_stale=FlaskConfig.DASHBOARD_MAX_STALE_SECONDS
+)
@@ -0,0 +1,231 @@
+# web/services/exports.py
+"""
+Oqimli eksport (CSV / XLSX)
+
+Qatorlar server-side cursor orqali (stream_results + yield_per) o'qiladi va
+bo'laklab yuboriladi - jadval hajmidan qat'i nazar xotira o'zgarmas.
+"""
+import csv
+import io
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, func, true
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+from db.models import (
+    User, UserActivity, FileView, File, Folder, AccidentView, Accident,
+    Test, TestAnswer, TestCategory, test_category_association
+)
+
+YIELD_PER = 1000
+CSV_FLUSH_ROWS = 500  # shuncha qatordan keyin bo'lak yuboriladi
+XLSX_CHUNK_BYTES = 64 * 1024
+
+
+@dataclass
+class ExportFilters:
+    date_from: datetime | None = None
+    date_to: datetime | None = None  # shu kun ham kiradi
+    section: str = ''
+    activity_type: str = ''
+
+    @classmethod
+    def from_args(cls, args) -> 'ExportFilters':
+        def parse(value):
+            try:
+                return datetime.strptime(value, '%Y-%m-%d') if value else None
+            except ValueError:
+                return None
+
+        return cls(
+            date_from=parse(args.get('date_from')),
+            date_to=parse(args.get('date_to')),
+            section=args.get('section', '').strip(),
+            activity_type=args.get('activity_type', '').strip(),
+        )
+
+    def date_range(self, column) -> list:
+        clauses = []
+        if self.date_from:
+            clauses.append(column >= self.date_from)
+        if self.date_to:
+            clauses.append(column < self.date_to + timedelta(days=1))
+        return clauses
+
+
+# ==================== DATASETS ====================
+
+def _users(f: ExportFilters):
+    header = ['id', 'telegram_id', 'username', 'full_name', 'phone_number', 'language_code', 'is_active', 'created_at']
+    stmt = select(
+        User.id, User.telegram_id, User.username, User.full_name,
+        User.phone_number, User.language_code, User.is_active, User.created_at
+    ).where(*f.date_range(User.created_at)).order_by(User.id)
+    return header, stmt
+
+
+def _activities(f: ExportFilters):
+    header = ['created_at', 'user_id', 'telegram_id', 'full_name', 'activity_type', 'section', 'parent_type']
+    clauses = f.date_range(UserActivity.created_at)
+    if f.section:
+        clauses.append(UserActivity.section == f.section)
+    if f.activity_type:
+        clauses.append(UserActivity.activity_type == f.activity_type)
+
+    stmt = select(
+        UserActivity.created_at, UserActivity.user_id, User.telegram_id, User.full_name,
+        UserActivity.activity_type, UserActivity.section, UserActivity.parent_type
+    ).join(User, User.id == UserActivity.user_id).where(*clauses).order_by(UserActivity.created_at)
+    return header, stmt
+
+
+def _file_views(f: ExportFilters):
+    header = ['created_at', 'user_id', 'file_id', 'file_name', 'folder_name', 'section', 'parent_type']
+    clauses = f.date_range(FileView.created_at)
+    if f.section:
+        clauses.append(Folder.section == f.section)
+
+    stmt = select(
+        FileView.created_at, FileView.user_id, File.id, File.name,
+        Folder.name, Folder.section, Folder.parent_type
+    ).join(File, File.id == FileView.file_id).join(Folder, Folder.id == File.folder_id).where(
+        *clauses
+    ).order_by(FileView.created_at)
+    return header, stmt
+
+
+def _accident_views(f: ExportFilters):
+    header = ['created_at', 'user_id', 'accident_id', 'title']
+    stmt = select(
+        AccidentView.created_at, AccidentView.user_id, Accident.id, Accident.title
+    ).join(Accident, Accident.id == AccidentView.accident_id).where(
+        *f.date_range(AccidentView.created_at)
+    ).order_by(AccidentView.created_at)
+    return header, stmt
+
+
+def _tests(f: ExportFilters):
+    """
+    Import formati bilan bir xil ustunlar (qayta import qilish mumkin).
+    Ikkala bo'limdagi kategoriyalarga tegishli test: section - birinchi bo'lim,
+    boshqa bo'lim kategoriyalari "SX:nom" ko'rinishida (test_import.validate_row)
+    """
+    header = ['text', 'image', 'section', 'categories', 'answer_1', 'answer_2', 'answer_3', 'answer_4', 'correct']
+
+    categories = select(
+        func.array_agg(aggregate_order_by(TestCategory.section, TestCategory.section, TestCategory.id)).label('sections'),
+        func.array_agg(aggregate_order_by(TestCategory.name, TestCategory.section, TestCategory.id)).label('names')
+    ).select_from(test_category_association).join(
+        TestCategory, TestCategory.id == test_category_association.c.category_id
+    ).where(test_category_association.c.test_id == Test.id)
+    if f.section:
+        categories = categories.where(TestCategory.section == f.section)
+    categories = categories.lateral('c')
+
+    answers = select(
+        func.array_agg(aggregate_order_by(TestAnswer.text, TestAnswer.id)).label('texts'),
+        func.array_agg(aggregate_order_by(TestAnswer.is_correct, TestAnswer.id)).label('flags')
+    ).where(TestAnswer.test_id == Test.id).lateral('a')
+
+    stmt = select(
+        Test.text, Test.image, categories.c.sections, categories.c.names,
+        answers.c.texts, answers.c.flags
+    ).select_from(Test).join(categories, true()).join(answers, true()).where(
+        categories.c.names.is_not(None), *f.date_range(Test.created_at)
+    ).order_by(Test.id)
+
+    def transform(row):
+        texts = list(row.texts or [])[:4]
+        texts += [''] * (4 - len(texts))
+        correct = ','.join('ABCD'[i] for i, flag in enumerate((row.flags or [])[:4]) if flag)
+        section = row.sections[0]
+        names = ';'.join(
+            name if name_section == section else f'{name_section}:{name}'
+            for name_section, name in zip(row.sections, row.names)
+        )
+        return [row.text, row.image, section, names, *texts, correct]
+
+    return header, stmt, transform
+
+
+DATASETS = {
+    'users': ('Xodimlar', _users),
+    'activities': ('Faollik', _activities),
+    'file_views': ('Fayl ko\'rishlar', _file_views),
+    'accident_views': ('Hodisa ko\'rishlar', _accident_views),
+    'tests': ('Testlar', _tests),
+}
+
+
+def build(dataset: str, filters: ExportFilters):
+    """Returns: (header, statement, transform)"""
+    result = DATASETS[dataset][1](filters)
+    if len(result) == 2:
+        return (*result, list)
+    return result
+
+
+def _stream_rows(session, stmt, transform):
+    """Server-side cursor - bir vaqtda faqat YIELD_PER qator xotirada"""
+    result = session.execute(stmt.execution_options(stream_results=True, yield_per=YIELD_PER))
+    try:
+        for row in result:
+            yield transform(row)
+    finally:
+        result.close()
+
+
+def _cell(value):
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return '' if value is None else value
+
+
+# ==================== WRITERS ====================
+
+def stream_csv(session, dataset: str, filters: ExportFilters):
+    """CSV bo'laklari generatori (Excel uchun UTF-8 BOM bilan)"""
+    header, stmt, transform = build(dataset, filters)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    buffer.write('\ufeff')
+    writer.writerow(header)
+
+    for count, row in enumerate(_stream_rows(session, stmt, transform), start=1):
+        writer.writerow([_cell(value) for value in row])
+        if count % CSV_FLUSH_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+
+
+def stream_xlsx(session, dataset: str, filters: ExportFilters):
+    """
+    XLSX - openpyxl write_only rejimi qatorlarni vaqtinchalik faylga yozadi,
+    tayyor fayl bo'laklab yuboriladi
+    """
+    from openpyxl import Workbook
+
+    header, stmt, transform = build(dataset, filters)
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(dataset)
+    sheet.append(header)
+
+    for row in _stream_rows(session, stmt, transform):
+        sheet.append([_cell(value) for value in row])
+
+    fd, path = tempfile.mkstemp(suffix='.xlsx')
+    os.close(fd)
+    try:
+        workbook.save(path)
+        with open(path, 'rb') as file:
+            while chunk := file.read(XLSX_CHUNK_BYTES):
+                yield chunk
+    finally:
+        os.remove(path)
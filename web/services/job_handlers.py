@@ -0,0 +1,133 @@
+# web/services/job_handlers.py
+"""
+Fon vazifalari handler'lari (worker.py import qiladi)
+
+Har bir handler: handler(ctx, **params) -> dict (natija, jobs.result ga yoziladi)
+ctx.progress() bekor qilingan vazifada JobCancelled ko'taradi.
+"""
+import os
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import text
+
+from db import Base, get_sync_engine, get_sync_session
+from db.jobs import job_handler
+from db.rollup import backfill_activity_rollup
+from utils.env_data import Config as cf
+from web.services.exports import DATASETS, ExportFilters, stream_csv, stream_xlsx
+from web.services.test_import import import_tests
+
+EXPORT_WRITERS = {'csv': stream_csv, 'xlsx': stream_xlsx}
+
+
+def files_dir(*parts) -> Path:
+    """Web va worker uchun umumiy papka (JOB_FILES_DIR)"""
+    path = Path(cf.jobs.FILES_DIR, *parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+# ==================== TEST IMPORT ====================
+
+@job_handler('test_import', 'Testlarni import qilish')
+def run_test_import(ctx, path: str, filename: str):
+    size = os.path.getsize(path)
+    session = get_sync_session()
+
+    try:
+        with open(path, 'rb') as stream:
+            def on_progress(report):
+                # Fayl ichidagi o'rin bo'yicha foiz (XLSX to'liq o'qiladi - 100% dan boshlanadi)
+                ctx.progress(
+                    min(stream.tell(), size), size,
+                    f"{report.total} qator o'qildi, {report.imported} ta qo'shildi"
+                )
+
+            report = import_tests(session, stream, filename, on_progress=on_progress)
+    finally:
+        session.close()
+        os.remove(path)
+
+    ctx.progress(size, size, f"{report.imported} ta test qo'shildi", force=True)
+    ctx.log(f"Jami: {report.total}, qo'shildi: {report.imported}, "
+            f"takroriy: {report.duplicates}, xato: {report.failed}")
+    return {
+        'total': report.total,
+        'imported': report.imported,
+        'duplicates': report.duplicates,
+        'failed': report.failed,
+        'errors': report.errors,
+    }
+
+
+# ==================== EXPORT ====================
+
+@job_handler('export', 'Eksport (fayl)')
+def run_export(ctx, dataset: str, file_format: str = 'csv', filters: dict | None = None):
+    if dataset not in DATASETS:
+        raise ValueError(f"Bunday eksport yo'q: {dataset}")
+
+    if file_format not in EXPORT_WRITERS:
+        file_format = 'csv'
+    writer = EXPORT_WRITERS[file_format]
+    path = files_dir('exports') / f"job_{ctx.job_id}_{dataset}.{file_format}"
+    session = get_sync_session()
+    written = 0
+
+    try:
+        if file_format == 'csv':
+            file = open(path, 'w', encoding='utf-8', newline='')
+        else:
+            file = open(path, 'wb')
+        with file:
+            for chunk in writer(session, dataset, ExportFilters.from_args(filters or {})):
+                file.write(chunk)
+                written += len(chunk)
+                ctx.progress(written, None, f"{written // 1024} KB yozildi")
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    finally:
+        session.close()
+
+    return {
+        'path': str(path),
+        'filename': f"{dataset}_{date.today():%Y%m%d}.{file_format}",
+        'size': path.stat().st_size,
+    }
+
+
+# ==================== ROLLUP ====================
+
+@job_handler('rollup_backfill', 'Faollik rollup backfill')
+def run_rollup_backfill(ctx, start_day: str | None = None, end_day: str | None = None):
+    start = date.fromisoformat(start_day) if start_day else None
+    end = date.fromisoformat(end_day) if end_day else None
+
+    ctx.progress(0, 1, "activity_daily qayta hisoblanmoqda", force=True)
+    with get_sync_engine().begin() as conn:
+        rows = backfill_activity_rollup(conn, start, end)
+    ctx.progress(1, 1, f"{rows} ta qator yangilandi", force=True)
+    return {'rows': rows}
+
+
+# ==================== MAINTENANCE ====================
+
+@job_handler('db_maintenance', 'Baza xizmati (VACUUM ANALYZE / REINDEX)')
+def run_db_maintenance(ctx, tables: list | None = None, reindex: bool = False):
+    """VACUUM / REINDEX CONCURRENTLY tranzaksiya ichida ishlamaydi - AUTOCOMMIT"""
+    known = set(Base.metadata.tables)
+    tables = [table for table in (tables or sorted(known)) if table in known]
+
+    engine = get_sync_engine().execution_options(isolation_level="AUTOCOMMIT")
+    with engine.connect() as conn:
+        for done, table in enumerate(tables):
+            ctx.progress(done, len(tables), f"{table}", force=True)
+            if reindex:
+                conn.execute(text(f'REINDEX TABLE CONCURRENTLY "{table}"'))
+            conn.execute(text(f'VACUUM (ANALYZE) "{table}"'))
+            ctx.log(f"{table}: {'REINDEX + ' if reindex else ''}VACUUM ANALYZE")
+
+    ctx.progress(len(tables), len(tables), "Tayyor", force=True)
+    return {'tables': tables}
@@ -0,0 +1,232 @@
+# web/services/pagination.py
+"""
+Admin list sahifalari uchun pagination
+- Keyset (cursor) - chuqur sahifalar ham 1-sahifa kabi tez (OFFSET yo'q)
+- Taxminiy jami soni - katta natijalarda count() o'rniga planner statistikasi
+"""
+import base64
+import json
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+
+from sqlalchemy import and_, or_, false
+
+logger = logging.getLogger(__name__)
+
+EXACT_COUNT_LIMIT = 10000  # planner taxmini shundan kichik bo'lsa - aniq count()
+MAX_PER_PAGE = 100
+
+
+# ==================== CURSOR ====================
+
+def _dump(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, date):
+        return {'d': value.isoformat()}
+    return value
+
+
+def _load(value):
+    if isinstance(value, dict):
+        if 'dt' in value:
+            return datetime.fromisoformat(value['dt'])
+        if 'd' in value:
+            return date.fromisoformat(value['d'])
+    return value
+
+
+def encode_cursor(values) -> str:
+    """Tartib ustunlari qiymatlari -> URL uchun xavfsiz string"""
+    raw = json.dumps([_dump(v) for v in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str | None) -> list | None:
+    """Noto'g'ri cursor - None (1-sahifaga qaytadi)"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        return [_load(v) for v in json.loads(raw)]
+    except (ValueError, TypeError):
+        return None
+
+
+def _nullable(column) -> bool:
+    return getattr(column.expression, 'nullable', True)
+
+
+def _less(column, value):
+    """column < value - NULL eng katta qiymat (PostgreSQL tartibi kabi)"""
+    if value is None:
+        return column.is_not(None)
+    return column < value
+
+
+def _greater(column, value):
+    if value is None:
+        return false()
+    if _nullable(column):
+        return or_(column > value, column.is_(None))
+    return column > value
+
+
+def _equal(column, value):
+    return column.is_(None) if value is None else column == value
+
+
+def _after(keys, values, reverse: bool = False):
+    """
+    (a, b, id) > (x, y, z) - har ustunning yo'nalishi alohida hisobga olinadi.
+    Cursor'dagi NULL ham to'g'ri solishtiriladi (oddiy "<"/">" NULL'da
+    qatorlarni tashlab yuborardi yoki takrorlardi)
+
+    keys: [(column, desc), ...]
+    """
+    clauses = []
+    for i, (column, desc) in enumerate(keys):
+        forward = desc != reverse
+        step = _less(column, values[i]) if forward else _greater(column, values[i])
+        equal = [_equal(keys[j][0], values[j]) for j in range(i)]
+        clauses.append(and_(*equal, step))
+    return or_(*clauses)
+
+
+def _order(keys, reverse: bool = False):
+    """NULL - eng katta: ASC NULLS LAST / DESC NULLS FIRST (indeks tartibi bilan bir xil)"""
+    return [
+        column.desc().nulls_first() if desc != reverse else column.asc().nulls_last()
+        for column, desc in keys
+    ]
+
+
+# ==================== TOTALS ====================
+
+def planner_rows(session, query) -> int:
+    """EXPLAIN bo'yicha taxminiy qatorlar soni (so'rov bajarilmaydi)"""
+    compiled = query.order_by(None).statement.compile(dialect=session.get_bind().dialect)
+    raw = session.connection().exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled.string}", compiled.params
+    ).scalar()
+    plan = json.loads(raw) if isinstance(raw, str) else raw
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def count_total(session, query, exact_limit: int = EXACT_COUNT_LIMIT) -> tuple[int, bool]:
+    """
+    Jami soni
+
+    Returns:
+        (soni, taxminiymi) - kichik natijalar uchun aniq, kattalari uchun taxmin
+    """
+    # Savepoint: EXPLAIN xatosi butun tranzaksiyani buzmasin (count() ham ishlasin)
+    try:
+        with session.begin_nested():
+            estimate = planner_rows(session, query)
+    except Exception as e:
+        logger.exception("Planner estimate error: %s", e)
+        estimate = 0
+
+    if estimate <= exact_limit:
+        return query.order_by(None).count(), False
+    return estimate, True
+
+
+# ==================== PAGE ====================
+
+@dataclass
+class Page:
+    items: list
+    page: int
+    per_page: int
+    total: int
+    total_is_estimate: bool = False
+    has_prev: bool = False
+    has_next: bool = False
+    prev_cursor: str | None = None
+    next_cursor: str | None = None
+
+    @property
+    def total_pages(self) -> int:
+        pages = (self.total + self.per_page - 1) // self.per_page
+        # Taxmin aniq bo'lmasligi mumkin - joriy sahifadan kam ko'rsatmaymiz
+        return max(pages, self.page + (1 if self.has_next else 0))
+
+    def template_args(self) -> dict:
+        """render_template uchun (eski nomlar bilan mos)"""
+        return {
+            'page': self.page,
+            'per_page': self.per_page,
+            'total': self.total,
+            'total_is_estimate': self.total_is_estimate,
+            'total_pages': self.total_pages,
+            'has_prev': self.has_prev,
+            'has_next': self.has_next,
+            'prev_cursor': self.prev_cursor,
+            'next_cursor': self.next_cursor,
+        }
+
+
+def empty_page(per_page: int = 20) -> Page:
+    return Page(items=[], page=1, per_page=per_page, total=0)
+
+
+def paginate(session, query, keys, args, per_page: int = 20) -> Page:
+    """
+    Keyset pagination
+
+    Args:
+        query: filtrlangan, ORDER BY'siz so'rov
+        keys: [(column, desc), ...] - oxirgisi unikal bo'lishi kerak (odatda id)
+        args: request.args - page, after, before, last
+    """
+    page = max(args.get('page', 1, type=int) or 1, 1)
+    per_page = min(max(per_page, 1), MAX_PER_PAGE)
+    after = decode_cursor(args.get('after'))
+    before = decode_cursor(args.get('before'))
+    last = args.get('last') == '1'
+
+    total, is_estimate = count_total(session, query)
+
+    def cursor_of(item):
+        return encode_cursor([getattr(item, column.key) for column, _ in keys])
+
+    if last or before:
+        # Teskari tartibda o'qib, natijani aylantiramiz
+        reversed_query = query
+        if before and len(before) == len(keys):
+            reversed_query = reversed_query.filter(_after(keys, before, reverse=True))
+        rows = reversed_query.order_by(*_order(keys, reverse=True)).limit(per_page + 1).all()
+        more = len(rows) > per_page
+        items = list(reversed(rows[:per_page]))
+
+        if last:
+            page = max((total + per_page - 1) // per_page, 1)
+        elif not more:
+            page = 1  # boshiga yetdik
+        has_prev, has_next = more, not last
+    else:
+        forward_query = query
+        if after and len(after) == len(keys):
+            forward_query = forward_query.filter(_after(keys, after))
+        elif page > 1:
+            # Cursor'siz to'g'ridan-to'g'ri sahifa - OFFSET (faqat shu holatda)
+            forward_query = forward_query.offset((page - 1) * per_page)
+        rows = forward_query.order_by(*_order(keys)).limit(per_page + 1).all()
+        more = len(rows) > per_page
+        items = rows[:per_page]
+        has_prev, has_next = page > 1, more
+
+    return Page(
+        items=items,
+        page=page,
+        per_page=per_page,
+        total=total,
+        total_is_estimate=is_estimate,
+        has_prev=has_prev and bool(items),
+        has_next=has_next and bool(items),
+        prev_cursor=cursor_of(items[0]) if items else None,
+        next_cursor=cursor_of(items[-1]) if items else None,
+    )
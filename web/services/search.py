@@ -0,0 +1,91 @@
+# web/services/search.py
+"""
+Admin qidiruvi - pg_trgm GIN index'lari bilan (ILIKE '%...%' index ishlatadi)
+Kirill/lotin yozuvi farq qilmaydi: bot/utils/transliterate.search_variants
+"""
+from sqlalchemy import func, literal_column, or_, select, union_all, cast, String
+
+from bot.utils.transliterate import search_variants
+from db.models import Test, User, File, Folder, Group, Video, Conspect, Accident
+
+GLOBAL_LIMIT = 50
+PER_KIND_LIMIT = 20  # har bir bo'limdan eng mos N ta
+
+
+def _escape_like(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def text_filter(columns, term: str):
+    """
+    columns ichida term (har qanday yozuvda) uchraydimi - OR qilingan ILIKE'lar
+
+    Har bir (ustun, variant) alohida ILIKE - planner BitmapOr bilan
+    trigram index'larni birlashtira oladi.
+    """
+    clauses = [
+        column.ilike(f'%{_escape_like(variant)}%', escape='\\')
+        for variant in search_variants(term)
+        for column in columns
+    ]
+    return or_(*clauses)
+
+
+def _score(columns, term: str):
+    """Eng yaxshi word_similarity (variantlar va ustunlar bo'yicha)"""
+    scores = [
+        func.word_similarity(variant, func.coalesce(column, ''))
+        for variant in search_variants(term)
+        for column in columns
+    ]
+    return func.greatest(*scores) if len(scores) > 1 else scores[0]
+
+
+# (turi, model, sarlavha ustuni, qidiriladigan ustunlar)
+SEARCH_TARGETS = [
+    ('test', Test, Test.text, [Test.text]),
+    ('user', User, User.full_name, [User.full_name, User.phone_number, User.username]),
+    ('folder', Folder, Folder.name, [Folder.name]),
+    ('file', File, File.name, [File.name]),
+    ('video', Video, Video.name, [Video.name, Video.description]),
+    ('conspect', Conspect, Conspect.name, [Conspect.name, Conspect.description]),
+    ('accident', Accident, Accident.title, [Accident.title, Accident.description]),
+    ('group', Group, Group.title, [Group.title]),
+]
+
+
+def global_search(session, term: str, limit: int = GLOBAL_LIMIT) -> list[dict]:
+    """
+    Barcha bo'limlar bo'yicha bitta UNION ALL so'rov, moslik bo'yicha tartiblangan
+
+    Returns:
+        [{'kind': 'test', 'id': 1, 'title': '...', 'score': 0.8}, ...]
+    """
+    term = (term or '').strip()
+    if len(term) < 2:
+        return []
+
+    parts = []
+    for kind, model, title_column, columns in SEARCH_TARGETS:
+        score = _score(columns, term)
+        parts.append(
+            select(
+                literal_column(f"'{kind}'").label('kind'),
+                model.id.label('id'),
+                func.left(cast(title_column, String), 200).label('title'),
+                score.label('score'),
+            )
+            .where(text_filter(columns, term))
+            .order_by(score.desc())
+            .limit(PER_KIND_LIMIT)
+        )
+
+    combined = union_all(*[part.subquery().select() for part in parts]).subquery()
+    rows = session.execute(
+        select(combined).order_by(combined.c.score.desc(), combined.c.kind).limit(limit)
+    ).all()
+
+    return [
+        {'kind': row.kind, 'id': row.id, 'title': row.title or '', 'score': round(float(row.score), 2)}
+        for row in rows
+    ]
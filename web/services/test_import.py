@@ -0,0 +1,269 @@
+# web/services/test_import.py
+"""
+Test bankini ommaviy import qilish (CSV / XLSX / JSON)
+
+Fayl oqim sifatida o'qiladi, qatorlar CHUNK_SIZE bo'laklarda tekshiriladi va
+tests / test_answers / test_category_association ga bitta tranzaksiyada
+ko'p qatorli INSERT (executemany) bilan yoziladi.
+
+Ustunlar:
+    text, image, section, categories, answer_1..answer_4, correct
+    categories - nom yoki ID, ';' bilan ajratilgan; boshqa bo'limdagi
+                 kategoriya - "SX:nom" (eksport aralash testlarni shunday yozadi)
+    correct - to'g'ri javoblar: "1,3" yoki "A,C"
+"""
+import codecs
+import csv
+import hashlib
+import json
+from dataclasses import dataclass, field
+
+from sqlalchemy import insert, select, func
+
+from db.models import Test, TestAnswer, TestCategory, test_category_association
+
+CHUNK_SIZE = 1000
+MAX_ERRORS = 200  # hisobotda ko'rsatiladigan xatolar soni
+ANSWER_COUNT = 4
+SECTIONS = ('MM', 'SX')
+COLUMNS = ['text', 'image', 'section', 'categories', 'answer_1', 'answer_2', 'answer_3', 'answer_4', 'correct']
+
+
+class ImportFormatError(Exception):
+    """Fayl formati noto'g'ri (butun import to'xtaydi)"""
+
+
+@dataclass
+class ImportReport:
+    total: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    errors: list = field(default_factory=list)  # [(qator, xabar), ...]
+
+    def add_error(self, line: int, message: str):
+        self.failed += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append((line, message))
+
+
+# ==================== READERS ====================
+
+def _read_csv(stream):
+    reader = csv.DictReader(codecs.iterdecode(stream, 'utf-8-sig'))
+    for line, row in enumerate(reader, start=2):
+        yield line, row
+
+
+def _read_xlsx(stream):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFormatError("XLSX uchun openpyxl o'rnatilmagan (pip install openpyxl)")
+
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(cell or '').strip().lower() for cell in next(rows, [])]
+        for line, values in enumerate(rows, start=2):
+            yield line, {key: value for key, value in zip(header, values) if key}
+    finally:
+        workbook.close()
+
+
+def _read_json(stream):
+    """JSON massiv yoki JSON Lines (har qatorda bitta obyekt)"""
+    head = stream.read(1)
+    while head and head.isspace():
+        head = stream.read(1)
+
+    if head == b'[':
+        items = json.loads(head + stream.read())
+        for line, item in enumerate(items, start=1):
+            yield line, item
+        return
+
+    for line, raw in enumerate(codecs.iterdecode(stream, 'utf-8'), start=1):
+        raw = (head.decode() + raw) if line == 1 and head else raw
+        if raw.strip():
+            yield line, json.loads(raw)
+
+
+def read_rows(stream, filename: str):
+    """Kengaytma bo'yicha o'quvchi - (qator_raqami, dict) generatori"""
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    readers = {'csv': _read_csv, 'xlsx': _read_xlsx, 'json': _read_json, 'jsonl': _read_json}
+    if extension not in readers:
+        raise ImportFormatError("Faqat .csv, .xlsx, .json yoki .jsonl fayllar qabul qilinadi")
+    return readers[extension](stream)
+
+
+# ==================== VALIDATION ====================
+
+def text_hash(text: str) -> str:
+    """Takrorlanishni aniqlash uchun (bo'sh joy va registrga qaramaydi)"""
+    return hashlib.md5(' '.join(text.lower().split()).encode()).hexdigest()
+
+
+def _value(row: dict, key: str) -> str:
+    value = row.get(key)
+    return '' if value is None else str(value).strip()
+
+
+def _parse_correct(raw: str) -> set[int] | None:
+    result = set()
+    for part in raw.replace(';', ',').split(','):
+        part = part.strip().upper()
+        if not part:
+            continue
+        if part in 'ABCD' and len(part) == 1:
+            result.add(ord(part) - ord('A'))
+        elif part.isdigit() and 1 <= int(part) <= ANSWER_COUNT:
+            result.add(int(part) - 1)
+        else:
+            return None
+    return result
+
+
+def load_category_map(session) -> dict:
+    """{(section, 'nom'): id, (section, 'id'): id} - bitta so'rov"""
+    category_map = {}
+    for category_id, name, section in session.execute(
+        select(TestCategory.id, TestCategory.name, TestCategory.section)
+    ):
+        category_map[(section, name.strip().lower())] = category_id
+        category_map[(section, str(category_id))] = category_id
+    return category_map
+
+
+def validate_row(row: dict, category_map: dict) -> tuple[dict | None, str | None]:
+    """Returns: (toza_qator, None) yoki (None, xato)"""
+    text = _value(row, 'text')
+    section = _value(row, 'section').upper()
+
+    if not text:
+        return None, "Savol matni bo'sh"
+    if section not in SECTIONS:
+        return None, f"Bo'lim noto'g'ri: '{section}' (MM yoki SX)"
+
+    category_ids = []
+    for name in _value(row, 'categories').replace('|', ';').split(';'):
+        name = name.strip()
+        if not name:
+            continue
+        category_section, _, qualified = name.partition(':')
+        if qualified and category_section.strip().upper() in SECTIONS:
+            category_section, name = category_section.strip().upper(), qualified.strip()
+        else:
+            category_section = section
+        category_id = category_map.get((category_section, name.lower()))
+        if category_id is None:
+            return None, f"Kategoriya topilmadi: '{name}' ({category_section})"
+        if category_id not in category_ids:
+            category_ids.append(category_id)
+    if not category_ids:
+        return None, "Kamida bitta kategoriya kerak"
+
+    answers = [_value(row, f'answer_{i}') for i in range(1, ANSWER_COUNT + 1)]
+    if not all(answers):
+        return None, "Barcha 4 ta javob kiritilishi shart"
+
+    correct = _parse_correct(_value(row, 'correct'))
+    if not correct:
+        return None, "To'g'ri javob(lar) noto'g'ri ko'rsatilgan"
+
+    return {
+        'text': text,
+        'image': _value(row, 'image') or None,
+        'category_ids': category_ids,
+        'answers': [{'text': answer, 'is_correct': i in correct} for i, answer in enumerate(answers)],
+    }, None
+
+
+# ==================== WRITE ====================
+
+def _flush_chunk(session, chunk: list[dict]):
+    """Bitta bo'lak: testlar (RETURNING id) + javoblar + kategoriyalar"""
+    test_ids = session.execute(
+        insert(Test).returning(Test.id, sort_by_parameter_order=True),
+        [{'text': item['text'], 'image': item['image']} for item in chunk]
+    ).scalars().all()
+
+    answers = []
+    associations = []
+    for test_id, item in zip(test_ids, chunk):
+        answers.extend({**answer, 'test_id': test_id} for answer in item['answers'])
+        associations.extend({'test_id': test_id, 'category_id': cid} for cid in item['category_ids'])
+
+    session.execute(insert(TestAnswer), answers)
+    session.execute(insert(test_category_association), associations)
+
+
+def import_tests(session, stream, filename: str, on_progress=None) -> ImportReport:
+    """
+    Faylni import qilish (bitta tranzaksiya, commit chaqiruvchida emas - shu yerda)
+
+    Xato qatorlar o'tkazib yuboriladi va hisobotga yoziladi.
+    Bazada yoki faylda allaqachon bor savollar (text_hash) qayta qo'shilmaydi.
+
+    Args:
+        on_progress: callable(report) - har bir bo'lakdan keyin
+    """
+    report = ImportReport()
+    category_map = load_category_map(session)
+    seen = set(session.execute(
+        select(func.md5(func.lower(func.regexp_replace(func.btrim(Test.text), r'\s+', ' ', 'g'))))
+    ).scalars())
+
+    chunk = []
+    try:
+        for line, row in read_rows(stream, filename):
+            report.total += 1
+
+            if not isinstance(row, dict):
+                report.add_error(line, "Qator obyekt emas")
+                continue
+
+            item, error = validate_row(row, category_map)
+            if error:
+                report.add_error(line, error)
+                continue
+
+            digest = text_hash(item['text'])
+            if digest in seen:
+                report.duplicates += 1
+                continue
+            seen.add(digest)
+
+            chunk.append(item)
+            if len(chunk) >= CHUNK_SIZE:
+                _flush_chunk(session, chunk)
+                report.imported += len(chunk)
+                chunk = []
+                if on_progress:
+                    on_progress(report)
+
+        if chunk:
+            _flush_chunk(session, chunk)
+            report.imported += len(chunk)
+
+        session.commit()
+
+    except (UnicodeDecodeError, json.JSONDecodeError, csv.Error) as e:
+        session.rollback()
+        raise ImportFormatError(f"Faylni o'qib bo'lmadi: {e}")
+    except Exception:
+        session.rollback()
+        raise
+
+    if on_progress:
+        on_progress(report)
+    return report
+
+
+def sample_csv() -> str:
+    """Namuna fayl"""
+    return (
+        ','.join(COLUMNS) + '\n'
+        + '"Savol matni?",,MM,"Kategoriya nomi","Javob A","Javob B","Javob C","Javob D",A\n'
+    )
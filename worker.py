@@ -0,0 +1,96 @@
+# worker.py
+"""
+Fon vazifalari worker'i (jobs jadvali)
+
+Ishlatish:
+    python worker.py                # JOB_WORKERS ta jarayon
+    python worker.py --workers 4
+    python worker.py --once         # navbatdagi bitta vazifani bajarib chiqish
+"""
+
+import argparse
+import logging
+import multiprocessing
+import signal
+import sys
+import os
+
+# Project root'ni PATH'ga qo'shish
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from db import get_sync_engine
+from db.jobs import run_worker, claim_next, run_job, worker_name
+from utils.env_data import Config as cf
+import web.services.job_handlers  # noqa: F401 - handler'larni ro'yxatdan o'tkazadi
+
+
+def _serve():
+    """Bitta worker jarayoni - SIGTERM/SIGINT da joriy vazifani tugatib chiqadi"""
+    stopping = []
+
+    def stop(*_):
+        stopping.append(True)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    run_worker(
+        get_sync_engine(),
+        poll_interval=cf.jobs.POLL_INTERVAL,
+        stale_timeout=cf.jobs.STALE_TIMEOUT,
+        should_stop=lambda: bool(stopping)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fon vazifalari worker'i")
+    parser.add_argument('--workers', type=int, default=cf.jobs.WORKERS, help='Jarayonlar soni')
+    parser.add_argument('--once', action='store_true', help='Bitta vazifani bajarib chiqish')
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(processName)s] %(levelname)s %(name)s: %(message)s"
+    )
+
+    try:
+        if args.once:
+            claimed = claim_next(get_sync_engine(), worker_name())
+            if claimed is None:
+                print("ℹ️ Navbat bo'sh")
+                return
+            run_job(get_sync_engine(), *claimed)
+            print(f"✅ Vazifa #{claimed[0]} bajarildi")
+            return
+
+        print(f"🚀 {args.workers} ta worker ishga tushdi")
+        processes = [
+            multiprocessing.Process(target=_serve, name=f"worker-{i + 1}")
+            for i in range(max(args.workers, 1))
+        ]
+        for process in processes:
+            process.start()
+
+        # Asosiy jarayon signalni bolalarga uzatadi
+        def shutdown(*_):
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+
+        signal.signal(signal.SIGTERM, shutdown)
+        signal.signal(signal.SIGINT, shutdown)
+
+        for process in processes:
+            process.join()
+
+        print("🛑 Worker'lar to'xtadi")
+
+    except Exception as e:
+        print(f"\n❌ XATOLIK: {e}\n")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()